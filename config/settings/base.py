@@ -1,6 +1,7 @@
 """Base settings to build other settings files upon."""
 
 import environ
+from datetime import timedelta
 
 ROOT_DIR = environ.Path(__file__) - 3
 APPS_DIR = ROOT_DIR.path('cride')
@@ -56,12 +57,22 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 # Passwords
 PASSWORD_HASHERS = [
-    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'cride.users.hashers.TunableArgon2PasswordHasher',
     'django.contrib.auth.hashers.PBKDF2PasswordHasher',
     'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
     'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
     'django.contrib.auth.hashers.BCryptPasswordHasher',
 ]
+ARGON2_TIME_COST = env.int('DJANGO_ARGON2_TIME_COST', default=2)
+ARGON2_MEMORY_COST = env.int('DJANGO_ARGON2_MEMORY_COST', default=512)
+ARGON2_PARALLELISM = env.int('DJANGO_ARGON2_PARALLELISM', default=2)
+# Password hashing pool, see `cride.users.hashers`
+PASSWORD_HASHING_WORKERS = env.int('DJANGO_PASSWORD_HASHING_WORKERS', default=2)
+PASSWORD_HASHING_QUEUE_SIZE = env.int('DJANGO_PASSWORD_HASHING_QUEUE_SIZE', default=16)
+PASSWORD_HASHING_TIMEOUT = env.float('DJANGO_PASSWORD_HASHING_TIMEOUT', default=5)
+AUTHENTICATION_BACKENDS = [
+    'cride.users.backends.HashingPoolModelBackend',
+]
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -79,6 +90,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 # Middlewares
 MIDDLEWARE = [
+    'cride.utils.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -161,11 +173,36 @@ CELERYD_TASK_SOFT_TIME_LIMIT = 60
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'cride.utils.renderers.ORJSONRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'cride.utils.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'cride.users.authentication.JWTAuthentication',
+        'cride.users.authentication.CachedTokenAuthentication',
     ),
+    'DEFAULT_THROTTLE_RATES': {
+        'login': env('DJANGO_LOGIN_THROTTLE_RATE', default='60/min'),
+        'login_email': env('DJANGO_LOGIN_EMAIL_THROTTLE_RATE', default='10/min'),
+    },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10
-}
\ No newline at end of file
+}
+
+# Ride feed pages cache timeout in seconds, see `RideViewSet`
+RIDES_FEED_CACHE_TIMEOUT = env.int('DJANGO_RIDES_FEED_CACHE_TIMEOUT', default=30)
+
+# Access tokens, see `cride.users.tokens`
+JWT_ACCESS_TOKEN_LIFETIME = timedelta(minutes=env.int('DJANGO_JWT_ACCESS_TOKEN_MINUTES', default=15))
+JWT_REFRESH_TOKEN_LIFETIME = timedelta(days=env.int('DJANGO_JWT_REFRESH_TOKEN_DAYS', default=7))
+
+# Request metrics, see `cride.utils.metrics`
+REQUEST_METRICS_HEADER = env.bool('DJANGO_REQUEST_METRICS_HEADER', default=True)
+REQUEST_METRICS_BUDGETS = {
+    'default': {'queries': 20, 'sql_ms': 200, 'total_ms': 1000},
+    'rides:ride-list': {'queries': 8},
+    'circles:circle-list': {'queries': 5},
+}
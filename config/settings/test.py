@@ -22,6 +22,12 @@ CACHES = {
 # Passwords
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
+# Throttling, tests share the cache and the client IP
+REST_FRAMEWORK = {**REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}  # NOQA
+
+# Ride feed, tests inspect the feed's queries and `response.data`
+RIDES_FEED_CACHE_TIMEOUT = 0
+
 # Templates
 TEMPLATES[0]["OPTIONS"]["debug"] = DEBUG  # NOQA
 TEMPLATES[0]["OPTIONS"]["loaders"] = [  # NOQA
@@ -1,13 +1,19 @@
 """Circles admin."""
 
 # Python
-import csv
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, time
 
 # Django 
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count
+from django.http import HttpResponseBadRequest
+from django.urls import path
 from django.utils import timezone
-from django.http import HttpResponse
+from django.utils.dateparse import parse_date
+
+# Utilities
+from cride.utils.exports import stream_csv
 
 # Models
 from cride.rides.models import Ride
@@ -24,6 +30,7 @@ class CircleAdmin(admin.ModelAdmin):
         'verified',
         'is_limited',
         'members_limit',
+        'members_count',
     )
     search_fields = ('slug_name', 'name')
     list_filter = (
@@ -32,53 +39,129 @@ class CircleAdmin(admin.ModelAdmin):
         'is_limited',
     )
 
-    actions = ['unverify_circles', 'verify_circles', 'download_todays_rides']
+    actions = [
+        'unverify_circles',
+        'verify_circles',
+        'download_todays_rides',
+        'download_todays_rides_gzip',
+    ]
+
+    # Rides fetched per database round trip while exporting
+    export_chunk_size = 2000
 
     def unverify_circles(self, request, queryset):
         """Make circles verified."""
-        queryset.update(verified=False)
+        queryset.update(verified=False, modified=timezone.now())
+        self.invalidate_circles(queryset)
     unverify_circles.short_description = 'Make selected circles not verified'
 
     def verify_circles(self, request, queryset):
         """Make circles verified."""
-        queryset.update(verified=True)
+        queryset.update(verified=True, modified=timezone.now())
+        self.invalidate_circles(queryset)
     verify_circles.short_description = 'Make selected circles verified'
 
+    def invalidate_circles(self, queryset):
+        """Drop cached circles updated in bulk."""
+        for slug_name in queryset.values_list('slug_name', flat=True):
+            Circle.objects.invalidate(slug_name)
+
+    def get_urls(self):
+        """Add the rides export view."""
+        urls = [
+            path(
+                'rides/',
+                self.admin_site.admin_view(self.download_rides_view),
+                name='circles_circle_rides',
+            ),
+        ]
+        return urls + super(CircleAdmin, self).get_urls()
+
+    def download_rides_view(self, request):
+        """Return the rides of a date range in CSV.
+
+        Accepts `start` and `end` dates (inclusive, today by default),
+        `circle` ids (every circle by default) and `gzip`."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+
+        try:
+            start = self.get_date(request, 'start') or timezone.localdate()
+            end = self.get_date(request, 'end') or start
+        except ValueError:
+            return HttpResponseBadRequest('Invalid date, use YYYY-MM-DD.')
+        if end < start:
+            return HttpResponseBadRequest('The end date must not be before the start date.')
+
+        circles = Circle.objects.all()
+        circle_ids = request.GET.getlist('circle')
+        if circle_ids:
+            try:
+                circles = circles.filter(pk__in=circle_ids)
+            except (TypeError, ValueError):
+                return HttpResponseBadRequest('Invalid circle.')
+
+        return self.export_rides(circles, start, end, compress='gzip' in request.GET)
+
+    def get_date(self, request, name):
+        """Return the date in the `name` query param, `None` when missing.
+
+        Raise `ValueError` for malformed dates instead of exporting the
+        default range."""
+        value = request.GET.get(name)
+        if not value:
+            return None
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(f'Invalid date: {value}')
+        return date
+
     def download_todays_rides(self, request, queryset):
         """Return today's rides."""
-        now = timezone.now()
-        start = datetime(now.year, now.month, now.day, 0, 0, 0)
-        end = start + timedelta(days=1)
-        rides_today = Ride.objects.filter(
-            offered_in__in=queryset.values_list('id'),
-            departure_date__gte=start,
-            departure_date__lte=end
-        ).order_by('departure_date')
-
-        # import pdb;pdb.set_trace()
-
-        response = HttpResponse(content_type='text/csv')
-
-        if len(queryset) == 1:
-            response['Content-Disposition'] = f'attachment; filename="{start.strftime("%Y-%m-%d")}_rides--{queryset[0].slug_name}.csv"'
-        elif len(queryset) > 1:
-            response['Content-Disposition'] = f'attachment; filename="{start.strftime("%Y-%m-%d")}_rides.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
+        today = timezone.localdate()
+        return self.export_rides(queryset, today, today)
+    download_todays_rides.short_description = 'Download today\'s rides in CSV'
+
+    def download_todays_rides_gzip(self, request, queryset):
+        """Return today's rides compressed."""
+        today = timezone.localdate()
+        return self.export_rides(queryset, today, today, compress=True)
+    download_todays_rides_gzip.short_description = 'Download today\'s rides in gzipped CSV'
+
+    def export_rides(self, circles, start, end, compress=False):
+        """Stream the rides departing from `start` to `end` in CSV.
+
+        Rows are read with a single query through a database iterator and
+        written as they are sent, so memory doesn't grow with the export."""
+        tz = timezone.get_current_timezone()
+        since = timezone.make_aware(datetime.combine(start, time.min), tz)
+        until = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+
+        rides = Ride.objects.filter(
+            offered_in__in=circles.values('pk'),
+            departure_date__gte=since,
+            departure_date__lt=until,
+        ).annotate(
+            passengers_count=Count('passengers'),
+        ).order_by('departure_date', 'pk').values_list(
+            'pk', 'passengers_count', 'departure_location',
+            'departure_date', 'arrival_location',
+            'arrival_date', 'rating',
+        )
+
+        dates = start.strftime('%Y-%m-%d')
+        if end != start:
+            dates = f'{dates}_{end.strftime("%Y-%m-%d")}'
+        slugs = list(circles.values_list('slug_name', flat=True)[:2])
+        if len(slugs) == 1:
+            filename = f'{dates}_rides--{slugs[0]}.csv'
+        else:
+            filename = f'{dates}_rides.csv'
+
+        header = [
             'id', 'passengers', 'departure_location',
             'departure_date', 'arrival_location',
             'arrival_date', 'rating',
-        ])
-        for ride in rides_today:
-            writer.writerow([
-                ride.pk,
-                ride.passengers.count(),
-                ride.departure_location,
-                str(ride.departure_date),
-                ride.arrival_location,
-                str(ride.arrival_date),
-                ride.rating,
-            ])
-        return response
-    download_todays_rides.short_description = 'Download today\'s rides in CSV'
\ No newline at end of file
+        ]
+        rows = rides.iterator(chunk_size=self.export_chunk_size)
+        return stream_csv(filename, header, rows, compress=compress)
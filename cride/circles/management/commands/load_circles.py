@@ -0,0 +1,109 @@
+"""Load circles command."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+# Serializers
+from cride.circles.serializers import CircleImportSerializer
+
+# Models
+from cride.circles.models import Circle
+
+# Utilities
+import csv
+import time
+
+
+class Command(BaseCommand):
+    """Create or update circles from a CSV file.
+
+    The file is read row by row and loaded in batches, every batch costs
+    one query to find existing circles plus one bulk insert and one bulk
+    update, so memory and round trips don't grow with the file size.
+    """
+
+    help = 'Create or update circles from a CSV file with the circles.csv columns.'
+
+    # Circle fields overwritten when the slug already exists
+    update_fields = ('name', 'is_public', 'verified', 'is_limited', 'members_limit')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='circles.csv')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Circles written per batch.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('The batch size must be positive.')
+
+        self.created = self.updated = self.rejected = 0
+        start = time.monotonic()
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as csv_file:
+                reader = csv.DictReader(csv_file)
+                batch = {}
+                for row in reader:
+                    circle = self.validate_row(reader.line_num, row)
+                    if circle is None:
+                        continue
+                    # Later rows of the same slug win
+                    batch[circle.slug_name] = circle
+                    if len(batch) >= batch_size:
+                        self.load_batch(batch)
+                        batch = {}
+                if batch:
+                    self.load_batch(batch)
+        except OSError as exc:
+            raise CommandError(exc)
+
+        seconds = time.monotonic() - start
+        rows = self.created + self.updated + self.rejected
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {rows} rows in {seconds:.2f}s ({rows / seconds if seconds else rows:.0f} rows/s): '
+            f'{self.created} created, {self.updated} updated, {self.rejected} rejected.'
+        ))
+
+    def validate_row(self, line, row):
+        """Return an unsaved circle from the row, or None if it's invalid."""
+        serializer = CircleImportSerializer(data=row)
+        if not serializer.is_valid():
+            self.rejected += 1
+            errors = '; '.join(
+                f'{field}: {" ".join(str(error) for error in field_errors)}'
+                for field, field_errors in serializer.errors.items()
+            )
+            self.stderr.write(f'Line {line} rejected: {errors}')
+            return None
+        return Circle(**serializer.validated_data)
+
+    def load_batch(self, batch):
+        """Insert new circles and update existing ones."""
+        with transaction.atomic():
+            existing = Circle.objects.select_for_update().in_bulk(list(batch), field_name='slug_name')
+
+            new_circles = [circle for slug_name, circle in batch.items() if slug_name not in existing]
+            Circle.objects.bulk_create(new_circles)
+
+            now = timezone.now()
+            updated_circles = []
+            for slug_name, circle in existing.items():
+                for field in self.update_fields:
+                    setattr(circle, field, getattr(batch[slug_name], field))
+                circle.modified = now
+                updated_circles.append(circle)
+            Circle.objects.bulk_update(updated_circles, self.update_fields + ('modified',))
+
+            # Bulk updates don't call save()
+            for circle in updated_circles:
+                Circle.objects.invalidate(circle.slug_name)
+
+        self.created += len(new_circles)
+        self.updated += len(updated_circles)
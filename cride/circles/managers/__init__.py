@@ -1 +1,3 @@
-from .invitations import *
\ No newline at end of file
+from .circles import *
+from .invitations import *
+from .memberships import *
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""Circle managers."""
+
+# Django
+from django.core.cache import cache
+from django.db import models, transaction
+
+# Utilities
+import copy
+import time
+import threading
+from uuid import uuid4
+from collections import OrderedDict
+
+
+class CircleQuerySet(models.QuerySet):
+    """Circle queryset."""
+
+    def delete(self):
+        """Invalidate the deleted circles' slugs."""
+        slug_names = list(self.values_list('slug_name', flat=True))
+        deleted = super(CircleQuerySet, self).delete()
+        Circle = self.model
+        for slug_name in slug_names:
+            Circle.objects.invalidate(slug_name)
+        return deleted
+
+
+class CircleManager(models.Manager.from_queryset(CircleQuerySet)):
+    """Circle manager.
+
+    Resolve circles by their slug name through an in-process LRU in
+    front of the cache. Every slug has a version stored in the cache
+    that is replaced when the circle changes, local entries are only
+    served while their version matches, so invalidations reach every
+    process without a database round-trip.
+
+    Circles also have a ride feed version, replaced whenever one of
+    their rides changes, see `CachedListMixin`."""
+
+    CACHE_TIMEOUT = 60 * 60
+    LOCAL_TIMEOUT = 60
+    LOCAL_SIZE = 1024
+
+    _local = OrderedDict()
+    _local_lock = threading.Lock()
+
+    @staticmethod
+    def version_key(slug_name):
+        """Return the cache key of the slug's current version."""
+        return f'circles:slug:{slug_name}:version'
+
+    @staticmethod
+    def record_key(slug_name, version):
+        """Return the cache key of a circle version."""
+        return f'circles:slug:{slug_name}:{version}'
+
+    @staticmethod
+    def feed_version_key(circle_id):
+        """Return the cache key of the circle's ride feed version."""
+        return f'circles:feed:{circle_id}:version'
+
+    def get_by_slug(self, slug_name):
+        """Return the circle with the given slug name.
+
+        The returned circle might carry stale stats, update them with
+        F() expressions. Raise `Circle.DoesNotExist` when not found."""
+        version = self._get_version(self.version_key(slug_name))
+
+        with self._local_lock:
+            entry = self._local.get(slug_name)
+            if entry is not None:
+                entry_version, expires_at, circle = entry
+                if entry_version == version and expires_at > time.monotonic():
+                    self._local.move_to_end(slug_name)
+                    return copy.copy(circle)
+
+        key = self.record_key(slug_name, version)
+        circle = cache.get(key)
+        if circle is None:
+            circle = self.get(slug_name=slug_name)
+            cache.set(key, circle, self.CACHE_TIMEOUT)
+
+        with self._local_lock:
+            self._local[slug_name] = (version, time.monotonic() + self.LOCAL_TIMEOUT, circle)
+            self._local.move_to_end(slug_name)
+            while len(self._local) > self.LOCAL_SIZE:
+                self._local.popitem(last=False)
+
+        return copy.copy(circle)
+
+    def invalidate(self, slug_name):
+        """Replace the slug's version now and once the transaction commits."""
+        key = self.version_key(slug_name)
+        cache.set(key, uuid4().hex, None)
+        transaction.on_commit(lambda: cache.set(key, uuid4().hex, None))
+
+    def get_feed_version(self, circle_id):
+        """Return the circle's current ride feed version."""
+        return self._get_version(self.feed_version_key(circle_id))
+
+    def invalidate_feed(self, *circle_ids):
+        """Replace the circles' ride feed versions now and once the transaction commits."""
+        keys = [self.feed_version_key(circle_id) for circle_id in circle_ids]
+
+        def replace():
+            cache.set_many({key: uuid4().hex for key in keys}, None)
+
+        replace()
+        transaction.on_commit(replace)
+
+    def _get_version(self, key):
+        """Return the version stored at `key`, creating it if missing."""
+        version = cache.get(key)
+        if version is None:
+            version = uuid4().hex
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        return version
@@ -4,12 +4,12 @@
 from django.db import models
 
 # Utilities
-import random
+import secrets
 from string import ascii_letters, digits
 
 def generate_random_code(code_length: int, choices_pool: str) -> str:
     """Generate random code."""
-    return ''.join(random.choices(choices_pool, k=code_length))
+    return ''.join(secrets.choice(choices_pool) for _ in range(code_length))
 
 class InvitationManager(models.Manager):
     """Invitation manager.
@@ -26,4 +26,25 @@ class InvitationManager(models.Manager):
         while self.filter(code=code).exists():
             code = generate_random_code(self.CODE_LENGTH, pool)
         kwargs['code'] = code
-        return super(InvitationManager, self).create(**kwargs)
\ No newline at end of file
+        return super(InvitationManager, self).create(**kwargs)
+
+    def bulk_issue(self, n, issued_by, circle):
+        """Create `n` invitations with a single insert.
+
+        Codes are generated in a batch and checked against existing ones
+        with one query, colliding codes are generated again."""
+
+        pool = ascii_letters + digits
+        codes = set()
+        while len(codes) < n:
+            candidates = set()
+            while len(candidates) < n - len(codes):
+                candidates.add(generate_random_code(self.CODE_LENGTH, pool))
+            candidates -= codes
+            taken = self.filter(code__in=candidates).values_list('code', flat=True)
+            codes |= candidates - set(taken)
+
+        return self.bulk_create([
+            self.model(code=code, issued_by=issued_by, circle=circle)
+            for code in codes
+        ])
@@ -0,0 +1,68 @@
+"""Circle membership managers."""
+
+# Django
+from django.core.cache import cache
+from django.db import models, transaction
+
+
+class MembershipManager(models.Manager):
+    """Membership manager.
+
+    Resolve active memberships through a request-scoped memo in front
+    of the cache, so each request hits the database at most once per
+    (user, circle) pair and usually not at all."""
+
+    CACHE_TIMEOUT = 60 * 10
+    REQUEST_MEMO = '_active_memberships'
+
+    @staticmethod
+    def cache_key(user_id, circle_id):
+        """Return the cache key of a user's membership in a circle."""
+        return f'circles:membership:{user_id}:{circle_id}'
+
+    def get_active(self, user, circle, request=None):
+        """Return the user's active membership in the circle.
+
+        Cached memberships are meant for permission checks and as
+        reference to update stats with F() expressions, their counters
+        might be stale. Raise `Membership.DoesNotExist` if the user is
+        not an active member."""
+        if user.pk is None:
+            raise self.model.DoesNotExist('Anonymous users have no memberships.')
+
+        key = self.cache_key(user.pk, circle.pk)
+        memo = self._get_request_memo(request)
+
+        if key in memo:
+            membership = memo[key]
+        else:
+            membership = cache.get(key)
+            if membership is None:
+                membership = self.filter(
+                    user=user,
+                    circle=circle,
+                    is_active=True,
+                ).first()
+                # Store non members too so they don't hit the database again
+                cache.set(key, membership or False, self.CACHE_TIMEOUT)
+            memo[key] = membership
+
+        if not membership:
+            raise self.model.DoesNotExist('User is not an active member.')
+        return membership
+
+    def invalidate(self, user_id, circle_id):
+        """Drop the cached membership now and once the transaction commits."""
+        key = self.cache_key(user_id, circle_id)
+        cache.delete(key)
+        transaction.on_commit(lambda: cache.delete(key))
+
+    def _get_request_memo(self, request):
+        """Return the memberships memo bound to the request."""
+        if request is None:
+            return {}
+        memo = getattr(request, self.REQUEST_MEMO, None)
+        if memo is None:
+            memo = {}
+            setattr(request, self.REQUEST_MEMO, memo)
+        return memo
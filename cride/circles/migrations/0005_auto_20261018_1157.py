@@ -0,0 +1,21 @@
+# Generated by Django 3.1.1 on 2026-10-18 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0004_auto_20210602_0539'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(fields=['circle', 'issued_by', 'used'], name='invitation_issuer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['circle', 'user', 'is_active'], name='membership_circle_user_idx'),
+        ),
+    ]
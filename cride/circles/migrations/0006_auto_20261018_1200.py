@@ -0,0 +1,36 @@
+# Generated by Django 3.1.1 on 2026-10-18 18:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_members(apps, schema_editor):
+    """Fill `members_count` with the circles' active memberships."""
+    Circle = apps.get_model('circles', 'Circle')
+    Membership = apps.get_model('circles', 'Membership')
+    members = Membership.objects.filter(
+        circle=OuterRef('pk'),
+        is_active=True,
+    ).order_by().values('circle').annotate(count=Count('pk')).values('count')
+    Circle.objects.update(members_count=Coalesce(Subquery(members), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0005_auto_20261018_1157'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='circle',
+            name='members_count',
+            field=models.PositiveIntegerField(default=0, help_text='Active members, maintained on membership creation and deactivation.'),
+        ),
+        migrations.RunPython(count_members, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='circle',
+            index=models.Index(condition=models.Q(is_public=True), fields=['-members_count', '-rides_offered', '-rides_taken'], name='circle_popularity_idx'),
+        ),
+    ]
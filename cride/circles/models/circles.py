@@ -6,6 +6,9 @@ from django.db import models
 # Utilities
 from cride.utils.models import CRideModel
 
+# Managers
+from cride.circles.managers import CircleManager
+
 class Circle(CRideModel):
     """Circle model.
     
@@ -40,6 +43,10 @@ class Circle(CRideModel):
     )
 
     # stats
+    members_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Active members, maintained on membership creation and deactivation.'
+    )
     rides_offered = models.PositiveIntegerField(
         default=0,
     )
@@ -67,10 +74,34 @@ class Circle(CRideModel):
         help_text='if circle is limited, this will be the limit on the number of members'
     )
 
+    # Manager
+    objects = CircleManager()
+
     def __str__(self):
         """Return circle name."""
         return self.name
 
+    def save(self, *args, **kwargs):
+        """Invalidate the cached circle and its ride feed."""
+        super(Circle, self).save(*args, **kwargs)
+        Circle.objects.invalidate(self.slug_name)
+        Circle.objects.invalidate_feed(self.pk)
+
+    def delete(self, *args, **kwargs):
+        """Invalidate the cached circle."""
+        deleted = super(Circle, self).delete(*args, **kwargs)
+        Circle.objects.invalidate(self.slug_name)
+        return deleted
+
     class Meta(CRideModel.Meta):
         """Meta class."""
-        ordering = ['-rides_taken', '-rides_offered']
\ No newline at end of file
+        ordering = ['-rides_taken', '-rides_offered']
+
+        indexes = [
+            # Public circles listing sorted by popularity
+            models.Index(
+                fields=['-members_count', '-rides_offered', '-rides_taken'],
+                name='circle_popularity_idx',
+                condition=models.Q(is_public=True),
+            ),
+        ]
\ No newline at end of file
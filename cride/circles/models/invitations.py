@@ -45,4 +45,12 @@ class Invitation(CRideModel):
 
     def __str__(self):
         """Return code and circle."""
-        return "{}: {}".format(self.circle.slug_name, self.code)
\ No newline at end of file
+        return "{}: {}".format(self.circle.slug_name, self.code)
+
+    class Meta(CRideModel.Meta):
+        """Meta class."""
+
+        indexes = [
+            # Member's unused invitations
+            models.Index(fields=['circle', 'issued_by', 'used'], name='invitation_issuer_idx'),
+        ]
\ No newline at end of file
@@ -6,6 +6,9 @@ from django.db import models
 # utilities
 from cride.utils.models import CRideModel
 
+# Managers
+from cride.circles.managers import MembershipManager
+
 class Membership(CRideModel):
     """Membership model.
     
@@ -60,6 +63,27 @@ class Membership(CRideModel):
         help_text='Only active users are allowed to interact in the circle.'
     )
 
+    # Manager
+    objects = MembershipManager()
+
     def __str__(self):
         """Return username and circle."""
-        return f'@{self.user.username} at #{self.circle.slug_name}'
\ No newline at end of file
+        return f'@{self.user.username} at #{self.circle.slug_name}'
+
+    def save(self, *args, **kwargs):
+        """Invalidate the cached membership."""
+        super(Membership, self).save(*args, **kwargs)
+        Membership.objects.invalidate(self.user_id, self.circle_id)
+
+    def delete(self, *args, **kwargs):
+        """Invalidate the cached membership."""
+        Membership.objects.invalidate(self.user_id, self.circle_id)
+        return super(Membership, self).delete(*args, **kwargs)
+
+    class Meta(CRideModel.Meta):
+        """Meta class."""
+
+        indexes = [
+            # Active membership checks and circle members listings
+            models.Index(fields=['circle', 'user', 'is_active'], name='membership_circle_user_idx'),
+        ]
\ No newline at end of file
@@ -20,4 +20,5 @@ class IsCircleAdmin(BasePermission):
                 is_active=True,
             )
         except Membership.DoesNotExist:
-            return False
\ No newline at end of file
+            return False
+        return True
\ No newline at end of file
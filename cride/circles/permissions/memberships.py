@@ -15,11 +15,7 @@ class IsActiveCircleMember(BasePermission):
     def has_permission(self, request, view):
         """Verify user is an active member of the circle."""
         try:
-            Membership.objects.get(
-                user=request.user,
-                circle=view.circle,
-                is_active=True,
-            )
+            Membership.objects.get_active(request.user, view.circle, request=request)
         except Membership.DoesNotExist:
             return False
         return True
@@ -43,6 +39,10 @@ class IsCircleAdmin(BasePermission):
         """Verify the user is circle's admin."""
         has_permission = False
 
+        # Listings and joins have no member to look up
+        if not view.detail:
+            return True
+
         membership = view.get_object()
 
         if membership.user == request.user:
@@ -26,6 +26,7 @@ class CircleModelSerializer(serializers.ModelSerializer):
             'slug_name',
             'about',
             'picture',
+            'members_count',
             'rides_offered',
             'rides_taken',
             'verified',
@@ -33,7 +34,7 @@ class CircleModelSerializer(serializers.ModelSerializer):
             'is_limited',
             'members_limit',
         )
-        read_only_fields = ('is_public', 'verified', 'rides_taken', 'rides_offered',)
+        read_only_fields = ('is_public', 'verified', 'members_count', 'rides_taken', 'rides_offered',)
 
     def validate(self, data):
         """If `members_limit` is present, then `is_limited` should be present too."""
@@ -43,4 +44,30 @@ class CircleModelSerializer(serializers.ModelSerializer):
         if is_limited ^ bool(members_limit):
             raise serializers.ValidationError('If circle is limited, a members limit should be provided.')
 
-        return data
\ No newline at end of file
+        return data
+
+class CircleImportSerializer(CircleModelSerializer):
+    """Circle import serializer.
+
+    Validates `circles.csv` rows with the circle rules. Existing slugs are
+    accepted since imports update them, and a members limit of 0 means the
+    circle is not limited.
+    """
+
+    class Meta(CircleModelSerializer.Meta):
+        """Meta class."""
+        read_only_fields = ('members_count', 'rides_taken', 'rides_offered',)
+        extra_kwargs = {
+            'slug_name': {'validators': []},
+            'about': {'required': False},
+        }
+
+    def to_internal_value(self, data):
+        """Infer `is_limited` from the members limit."""
+        data = dict(data)
+        if data.get('members_limit') in (None, '', '0', 0):
+            data.pop('members_limit', None)
+            data['is_limited'] = False
+        else:
+            data['is_limited'] = True
+        return super(CircleImportSerializer, self).to_internal_value(data)
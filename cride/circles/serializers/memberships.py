@@ -1,6 +1,7 @@
 """Memberships serializer."""
 
 # Django
+from django.db.models import F
 from django.utils import timezone
 
 # DRF
@@ -8,12 +9,13 @@ from rest_framework import serializers
 
 # serializers
 from cride.users.serializers import UserModelSerializer
+from cride.utils.serializers import EagerLoadingMixin
 
 # models
-from cride.circles.models import Membership, Invitation
+from cride.circles.models import Circle, Membership, Invitation
 
 
-class MembershipModelSerializer(serializers.ModelSerializer):
+class MembershipModelSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Membership model serializer."""
 
     user = UserModelSerializer(read_only=True)
@@ -23,6 +25,8 @@ class MembershipModelSerializer(serializers.ModelSerializer):
         read_only=True,
     )
 
+    select_related_fields = ('user__profile', 'invited_by')
+
     class Meta:
         """Membership model serializer meta class."""
         model = Membership
@@ -93,6 +97,7 @@ class AddMemberSerializer(serializers.Serializer):
             circle=circle,
             invited_by=invitation.issued_by
         )
+        Circle.objects.filter(pk=circle.pk).update(members_count=F('members_count') + 1, modified=timezone.now())
 
         # update invitation
         invitation.used_by = user
@@ -0,0 +1,400 @@
+"""Circles tests."""
+
+# Django
+from django.contrib.admin.sites import site
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+
+# Views
+from cride.circles.views.memberships import MembershipViewSet
+
+# Utilities
+import csv
+import gzip
+import tempfile
+from io import StringIO
+from datetime import timedelta
+
+
+class CircleLookupCacheTestCase(TestCase):
+    """Circle slug lookup cache test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='UNAM Facultad de Ciencias',
+        )
+
+    def test_cached_lookup(self):
+        """Circles are resolved without queries once cached."""
+        Circle.objects.get_by_slug('fciencias')
+        with self.assertNumQueries(0):
+            circle = Circle.objects.get_by_slug('fciencias')
+        self.assertEqual(circle.pk, self.circle.pk)
+
+    def test_missing_circle(self):
+        """Unknown slugs raise DoesNotExist."""
+        with self.assertRaises(Circle.DoesNotExist):
+            Circle.objects.get_by_slug('unknown')
+
+    def test_invalidated_on_save(self):
+        """Saved circles are refreshed."""
+        Circle.objects.get_by_slug('fciencias')
+
+        self.circle.name = 'Ciencias UNAM'
+        self.circle.save()
+
+        self.assertEqual(Circle.objects.get_by_slug('fciencias').name, 'Ciencias UNAM')
+
+    def test_invalidated_on_delete(self):
+        """Deleted circles stop resolving."""
+        Circle.objects.get_by_slug('fciencias')
+        self.circle.delete()
+        with self.assertRaises(Circle.DoesNotExist):
+            Circle.objects.get_by_slug('fciencias')
+
+        circle = Circle.objects.create(name='Inventive', slug_name='inventive', about='Startup')
+        Circle.objects.get_by_slug('inventive')
+        Circle.objects.filter(pk=circle.pk).delete()
+        with self.assertRaises(Circle.DoesNotExist):
+            Circle.objects.get_by_slug('inventive')
+
+    def test_invalidated_by_admin_actions(self):
+        """Verifying circles through the admin refreshes them."""
+        Circle.objects.get_by_slug('fciencias')
+
+        site._registry[Circle].verify_circles(None, Circle.objects.all())
+
+        self.assertTrue(Circle.objects.get_by_slug('fciencias').verified)
+
+
+class CircleUpdateAPITestCase(APITestCase):
+    """Circle update endpoint test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password='admin123',
+        )
+        self.profile = Profile.objects.create(user=self.user)
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='UNAM Facultad de Ciencias',
+        )
+        Membership.objects.create(
+            user=self.user,
+            profile=self.profile,
+            circle=self.circle,
+            is_admin=True,
+        )
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token}')
+
+    def test_renamed_slug_is_invalidated(self):
+        """Nested routes stop resolving the circle's previous slug."""
+        self.assertEqual(self.client.get('/circles/fciencias/rides/').status_code, status.HTTP_200_OK)
+
+        response = self.client.patch('/circles/fciencias/', {'slug_name': 'ciencias'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.client.get('/circles/fciencias/rides/').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get('/circles/ciencias/rides/').status_code, status.HTTP_200_OK)
+
+
+class CircleMembersCountAPITestCase(APITestCase):
+    """Circle members count test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password='admin123',
+        )
+        Profile.objects.create(user=self.user)
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token}')
+
+    def test_count_maintained(self):
+        """Creating a circle and leaving it update its members count."""
+        response = self.client.post('/circles/', {
+            'name': 'Facultad de Ciencias',
+            'slug_name': 'fciencias',
+            'about': 'UNAM Facultad de Ciencias',
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['members_count'], 1)
+        self.assertEqual(Circle.objects.get(slug_name='fciencias').members_count, 1)
+
+        response = self.client.delete('/circles/fciencias/members/joedoe/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(Circle.objects.get(slug_name='fciencias').members_count, 0)
+
+    def test_count_decremented_once(self):
+        """Deleting an already inactive membership keeps the members count."""
+        circle = Circle.objects.create(name='Facultad de Ciencias', slug_name='fciencias', about='UNAM')
+        membership = Membership.objects.create(user=self.user, profile=self.user.profile, circle=circle)
+        Circle.objects.filter(pk=circle.pk).update(members_count=1)
+
+        view = MembershipViewSet(circle=circle)
+        view.perform_destroy(membership)
+        view.perform_destroy(membership)
+
+        self.assertEqual(Circle.objects.get(pk=circle.pk).members_count, 0)
+        self.assertFalse(Membership.objects.get(pk=membership.pk).is_active)
+
+    def test_listing_sorted_by_popularity(self):
+        """Public circles are listed by members count first."""
+        for slug_name, members_count in (('small', 10), ('big', 500), ('medium', 80)):
+            Circle.objects.create(
+                name=slug_name,
+                slug_name=slug_name,
+                about='',
+                members_count=members_count,
+            )
+
+        response = self.client.get('/circles/')
+
+        self.assertEqual(
+            [circle['slug_name'] for circle in response.data['results']],
+            ['big', 'medium', 'small']
+        )
+
+
+class RidesExportTestCase(TestCase):
+    """Circle admin rides export test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='UNAM Facultad de Ciencias',
+        )
+        self.admin = User.objects.create(
+            email='admin@test-mail.com',
+            username='admin',
+            password='admin123',
+            is_staff=True,
+            is_superuser=True,
+        )
+        self.client.force_login(self.admin)
+        self.url = '/admin/circles/circle/rides/'
+        self.now = timezone.now()
+
+    def create_ride(self, departure, passengers=0):
+        """Create a ride with some passengers."""
+        ride = Ride.objects.create(
+            offered_by=self.admin,
+            offered_in=self.circle,
+            available_seats=3,
+            comments='',
+            departure_location='Ciudad Universitaria',
+            departure_date=departure,
+            arrival_location='Coyoacan',
+            arrival_date=departure + timedelta(hours=1),
+        )
+        for i in range(passengers):
+            ride.passengers.add(User.objects.create(
+                email=f'passenger{ride.pk}-{i}@test-mail.com',
+                username=f'passenger{ride.pk}-{i}',
+                password='admin123',
+            ))
+        return ride
+
+    def read_rows(self, response, compressed=False):
+        """Return the rows of a streamed CSV response."""
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content)
+        if compressed:
+            content = gzip.decompress(content)
+        return list(csv.reader(content.decode().splitlines()))
+
+    def test_date_range(self):
+        """Rides departing within the range are exported with their passengers."""
+        today = timezone.localtime(self.now).replace(hour=12, minute=0)
+        inside = self.create_ride(today - timedelta(days=2), passengers=2)
+        self.create_ride(today - timedelta(days=2), passengers=1)
+        self.create_ride(today - timedelta(days=5))
+        self.create_ride(today + timedelta(days=1))
+
+        start = (today - timedelta(days=3)).strftime('%Y-%m-%d')
+        end = today.strftime('%Y-%m-%d')
+        response = self.client.get(self.url, {'start': start, 'end': end, 'circle': self.circle.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'{start}_{end}_rides--fciencias.csv', response['Content-Disposition'])
+        rows = self.read_rows(response)
+        self.assertEqual(rows[0][:2], ['id', 'passengers'])
+        self.assertEqual([row[:2] for row in rows[1:3]], [[str(inside.pk), '2'], [str(inside.pk + 1), '1']])
+        self.assertEqual(len(rows), 3)
+
+    def test_gzip(self):
+        """Compressed exports are gzip streams."""
+        self.create_ride(self.now, passengers=1)
+
+        response = self.client.get(self.url, {'gzip': ''})
+
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('.csv.gz', response['Content-Disposition'])
+        self.assertEqual(len(self.read_rows(response, compressed=True)), 2)
+
+    def test_single_query(self):
+        """Rows are read with one query whatever the number of rides."""
+        for _ in range(5):
+            self.create_ride(self.now, passengers=2)
+
+        response = site._registry[Circle].download_todays_rides(None, Circle.objects.all())
+        with self.assertNumQueries(1):
+            rows = self.read_rows(response)
+        self.assertEqual([row[1] for row in rows[1:]], ['2'] * 5)
+
+    def test_invalid_range(self):
+        """Ranges ending before they start are rejected."""
+        response = self.client.get(self.url, {'start': '2026-10-18', 'end': '2026-10-01'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_date(self):
+        """Malformed dates are rejected instead of exporting the default range."""
+        for params in ({'start': '18/10/2026'}, {'end': 'yesterday'}, {'start': '2026-02-30'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400)
+
+
+class LoadCirclesTestCase(TestCase):
+    """Load circles command test case."""
+
+    def load(self, content, **options):
+        """Run the command over a CSV file, return its output and errors."""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as csv_file:
+            csv_file.write(content)
+            csv_file.flush()
+            out, err = StringIO(), StringIO()
+            call_command('load_circles', csv_file.name, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_load(self):
+        """Valid rows are created and invalid ones reported."""
+        out, err = self.load(
+            'name,slug_name,is_public,verified,members_limit\n'
+            '"Facultad de Ciencias, UNAM",unam-fciencias,1,1,0\n'
+            'Inventive,inventive,0,1,30\n'
+            'Tiny,tiny,1,0,5\n'
+            ',nameless,1,1,0\n'
+            'Platzi,platzi bog,1,1,0\n',
+            batch_size=1,
+        )
+
+        self.assertIn('2 created, 0 updated, 3 rejected', out)
+        self.assertIn('Line 4 rejected: members_limit', err)
+        self.assertIn('Line 5 rejected: name', err)
+        self.assertIn('Line 6 rejected: slug_name', err)
+        inventive = Circle.objects.get(slug_name='inventive')
+        self.assertEqual(
+            (inventive.is_public, inventive.verified, inventive.is_limited, inventive.members_limit),
+            (False, True, True, 30)
+        )
+        self.assertFalse(Circle.objects.get(slug_name='unam-fciencias').is_limited)
+
+    def test_upsert(self):
+        """Existing circles are updated in batches."""
+        circle = Circle.objects.create(name='Inventive', slug_name='inventive', about='Startup')
+        self.assertFalse(Circle.objects.get_by_slug('inventive').verified)
+
+        content = 'name,slug_name,is_public,verified,members_limit\n' + ''.join(
+            f'Circle {i},circle-{i},1,0,0\n' for i in range(9)
+        ) + 'Inventive Inc,inventive,0,1,30\n'
+        with self.assertNumQueries(4 * 4):
+            # per batch: savepoint, lookup, insert or update, release
+            out, err = self.load(content, batch_size=3)
+
+        self.assertIn('9 created, 1 updated, 0 rejected', out)
+        self.assertEqual(Circle.objects.count(), 10)
+        circle.refresh_from_db()
+        self.assertEqual((circle.name, circle.about, circle.members_limit), ('Inventive Inc', 'Startup', 30))
+        self.assertTrue(Circle.objects.get_by_slug('inventive').verified)
+
+    def test_repository_file(self):
+        """The shipped circles file loads."""
+        out, err = self.load(open('circles.csv', encoding='utf-8').read())
+        self.assertIn('0 rejected', out)
+        self.assertEqual(err, '')
+
+
+class CircleConditionalGetAPITestCase(APITestCase):
+    """Circle conditional requests test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password='admin123',
+        )
+        Profile.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        response = self.client.post('/circles/', {
+            'name': 'Facultad de Ciencias',
+            'slug_name': 'fciencias',
+            'about': 'UNAM Facultad de Ciencias',
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.url = '/circles/fciencias/'
+
+    def test_retrieve(self):
+        """Unchanged circles aren't serialized again."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('no-cache', response['Cache-Control'])
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.metrics.serializer_time, 0)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # The members count is updated in bulk
+        response = self.client.delete(f'{self.url}members/joedoe/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['members_count'], 0)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list(self):
+        """Unchanged listings aren't serialized again."""
+        response = self.client.get('/circles/')
+        etag = response['ETag']
+
+        response = self.client.get('/circles/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Rows leaving a listing don't change its latest modification
+        response = self.client.get('/circles/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        Circle.objects.create(name='Facultad de Música', slug_name='fam', about='UNAM FaM')
+        response = self.client.get('/circles/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
@@ -13,6 +13,9 @@ from django.contrib.auth import get_user_model
 from rest_framework.authtoken.models import Token
 from cride.circles.models import Invitation, Circle, Membership
 
+# Utilities
+from unittest import mock
+
 User = get_user_model()
 
 class InvitationManagerTestCase(TestCase):
@@ -68,6 +71,26 @@ class InvitationManagerTestCase(TestCase):
 
         self.assertNotEqual(code, invitation.code)
 
+    def test_bulk_issue(self):
+        """Invitations are issued in bulk with one lookup and one insert."""
+        with self.assertNumQueries(2):
+            invitations = Invitation.objects.bulk_issue(20, issued_by=self.user, circle=self.circle)
+
+        codes = {invitation.code for invitation in invitations}
+        self.assertEqual(len(codes), 20)
+        self.assertEqual(Invitation.objects.filter(code__in=codes, issued_by=self.user).count(), 20)
+
+    def test_bulk_issue_collisions(self):
+        """Only colliding codes are generated again."""
+        Invitation.objects.create(issued_by=self.user, circle=self.circle, code='taken')
+
+        codes = iter(['taken', 'first', 'first', 'second'])
+        with mock.patch('cride.circles.managers.invitations.generate_random_code', lambda *args: next(codes)):
+            invitations = Invitation.objects.bulk_issue(2, issued_by=self.user, circle=self.circle)
+
+        self.assertEqual(sorted(invitation.code for invitation in invitations), ['first', 'second'])
+        self.assertEqual(Invitation.objects.count(), 3)
+
 class MembersInvitationsAPITestCase(APITestCase):
     """Test API endpoint"""
 
@@ -0,0 +1,135 @@
+"""Memberships tests."""
+
+# Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+
+# Testing
+from cride.utils.testing import CircleMembersMixin
+
+# Utilities
+from datetime import timedelta
+
+
+class ActiveMembershipCacheTestCase(APITestCase):
+    """Active membership resolution test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password='admin123',
+        )
+        self.profile = Profile.objects.create(user=self.user)
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='UNAM Facultad de Ciencias',
+        )
+        self.membership = Membership.objects.create(
+            user=self.user,
+            profile=self.profile,
+            circle=self.circle,
+        )
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token}')
+        self.url = f'/circles/{self.circle.slug_name}/rides/'
+
+    def count_membership_queries(self, method, data=None):
+        """Return the number of membership queries ran by a request."""
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(self.url, data)
+        self.assertLess(response.status_code, status.HTTP_400_BAD_REQUEST, response.data)
+        return len([
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and 'FROM "circles_membership"' in query['sql']
+        ])
+
+    def test_resolved_once_per_request(self):
+        """Permission and serializer share the same membership lookup."""
+        departure = timezone.now() + timedelta(hours=1)
+        data = {
+            'available_seats': 3,
+            'comments': 'Leaving from the main entrance',
+            'departure_location': 'Ciudad Universitaria',
+            'departure_date': departure,
+            'arrival_location': 'Coyoacan',
+            'arrival_date': departure + timedelta(hours=1),
+        }
+        self.assertEqual(self.count_membership_queries('post', data), 1)
+
+    def test_cached_between_requests(self):
+        """Further requests don't hit the database."""
+        self.count_membership_queries('get')
+        self.assertEqual(self.count_membership_queries('get'), 0)
+
+    def test_invalidated_when_member_leaves(self):
+        """Deactivated memberships are no longer granted access."""
+        self.count_membership_queries('get')
+
+        self.membership.is_active = False
+        self.membership.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_non_members_are_cached(self):
+        """Users without membership are cached too."""
+        circle = Circle.objects.create(name='Other', slug_name='other', about='')
+        self.assertRaises(
+            Membership.DoesNotExist,
+            Membership.objects.get_active,
+            self.user,
+            circle,
+        )
+        with self.assertNumQueries(0):
+            self.assertRaises(
+                Membership.DoesNotExist,
+                Membership.objects.get_active,
+                self.user,
+                circle,
+            )
+
+
+class MembersListAPITestCase(CircleMembersMixin, APITestCase):
+    """Circle members listing test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = self.create_circle()
+        self.user = self.create_member('joedoe', is_admin=True)
+        for i in range(4):
+            self.create_member(f'member{i}')
+        self.authenticate(self.user)
+        self.url = f'/circles/{self.circle.slug_name}/members/'
+
+    def test_pages(self):
+        """Members are listed in keyset pages."""
+        usernames = []
+        url = f'{self.url}?limit=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            self.assertLessEqual(len(response.data['results']), 2)
+            usernames += [member['user']['username'] for member in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(sorted(usernames), ['joedoe', 'member0', 'member1', 'member2', 'member3'])
+
+    def test_non_members(self):
+        """Only the circle's members can list them."""
+        self.authenticate(self.create_member('outsider', circle=self.create_circle(slug_name='fam')))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
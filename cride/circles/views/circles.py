@@ -1,5 +1,9 @@
 """Circle views."""
 
+# Django
+from django.db.models import F
+from django.utils import timezone
+
 # Django REST Framework
 from rest_framework import viewsets, mixins
 
@@ -9,7 +13,14 @@ from rest_framework.permissions import IsAuthenticated
 
 # Filters
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from cride.utils.filters import TrigramSearchFilter
+
+# Pagination
+from cride.utils.pagination import KeysetPagination
+
+# Views
+from cride.utils.views import MetricsMixin, ConditionalGetMixin, CompiledListMixin
 
 # cride serializers
 from cride.circles.serializers import CircleModelSerializer
@@ -18,6 +29,9 @@ from cride.circles.serializers import CircleModelSerializer
 from cride.circles.models import Circle, Membership
 
 class CircleViewSet(
+        MetricsMixin,
+        ConditionalGetMixin,
+        CompiledListMixin,
         mixins.CreateModelMixin,
         mixins.RetrieveModelMixin,
         mixins.UpdateModelMixin,
@@ -28,12 +42,13 @@ class CircleViewSet(
 
     serializer_class = CircleModelSerializer
     lookup_field = 'slug_name'
+    pagination_class = KeysetPagination
 
     # filters
-    filter_backends = (SearchFilter, OrderingFilter, DjangoFilterBackend)
+    filter_backends = (TrigramSearchFilter, OrderingFilter, DjangoFilterBackend)
     search_fields = ('slug_name', 'name')
-    ordering_fields = ('rides_offered', 'rides_taken', 'name', 'created', 'members_limit')
-    ordering = ('-members__count', '-rides_offered', '-rides_taken')
+    ordering_fields = ('members_count', 'rides_offered', 'rides_taken', 'name', 'created', 'members_limit')
+    ordering = ('-members_count', '-rides_offered', '-rides_taken')
     filter_fields = ('verified', 'is_limited')
 
     def get_queryset(self):
@@ -49,13 +64,18 @@ class CircleViewSet(
         """Assign permissions based on actions to perform."""
         permissions = [IsAuthenticated]
 
-        print(self.action)
-
         if self.action in ['update', 'partial_update']:
             permissions.append(IsCircleAdmin)
 
         return [permission() for permission in permissions]
 
+    def perform_update(self, serializer):
+        """Invalidate the cached circle, also under its previous slug name."""
+        slug_name = serializer.instance.slug_name
+        circle = serializer.save()
+        if circle.slug_name != slug_name:
+            Circle.objects.invalidate(slug_name)
+
     def perform_create(self, serializer):
         """Assign circle admin."""
         circle = serializer.save()
@@ -67,4 +87,6 @@ class CircleViewSet(
             circle=circle,
             is_admin=True,
             remaining_invitations=10,
-        )
\ No newline at end of file
+        )
+        Circle.objects.filter(pk=circle.pk).update(members_count=F('members_count') + 1, modified=timezone.now())
+        circle.refresh_from_db(fields=['members_count', 'modified'])
\ No newline at end of file
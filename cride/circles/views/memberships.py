@@ -1,9 +1,13 @@
 """Circle membership views."""
 
+# Django
+from django.db.models import F
+from django.utils import timezone
+
 # DRF
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework import viewsets, mixins, status
+from rest_framework import mixins
 from rest_framework.generics import get_object_or_404
 
 # permissions
@@ -15,7 +19,11 @@ from cride.circles.permissions.memberships import (
 )
 
 # serializers
-from cride.circles.serializers import MembershipModelSerializer, AddMemberSerializer, CircleModelSerializer
+from cride.circles.serializers import MembershipModelSerializer, AddMemberSerializer
+
+# Views
+from cride.utils.views import RelatedToCircle, EagerLoadingViewMixin, MetricsMixin, CompiledListMixin
+from cride.utils.pagination import KeysetPagination
 
 # models
 from cride.circles.models import (
@@ -25,27 +33,19 @@ from cride.circles.models import (
 )
 
 class MembershipViewSet(
+        MetricsMixin,
+        CompiledListMixin,
+        EagerLoadingViewMixin,
         mixins.ListModelMixin,
         mixins.CreateModelMixin,
         mixins.RetrieveModelMixin,
         mixins.DestroyModelMixin,
-        viewsets.GenericViewSet
+        RelatedToCircle,
     ):
     """Circle membership view set."""
 
     serializer_class = MembershipModelSerializer
-
-    def dispatch(self, request, *args, **kwargs):
-        """Verify that the circle exists."""
-
-        slug_name = kwargs['slug_name']
-
-        self.circle = get_object_or_404(
-            Circle,
-            slug_name=slug_name,
-        )
-
-        return super(MembershipViewSet, self).dispatch(request, *args, **kwargs)
+    pagination_class = KeysetPagination
 
     def get_permissions(self):
         """Assign permissions based on action."""
@@ -68,16 +68,22 @@ class MembershipViewSet(
         """Return the circle member by using the user's username."""
         # import pdb; pdb.set_trace()
         return get_object_or_404(
-            Membership,
+            self.setup_eager_loading(Membership.objects.all()),
             user__username=self.kwargs['pk'],
             circle=self.circle,
             is_active=True
         )
 
     def perform_destroy(self, instance):
-        """Disable membership."""
-        instance.is_active = False
-        instance.save()
+        """Disable membership.
+
+        Only the request that deactivates the membership decrements the
+        members count, so repeated or concurrent deletes count it once."""
+        now = timezone.now()
+        deactivated = Membership.objects.filter(pk=instance.pk, is_active=True).update(is_active=False, modified=now)
+        Membership.objects.invalidate(instance.user_id, instance.circle_id)
+        if deactivated == 1:
+            Circle.objects.filter(pk=self.circle.pk).update(members_count=F('members_count') - 1, modified=now)
 
     @action(detail=True, methods=['get'])
     def invitations(self, request, *args, **kwargs):
@@ -89,10 +95,13 @@ class MembershipViewSet(
         """
         member = self.get_object()
 
-        invited_members = Membership.objects.filter(
-            circle=self.circle,
-            invited_by=request.user,
-            is_active=True,
+        invited_members = self.setup_eager_loading(
+            Membership.objects.filter(
+                circle=self.circle,
+                invited_by=request.user,
+                is_active=True,
+            ),
+            MembershipModelSerializer,
         )
 
         unused_invitations = Invitation.objects.filter(
@@ -104,13 +113,11 @@ class MembershipViewSet(
         diff = member.remaining_invitations - len(unused_invitations)
 
         invitations = [x[0] for x in unused_invitations]
-        for i in range(0, diff):
-            invitations.append(
-                Invitation.objects.create(
-                    issued_by=request.user,
-                    circle=self.circle
-                ).code
-            )
+        if diff > 0:
+            invitations += [
+                invitation.code for invitation in
+                Invitation.objects.bulk_issue(diff, issued_by=request.user, circle=self.circle)
+            ]
 
         data = {
             'used_invitations': MembershipModelSerializer(invited_members, many=True).data,
@@ -0,0 +1,13 @@
+"""Pytest configuration."""
+
+# Django
+from django.core.cache import cache
+
+# Pytest
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache."""
+    cache.clear()
@@ -0,0 +1,33 @@
+"""Backfill ratings aggregates command."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Models
+from cride.rides.models import Rating
+
+
+class Command(BaseCommand):
+    """Recompute the ratings sum and count of rides and profiles."""
+
+    help = 'Recompute the ratings aggregates of rides and profiles from their ratings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mismatched',
+            action='store_true',
+            help='Only rebuild rides and profiles whose aggregates are wrong.',
+        )
+
+    def handle(self, *args, **options):
+        rides = profiles = None
+        if options['mismatched']:
+            rides, profiles = Rating.objects.get_mismatches()
+
+        updated_rides, updated_profiles = Rating.objects.rebuild_aggregates(
+            rides=rides,
+            profiles=profiles,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt ratings of {updated_rides} rides and {updated_profiles} profiles.'
+        ))
@@ -0,0 +1,386 @@
+"""Benchmark API command."""
+
+# Django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+# DRF
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride, Rating
+
+# Utilities
+import json
+import math
+import time
+import random
+import secrets
+from datetime import timedelta
+
+
+def percentile(values, q):
+    """Return the nearest-rank percentile of sorted values."""
+    return values[max(math.ceil(q / 100 * len(values)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    """Benchmark the main API endpoints over generated data.
+
+    Data is generated from a seed inside a transaction that is rolled
+    back at the end, so runs are reproducible and the database is left
+    untouched. Requests go in-process through the whole middleware stack,
+    queries are taken from the request metrics. Results can be saved as
+    a JSON baseline, comparing against one fails on regressions.
+    """
+
+    help = 'Measure latency, queries and throughput of the main API endpoints.'
+
+    scenarios = (
+        'ride-list', 'ride-list-deep', 'ride-join', 'ride-finish',
+        'circle-list', 'invitations', 'login',
+    )
+
+    password = 'benchmark-password'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--circles', type=int, default=10)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--memberships', type=int, default=3, help='Circles joined by each user.')
+        parser.add_argument('--rides', type=int, default=10000)
+        parser.add_argument('--ratings', type=int, default=10000)
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per scenario.')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per scenario.')
+        parser.add_argument('--depth', type=int, default=50, help='Page reached by ride-list-deep.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            dest='scenarios',
+            choices=self.scenarios,
+            help='Scenario to run, can be repeated. Defaults to all of them.',
+        )
+        parser.add_argument('--baseline', help='JSON baseline to compare the results with.')
+        parser.add_argument('--save-baseline', help='Write the results as a JSON baseline.')
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed relative p95 slowdown over the baseline.',
+        )
+
+    def handle(self, *args, **options):
+        scale = {
+            name: options[name]
+            for name in ('circles', 'users', 'memberships', 'rides', 'ratings', 'seed')
+        }
+        if scale['users'] < 2 or scale['circles'] < 1:
+            raise CommandError('At least 2 users and 1 circle are needed.')
+        if scale['memberships'] > scale['circles']:
+            raise CommandError('Users cannot join more circles than there are.')
+
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.client = APIClient()
+        self.total = options['requests'] + options['warmup']
+
+        results = {}
+        try:
+            # Every request comes from the same client, don't throttle logins
+            overrides = override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+                REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}},
+            )
+            with transaction.atomic(), overrides:
+                self.seed(**scale)
+                for name in options['scenarios'] or self.scenarios:
+                    calls = getattr(self, 'scenario_' + name.replace('-', '_'))(options)
+                    results[name] = self.measure(name, calls, options['warmup'])
+                transaction.set_rollback(True)
+        finally:
+            self.clear_caches()
+
+        report = {'scale': scale, 'scenarios': results}
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Baseline saved to {options['save_baseline']}.")
+        if options['baseline']:
+            self.compare(report, options['baseline'], options['tolerance'])
+
+    def seed(self, circles, users, memberships, rides, ratings, seed):
+        """Generate the circles, users, memberships, rides and ratings.
+
+        The first user, the actor, is an admin of every circle and owns
+        the rides finished by the benchmark."""
+        start = time.monotonic()
+        rng = self.rng
+
+        Circle.objects.bulk_create([
+            Circle(
+                name=f'Benchmark circle {i}',
+                slug_name=f'benchmark-{seed}-{i}',
+                about='Benchmark circle',
+                members_count=0,
+            )
+            for i in range(circles)
+        ])
+
+        password = make_password(self.password)
+        User.objects.bulk_create([
+            User(
+                email=f'benchmark{i}@benchmark.cride',
+                username=f'benchmark-{seed}-{i}',
+                first_name='Benchmark',
+                last_name=str(i),
+                password=password,
+                is_verified=True,
+            )
+            for i in range(users)
+        ])
+        self.users = list(User.objects.filter(email__endswith='@benchmark.cride').order_by('pk'))
+        Profile.objects.bulk_create([Profile(user=user) for user in self.users])
+        profiles = list(Profile.objects.filter(user__in=self.users).order_by('user_id'))
+        self.tokens = {
+            token.user_id: token.key
+            for token in Token.objects.bulk_create([
+                Token(user=user, key=secrets.token_hex(20)) for user in self.users
+            ])
+        }
+
+        # Primary keys are not set by bulk_create on every database
+        self.circles = list(Circle.objects.filter(slug_name__startswith=f'benchmark-{seed}-').order_by('pk'))
+        self.slugs = {circle.pk: circle.slug_name for circle in self.circles}
+        self.actor = self.users[0]
+        self.members = {circle.pk: [] for circle in self.circles}
+        new_memberships = []
+        for user, profile in zip(self.users, profiles):
+            joined = self.circles if user == self.actor else rng.sample(self.circles, memberships)
+            for circle in joined:
+                self.members[circle.pk].append(user)
+                new_memberships.append(Membership(
+                    user=user,
+                    profile=profile,
+                    circle=circle,
+                    is_admin=user == self.actor,
+                    remaining_invitations=10 if user == self.actor else 0,
+                ))
+        Membership.objects.bulk_create(new_memberships, batch_size=1000)
+        for circle in self.circles:
+            Circle.objects.filter(pk=circle.pk).update(members_count=len(self.members[circle.pk]))
+
+        new_rides = []
+        for _ in range(rides):
+            circle = rng.choice(self.circles)
+            departure = self.now + timedelta(minutes=rng.randint(-2 * 24 * 60, 30 * 24 * 60))
+            new_rides.append(Ride(
+                offered_by=rng.choice(self.members[circle.pk]),
+                offered_in=circle,
+                available_seats=rng.randint(1, 4),
+                comments='',
+                departure_location=f'Departure {rng.randrange(100)}',
+                departure_date=departure,
+                arrival_location=f'Arrival {rng.randrange(100)}',
+                arrival_date=departure + timedelta(hours=1),
+            ))
+        # Started rides the actor finishes
+        for _ in range(self.total):
+            departure = self.now - timedelta(minutes=rng.randint(5, 60))
+            new_rides.append(Ride(
+                offered_by=self.actor,
+                offered_in=self.circles[0],
+                comments='',
+                departure_location='Departure',
+                departure_date=departure,
+                arrival_location='Arrival',
+                arrival_date=departure + timedelta(hours=1),
+            ))
+        Ride.objects.bulk_create(new_rides, batch_size=1000)
+        self.rides = list(Ride.objects.filter(offered_in__in=self.circles).order_by('pk'))
+
+        past_rides = [ride for ride in self.rides if ride.departure_date < self.now]
+        if past_rides and ratings:
+            new_ratings = []
+            for _ in range(ratings):
+                ride = rng.choice(past_rides)
+                new_ratings.append(Rating(
+                    ride=ride,
+                    circle_id=ride.offered_in_id,
+                    rating_user=rng.choice(self.members[ride.offered_in_id]),
+                    rated_user_id=ride.offered_by_id,
+                    rating=rng.randint(1, 5),
+                ))
+            Rating.objects.bulk_create(new_ratings, batch_size=1000)
+            Rating.objects.rebuild_aggregates(
+                rides=Ride.objects.filter(offered_in__in=self.circles),
+                profiles=Profile.objects.filter(user__in=self.users),
+            )
+
+        self.clear_caches()
+        self.stdout.write(
+            f'Seeded {circles} circles, {users} users, {len(new_memberships)} memberships, '
+            f'{len(self.rides)} rides and {ratings} ratings in {time.monotonic() - start:.1f}s.'
+        )
+
+    def clear_caches(self):
+        """Drop the cached circles, memberships, ride indexes and feeds of the generated data."""
+        for circle in getattr(self, 'circles', ()):
+            Circle.objects.invalidate(circle.slug_name)
+            Circle.objects.invalidate_feed(circle.pk)
+            Ride.objects.invalidate_index(circle.pk)
+            cache.delete_many([
+                Membership.objects.cache_key(user.pk, circle.pk)
+                for user in getattr(self, 'users', ())
+            ])
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.tokens[user.pk]}')
+
+    def scenario_ride_list(self, options):
+        """List the upcoming rides of the actor's circles."""
+        self.authenticate(self.actor)
+        return [
+            lambda circle=self.circles[i % len(self.circles)]: self.client.get(
+                f'/circles/{circle.slug_name}/rides/'
+            )
+            for i in range(self.total)
+        ]
+
+    def scenario_ride_list_deep(self, options):
+        """Fetch a page deep into the upcoming rides of the first circle."""
+        self.authenticate(self.actor)
+        url = f'/circles/{self.circles[0].slug_name}/rides/'
+        for _ in range(options['depth'] - 1):
+            next_url = json.loads(self.client.get(url).content)['next']
+            if next_url is None:
+                break
+            url = next_url
+        return [lambda: self.client.get(url)] * self.total
+
+    def scenario_ride_join(self, options):
+        """Join upcoming rides as members who are not passengers yet."""
+        upcoming = [
+            ride for ride in self.rides
+            if ride.departure_date > self.now + timedelta(hours=1) and ride.offered_by_id != self.actor.pk
+        ]
+        passengers = set()
+        calls = []
+        for ride in self.rng.sample(upcoming, len(upcoming)):
+            candidates = [
+                user for user in self.members[ride.offered_in_id]
+                if user.pk not in passengers and user.pk not in (ride.offered_by_id, self.actor.pk)
+            ]
+            if not candidates:
+                continue
+            passenger = self.rng.choice(candidates)
+            passengers.add(passenger.pk)
+            calls.append(self.join_call(ride, passenger))
+            if len(calls) == self.total:
+                return calls
+        raise CommandError('Not enough upcoming rides and members to join them, increase the scale.')
+
+    def join_call(self, ride, passenger):
+        def call():
+            self.authenticate(passenger)
+            return self.client.post(f'/circles/{self.slugs[ride.offered_in_id]}/rides/{ride.pk}/join/')
+        return call
+
+    def scenario_ride_finish(self, options):
+        """Finish the started rides of the actor."""
+        self.authenticate(self.actor)
+        started = [
+            ride for ride in self.rides
+            if ride.offered_by_id == self.actor.pk and ride.departure_date < self.now
+            and ride.offered_in_id == self.circles[0].pk
+        ]
+        return [
+            lambda ride=ride: self.client.post(f'/circles/{self.circles[0].slug_name}/rides/{ride.pk}/finish/')
+            for ride in started[-self.total:]
+        ]
+
+    def scenario_circle_list(self, options):
+        """List the circles."""
+        self.authenticate(self.actor)
+        return [lambda: self.client.get('/circles/')] * self.total
+
+    def scenario_invitations(self, options):
+        """Retrieve the actor's invitations in every circle."""
+        self.authenticate(self.actor)
+        return [
+            lambda circle=self.circles[i % len(self.circles)]: self.client.get(
+                f'/circles/{circle.slug_name}/members/{self.actor.username}/invitations/'
+            )
+            for i in range(self.total)
+        ]
+
+    def scenario_login(self, options):
+        """Log in as random users."""
+        def call(user):
+            self.client.credentials()
+            return self.client.post('/users/login/', {'email': user.email, 'password': self.password})
+        return [lambda user=self.rng.choice(self.users): call(user) for _ in range(self.total)]
+
+    def measure(self, name, calls, warmup):
+        """Run the scenario's calls and return its statistics."""
+        timings = []
+        queries = []
+        start = time.perf_counter()
+        for i, call in enumerate(calls):
+            if i == warmup:
+                start = time.perf_counter()
+            request_start = time.perf_counter()
+            response = call()
+            elapsed = (time.perf_counter() - request_start) * 1000
+            if response.status_code >= 400:
+                raise CommandError(f'{name}: {response.status_code} {response.content[:200]!r}')
+            if i >= warmup:
+                timings.append(elapsed)
+                queries.append(response.metrics.queries)
+        seconds = time.perf_counter() - start
+
+        if not timings:
+            raise CommandError(f'{name}: no timed requests.')
+        timings.sort()
+        result = {
+            'requests': len(timings),
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'p99_ms': round(percentile(timings, 99), 2),
+            'queries': max(queries),
+            'throughput': round(len(timings) / seconds, 1),
+        }
+        self.stdout.write(
+            f"{name:<16} p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+            f"p99 {result['p99_ms']:>8.2f} ms  {result['queries']:>3} queries  "
+            f"{result['throughput']:>8.1f} req/s"
+        )
+        return result
+
+    def compare(self, report, path, tolerance):
+        """Raise `CommandError` when a scenario regressed from the baseline."""
+        with open(path) as f:
+            baseline = json.load(f)
+        if baseline.get('scale') != report['scale']:
+            self.stderr.write('The baseline was recorded at a different scale.')
+
+        regressions = []
+        for name, result in report['scenarios'].items():
+            previous = baseline.get('scenarios', {}).get(name)
+            if previous is None:
+                continue
+            if result['queries'] > previous['queries']:
+                regressions.append(f"{name}: {result['queries']} queries, was {previous['queries']}")
+            if result['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{name}: p95 {result['p95_ms']} ms, was {previous['p95_ms']} ms")
+
+        if regressions:
+            raise CommandError('Regressions over the baseline:\n' + '\n'.join(regressions))
+        self.stdout.write('No regressions over the baseline.')
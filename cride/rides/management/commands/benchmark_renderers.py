@@ -0,0 +1,117 @@
+"""Benchmark JSON renderers command."""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+# DRF
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+# Renderers
+from cride.utils.parsers import ORJSONParser
+from cride.utils.renderers import ORJSONRenderer
+
+# Serializers
+from cride.rides.serializers import RideModelSerializer
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle
+from cride.rides.models import Ride
+
+# Utilities
+import io
+import time
+import statistics
+from datetime import timedelta
+
+
+class Command(BaseCommand):
+    """Compare DRF's JSON renderer and parser with the orjson ones.
+
+    Ride payloads with their driver and passengers are rendered and
+    parsed back, rides are inserted inside a transaction that is rolled
+    back at the end, so the database is left untouched.
+    """
+
+    help = 'Compare JSONRenderer/JSONParser and ORJSONRenderer/ORJSONParser over ride payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rides', type=int, default=1000)
+        parser.add_argument('--passengers', type=int, default=3, help='Passengers of each ride.')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            data = self.payload(options['rides'], options['passengers'])
+            transaction.set_rollback(True)
+
+        content = JSONRenderer().render(data)
+        self.stdout.write(f"{options['rides']} rides, {len(content) / 1024:.0f} KiB of JSON.")
+
+        before = self.measure(lambda: JSONRenderer().render(data), options['repeat'])
+        after = self.measure(lambda: ORJSONRenderer().render(data), options['repeat'])
+        self.stdout.write(
+            f'Render: JSONRenderer {before:.2f} ms, ORJSONRenderer {after:.2f} ms ({before / after:.1f}x)'
+        )
+
+        before = self.measure(lambda: JSONParser().parse(io.BytesIO(content)), options['repeat'])
+        after = self.measure(lambda: ORJSONParser().parse(io.BytesIO(content)), options['repeat'])
+        self.stdout.write(
+            f'Parse: JSONParser {before:.2f} ms, ORJSONParser {after:.2f} ms ({before / after:.1f}x)'
+        )
+
+    def payload(self, rides, passengers):
+        """Create the rides and return them serialized."""
+        circle = Circle.objects.create(name='Benchmark', slug_name='benchmark-renderers', about='Benchmark')
+        User.objects.bulk_create([
+            User(
+                email=f'renderers{i}@benchmark.cride',
+                username=f'benchmark-renderers-{i}',
+                first_name='Benchmark',
+                last_name=f'Passenger {i}',
+                phone_number='+525512345678',
+            )
+            for i in range(passengers + 1)
+        ])
+        users = list(User.objects.filter(email__endswith='@benchmark.cride').order_by('pk'))
+        Profile.objects.bulk_create([
+            Profile(user=user, biography='Benchmark user', reputation=4.5)
+            for user in users
+        ])
+
+        now = timezone.now()
+        Ride.objects.bulk_create([
+            Ride(
+                offered_by=users[0],
+                offered_in=circle,
+                available_seats=3,
+                comments='Benchmark ride',
+                departure_location='Ciudad Universitaria',
+                departure_date=now + timedelta(minutes=i),
+                arrival_location='Coyoacan',
+                arrival_date=now + timedelta(minutes=i, hours=1),
+                rating=4.25,
+            )
+            for i in range(rides)
+        ])
+        queryset = Ride.objects.filter(offered_in=circle)
+        Ride.passengers.through.objects.bulk_create([
+            Ride.passengers.through(ride_id=pk, user=user)
+            for pk in queryset.values_list('pk', flat=True)
+            for user in users[1:]
+        ])
+
+        queryset = RideModelSerializer.setup_eager_loading(queryset)
+        return RideModelSerializer(queryset, many=True).data
+
+    def measure(self, function, repeat):
+        """Return the median time in ms of a function call."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,113 @@
+"""Benchmark rides search command."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+# DRF
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+# Filters
+from cride.utils.filters import TrigramSearchFilter, has_trigram
+
+# Views
+from cride.rides.views.rides import RideViewSet
+
+# Models
+from cride.rides.models import Ride
+
+# Utilities
+import time
+import statistics
+
+
+class Command(BaseCommand):
+    """Compare the rides search filters on a generated ride table.
+
+    Rides are inserted inside a transaction that is rolled back at the
+    end, so the database is left untouched. The previous filter is run
+    with index scans disabled, as it was before the trigram indexes.
+    """
+
+    help = 'Compare SearchFilter and TrigramSearchFilter over generated rides (PostgreSQL only).'
+
+    # Location words the generated rides are made of
+    places = (
+        'Ciudad Universitaria', 'Coyoacan Centro', 'Polanco', 'Santa Fe',
+        'Tlalpan', 'Roma Norte', 'Condesa', 'Insurgentes Sur', 'Xochimilco',
+        'Del Valle', 'Narvarte', 'Azcapotzalco', 'Iztapalapa', 'Satelite',
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--term',
+            action='append',
+            dest='terms',
+            help='Search term, can be repeated.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('The search benchmark needs PostgreSQL.')
+        if not has_trigram(connection):
+            self.stderr.write('pg_trgm is not installed, the trigram filter will scan the table.')
+
+        terms = options['terms'] or ['universitaria', 'polanc', 'coyoakan', 'xochimilco sur']
+
+        with transaction.atomic():
+            self.seed(options['rows'])
+            for term in terms:
+                before = self.measure(SearchFilter, term, options['repeat'], scan=True)
+                after = self.measure(TrigramSearchFilter, term, options['repeat'])
+                self.stdout.write(
+                    f'{term!r}: SearchFilter {before[0]:.1f} ms ({before[1]} rows), '
+                    f'TrigramSearchFilter {after[0]:.1f} ms ({after[1]} rows)'
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, rows):
+        """Insert the rides with a single statement."""
+        start = time.monotonic()
+        places = "(ARRAY[{}])".format(', '.join(f"'{place}'" for place in self.places))
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                INSERT INTO rides_ride (
+                    created, modified, available_seats, comments,
+                    departure_location, departure_date, arrival_location, arrival_date,
+                    ratings_sum, ratings_count, is_active
+                )
+                SELECT
+                    now(), now(), 3, '',
+                    {places}[1 + i %% {len(self.places)}] || ' ' || i %% 1000,
+                    now() + i * interval '1 minute',
+                    {places}[1 + (i / 7) %% {len(self.places)}] || ' ' || i %% 997,
+                    now() + i * interval '1 minute' + interval '1 hour',
+                    0, 0, true
+                FROM generate_series(1, %s) AS i
+            """, [rows])
+            cursor.execute('ANALYZE rides_ride')
+        self.stdout.write(f'Inserted {rows} rides in {time.monotonic() - start:.1f}s.')
+
+    def measure(self, filter_class, term, repeat, scan=False):
+        """Return the median time in ms to count the term's matches."""
+        request = Request(APIRequestFactory().get('/', {'search': term}))
+        queryset = filter_class().filter_queryset(request, Ride.objects.all(), RideViewSet)
+
+        settings = ('enable_bitmapscan', 'enable_indexscan') if scan else ()
+        with connection.cursor() as cursor:
+            for setting in settings:
+                cursor.execute(f'SET LOCAL {setting} = off')
+
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                count = queryset.count()
+                timings.append((time.perf_counter() - start) * 1000)
+
+            for setting in settings:
+                cursor.execute(f'RESET {setting}')
+        return statistics.median(timings), count
@@ -0,0 +1,2 @@
+from .rides import *
+from .ratings import *
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""Ride index."""
+
+# Utilities
+import re
+import heapq
+import itertools
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right
+
+
+def tokenize(text):
+    """Return the lowercase words of a location without accents."""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode()
+    return frozenset(re.findall(r'\w+', text.lower()))
+
+
+class RideIndex:
+    """In-memory index of a circle's active rides.
+
+    Rides are kept sorted by departure time, so the rides departing in a
+    time window are found by bisection, and in inverted indexes of their
+    departure and arrival location words. Searches walk whichever of the
+    window or the location candidates is smaller.
+    """
+
+    __slots__ = ('departures', 'rides', 'departure_words', 'arrival_words', 'version', 'synced_at', 'lock')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Remove every ride from the index."""
+        # Sorted (departure timestamp, pk) pairs
+        self.departures = []
+        # pk -> (departure timestamp, departure words, arrival words)
+        self.rides = {}
+        self.departure_words = {}
+        self.arrival_words = {}
+        self.version = None
+        self.synced_at = None
+
+    def __len__(self):
+        return len(self.rides)
+
+    def add(self, pk, departure_date, departure_location, arrival_location):
+        """Index a ride, replacing its previous entry."""
+        self.discard(pk)
+        departure = departure_date.timestamp()
+        departure_words = tokenize(departure_location)
+        arrival_words = tokenize(arrival_location)
+
+        self.rides[pk] = (departure, departure_words, arrival_words)
+        entry = (departure, pk)
+        self.departures.insert(bisect_left(self.departures, entry), entry)
+        for word in departure_words:
+            self.departure_words.setdefault(word, set()).add(pk)
+        for word in arrival_words:
+            self.arrival_words.setdefault(word, set()).add(pk)
+
+    def discard(self, pk):
+        """Remove a ride from the index if present."""
+        ride = self.rides.pop(pk, None)
+        if ride is None:
+            return
+        departure, departure_words, arrival_words = ride
+
+        i = bisect_left(self.departures, (departure, pk))
+        del self.departures[i]
+        self._discard_words(self.departure_words, departure_words, pk)
+        self._discard_words(self.arrival_words, arrival_words, pk)
+
+    def prune(self, before):
+        """Remove the rides departing before the given date."""
+        i = bisect_left(self.departures, (before.timestamp(),))
+        for departure, pk in self.departures[:i]:
+            _, departure_words, arrival_words = self.rides.pop(pk)
+            self._discard_words(self.departure_words, departure_words, pk)
+            self._discard_words(self.arrival_words, arrival_words, pk)
+        del self.departures[:i]
+
+    def search(self, departure_after, departure_before,
+               departure_location='', arrival_location='', limit=10):
+        """Return the pks of the best rides departing within the window.
+
+        Rides must share a word with each given location, they are ranked
+        by the share of the locations' words they match and then by how
+        close they depart to the start of the window. Rides matching every
+        word are looked up first, others are only ranked when there are
+        not enough of them."""
+        start = departure_after.timestamp()
+        end = departure_before.timestamp()
+        lo = bisect_left(self.departures, (start,))
+        hi = bisect_right(self.departures, (end, float('inf')))
+
+        departure_query = tokenize(departure_location)
+        arrival_query = tokenize(arrival_location)
+        if not departure_query and not arrival_query:
+            return [pk for _, pk in self.departures[lo:min(hi, lo + limit)]]
+
+        queries = ((departure_query, self.departure_words), (arrival_query, self.arrival_words))
+        exact = self._lookup(queries, set.intersection)
+        best = self._earliest(exact, lo, hi, limit)
+        if len(best) == limit:
+            return best
+
+        candidates = self._lookup(queries, set.union)
+
+        def rank(pk):
+            departure, departure_words, arrival_words = self.rides[pk]
+            score = 0
+            if departure_query:
+                score += len(departure_query & departure_words) / len(departure_query)
+            if arrival_query:
+                score += len(arrival_query & arrival_words) / len(arrival_query)
+            return (score, start - departure, -pk)
+
+        return heapq.nlargest(limit, self._within(candidates, lo, hi), key=rank)
+
+    def _lookup(self, queries, combine):
+        """Return the rides having every query's words combined by `combine`.
+
+        Rides are always required to share a word with every query."""
+        result = None
+        for query, index in queries:
+            if query:
+                matches = combine(*(index.get(word, set()) for word in query))
+                result = matches if result is None else result & matches
+        return result
+
+    def _within(self, pks, lo, hi):
+        """Return the given rides departing between positions `lo` and `hi`."""
+        if hi - lo <= len(pks):
+            return (pk for _, pk in self.departures[lo:hi] if pk in pks)
+        start, end = self.departures[lo][0], self.departures[hi - 1][0]
+        return (pk for pk in pks if start <= self.rides[pk][0] <= end)
+
+    def _earliest(self, pks, lo, hi, limit):
+        """Return the first `limit` given rides departing in the window."""
+        # Walking the window stops early when the rides are dense in it
+        if (hi - lo) * limit <= len(pks) ** 2:
+            walk = (self.departures[i][1] for i in range(lo, hi))
+            return list(itertools.islice((pk for pk in walk if pk in pks), limit))
+        return [pk for _, pk in heapq.nsmallest(limit, ((self.rides[pk][0], pk) for pk in self._within(pks, lo, hi)))]
+
+    @staticmethod
+    def _discard_words(index, words, pk):
+        for word in words:
+            pks = index.get(word)
+            if pks is not None:
+                pks.discard(pk)
+                if not pks:
+                    del index[word]
@@ -0,0 +1,115 @@
+"""Rating managers."""
+
+# Django
+from django.apps import apps
+from django.db import models
+from django.utils import timezone
+from django.db.models import F, FloatField, OuterRef, Subquery, Count, Sum
+from django.db.models.functions import Cast, Coalesce, Round
+
+
+def running_average(sum_field, count_field, rating=0, ratings=0):
+    """Return an expression averaging stored sum and count.
+
+    `rating` and `ratings` are added to the stored values first, which
+    lets a single UPDATE take a new rating into account. The average is
+    rounded to one decimal."""
+    total = Cast(F(sum_field) + rating, FloatField())
+    count = Cast(F(count_field) + ratings, FloatField())
+    return Round(total * 10 / count) / 10
+
+
+class RatingManager(models.Manager):
+    """Rating manager.
+
+    Maintains the ratings sum and count stored in rides and in the rated
+    users' profiles, from which the ride rating and user reputation are
+    averaged without scanning their ratings."""
+
+    def add(self, ride, rating_user, rating, **kwargs):
+        """Create a rating and update the ride and driver aggregates."""
+        Ride = apps.get_model('rides', 'Ride')
+        Profile = apps.get_model('users', 'Profile')
+
+        instance = self.create(
+            ride=ride,
+            rating_user=rating_user,
+            rated_user=ride.offered_by,
+            rating=rating,
+            **kwargs
+        )
+        Ride.objects.filter(pk=ride.pk).update(
+            ratings_sum=F('ratings_sum') + rating,
+            ratings_count=F('ratings_count') + 1,
+            rating=running_average('ratings_sum', 'ratings_count', rating, 1),
+            modified=timezone.now(),
+        )
+        Profile.objects.filter(user=ride.offered_by_id).update(
+            ratings_sum=F('ratings_sum') + rating,
+            ratings_count=F('ratings_count') + 1,
+            reputation=running_average('ratings_sum', 'ratings_count', rating, 1),
+            modified=timezone.now(),
+        )
+        return instance
+
+    def get_aggregates(self, group_by, outer='pk'):
+        """Return subqueries of the ratings sum and count per `group_by`.
+
+        `outer` names the field of the outer query `group_by` refers to."""
+        ratings = self.filter(**{group_by: OuterRef(outer)}).order_by().values(group_by)
+        ratings_sum = Subquery(ratings.annotate(value=Sum('rating')).values('value'))
+        ratings_count = Subquery(ratings.annotate(value=Count('rating')).values('value'))
+        return Coalesce(ratings_sum, 0), Coalesce(ratings_count, 0)
+
+    def get_mismatches(self):
+        """Return the rides and profiles whose stored aggregates are wrong."""
+        Ride = apps.get_model('rides', 'Ride')
+        Profile = apps.get_model('users', 'Profile')
+
+        rides_sum, rides_count = self.get_aggregates('ride')
+        rides = Ride.objects.annotate(
+            actual_sum=rides_sum,
+            actual_count=rides_count,
+        ).exclude(ratings_sum=F('actual_sum'), ratings_count=F('actual_count'))
+
+        profiles_sum, profiles_count = self.get_aggregates('rated_user', outer='user')
+        profiles = Profile.objects.annotate(
+            actual_sum=profiles_sum,
+            actual_count=profiles_count,
+        ).exclude(ratings_sum=F('actual_sum'), ratings_count=F('actual_count'))
+
+        return rides, profiles
+
+    def rebuild_aggregates(self, rides=None, profiles=None):
+        """Recompute the stored aggregates from the ratings.
+
+        Rebuild every ride and profile unless querysets are given, return
+        the number of updated rides and profiles."""
+        Ride = apps.get_model('rides', 'Ride')
+        Profile = apps.get_model('users', 'Profile')
+
+        if rides is None:
+            rides = Ride.objects.all()
+        else:
+            rides = Ride.objects.filter(pk__in=list(rides.values_list('pk', flat=True)))
+        rides_sum, rides_count = self.get_aggregates('ride')
+        updated_rides = rides.update(ratings_sum=rides_sum, ratings_count=rides_count, modified=timezone.now())
+        rides.filter(ratings_count__gt=0).update(
+            rating=running_average('ratings_sum', 'ratings_count'),
+        )
+
+        if profiles is None:
+            profiles = Profile.objects.all()
+        else:
+            profiles = Profile.objects.filter(pk__in=list(profiles.values_list('pk', flat=True)))
+        profiles_sum, profiles_count = self.get_aggregates('rated_user', outer='user')
+        updated_profiles = profiles.update(
+            ratings_sum=profiles_sum,
+            ratings_count=profiles_count,
+            modified=timezone.now(),
+        )
+        profiles.filter(ratings_count__gt=0).update(
+            reputation=running_average('ratings_sum', 'ratings_count'),
+        )
+
+        return updated_rides, updated_profiles
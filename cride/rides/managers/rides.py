@@ -0,0 +1,189 @@
+"""Ride managers."""
+
+# Django
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+from django.utils import timezone
+
+# Utilities
+import math
+import threading
+from uuid import uuid4
+from datetime import timedelta
+from collections import OrderedDict
+
+# Index
+from cride.rides.managers.index import RideIndex
+
+# Geo
+from cride.utils.geo import EARTH_RADIUS_KM, bounding_box, geohash_cover, geohash_range
+
+
+class RideManager(models.Manager):
+    """Ride manager.
+
+    Used to handle seat reservations without read-modify-write races and
+    to match passengers with rides through an in-process index of every
+    circle's active rides.
+
+    Indexes follow a version stored in the cache that is replaced when
+    one of the circle's rides is saved, outdated indexes catch up by
+    loading the rides modified since their last sync."""
+
+    INDEX_SIZE = 64
+    # Rides saved in transactions longer than this might be missed
+    INDEX_SYNC_OVERLAP = timedelta(seconds=60)
+
+    _indexes = OrderedDict()
+    _indexes_lock = threading.Lock()
+
+    def reserve_seat(self, ride):
+        """Take one of the ride's available seats.
+
+        The seat is taken with a single conditional UPDATE, so concurrent
+        joins can't overbook the ride. Return whether a seat was taken."""
+        reserved = self.filter(
+            pk=ride.pk,
+            available_seats__gt=0,
+        ).update(available_seats=F('available_seats') - 1, modified=timezone.now())
+        if reserved:
+            # Full rides leave the index on its next sync
+            self.invalidate_index(ride.offered_in_id)
+        return reserved == 1
+
+    @staticmethod
+    def index_version_key(circle_id):
+        """Return the cache key of the circle's rides index version."""
+        return f'rides:index:{circle_id}:version'
+
+    def match(self, circle, departure_after, departure_before,
+              departure_location='', arrival_location='', limit=10, queryset=None):
+        """Return the rides that best match a passenger's trip.
+
+        Candidates come from the circle's index and are checked against
+        the database, through `queryset` when given, so rides that ran
+        out of seats are left out. More candidates are fetched until
+        `limit` rides pass the checks or the index has no more."""
+        now = timezone.now()
+        departure_after = max(departure_after, now)
+        index = self.get_index(circle.pk)
+
+        if queryset is None:
+            queryset = self.all()
+        queryset = queryset.filter(is_active=True, available_seats__gte=1, departure_date__gte=now)
+
+        candidates = limit * 2
+        while True:
+            with index.lock:
+                pks = index.search(
+                    departure_after,
+                    departure_before,
+                    departure_location=departure_location,
+                    arrival_location=arrival_location,
+                    limit=candidates,
+                )
+            rides = queryset.filter(pk__in=pks).in_bulk()
+            matches = [rides[pk] for pk in pks if pk in rides]
+            if len(matches) >= limit or len(pks) < candidates:
+                return matches[:limit]
+            candidates *= 4
+
+    def nearby(self, latitude, longitude, radius, queryset=None):
+        """Return the rides departing within `radius` km of a point.
+
+        Rides are annotated with their `distance` in km and sorted by it.
+        Candidates are narrowed to the geohash cells and the bounding box
+        around the point before computing distances."""
+        if queryset is None:
+            queryset = self.all()
+
+        box = bounding_box(latitude, longitude, radius)
+        cells = Q()
+        for cell in geohash_cover(box):
+            lower, upper = geohash_range(cell)
+            if upper is None:
+                cells |= Q(departure_geohash__gte=lower)
+            else:
+                cells |= Q(departure_geohash__gte=lower, departure_geohash__lt=upper)
+        min_lat, max_lat, min_lon, max_lon = box
+
+        # Haversine formula
+        lat, lon = math.radians(latitude), math.radians(longitude)
+        a = (
+            Power(Sin((Radians('departure_latitude') - lat) / 2), 2)
+            + Value(math.cos(lat)) * Cos(Radians('departure_latitude'))
+            * Power(Sin((Radians('departure_longitude') - lon) / 2), 2)
+        )
+        distance = 2 * EARTH_RADIUS_KM * ASin(Least(Value(1.0), Sqrt(a)), output_field=FloatField())
+
+        return queryset.filter(
+            cells,
+            is_active=True,
+            departure_latitude__range=(min_lat, max_lat),
+            departure_longitude__range=(min_lon, max_lon),
+        ).annotate(
+            distance=distance,
+        ).filter(
+            distance__lte=radius,
+        ).order_by('distance', 'pk')
+
+    def get_index(self, circle_id):
+        """Return the circle's rides index, synced with its version.
+
+        Indexes are rebuilt when the version went missing from the cache,
+        since the changes made meanwhile are unknown."""
+        key = self.index_version_key(circle_id)
+        version = cache.get(key)
+        if version is None:
+            version = uuid4().hex
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+            rebuild = True
+        else:
+            rebuild = False
+
+        with self._indexes_lock:
+            index = self._indexes.get(circle_id)
+            if index is None:
+                index = self._indexes[circle_id] = RideIndex()
+                while len(self._indexes) > self.INDEX_SIZE:
+                    self._indexes.popitem(last=False)
+            self._indexes.move_to_end(circle_id)
+
+        with index.lock:
+            if rebuild:
+                index.clear()
+            if index.version != version:
+                self._sync_index(index, circle_id)
+                index.version = version
+        return index
+
+    def invalidate_index(self, circle_id):
+        """Replace the circle's index version now and once the transaction commits."""
+        key = self.index_version_key(circle_id)
+        cache.set(key, uuid4().hex, None)
+        transaction.on_commit(lambda: cache.set(key, uuid4().hex, None))
+
+    def _sync_index(self, index, circle_id):
+        """Load the rides changed since the index was last synced."""
+        now = timezone.now()
+        rides = self.filter(offered_in=circle_id)
+        if index.synced_at is None:
+            rides = rides.filter(is_active=True, available_seats__gte=1, departure_date__gte=now)
+        else:
+            rides = rides.filter(modified__gte=index.synced_at - self.INDEX_SYNC_OVERLAP)
+
+        rides = rides.values_list(
+            'pk', 'is_active', 'available_seats',
+            'departure_date', 'departure_location', 'arrival_location',
+        )
+        for pk, is_active, available_seats, departure_date, departure_location, arrival_location in rides.iterator():
+            if is_active and available_seats > 0:
+                index.add(pk, departure_date, departure_location, arrival_location)
+            else:
+                index.discard(pk)
+
+        index.prune(now)
+        index.synced_at = now
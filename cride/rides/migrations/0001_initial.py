@@ -0,0 +1,61 @@
+# Generated by Django 3.1.1 on 2026-10-18 17:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('circles', '0004_auto_20210602_0539'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ride',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Datetime on which the object was created', verbose_name='created_at')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Datetime on which the object was modified', verbose_name='modified_at')),
+                ('available_seats', models.PositiveSmallIntegerField(default=1)),
+                ('comments', models.TextField()),
+                ('departure_location', models.CharField(max_length=255)),
+                ('departure_date', models.DateTimeField()),
+                ('arrival_location', models.CharField(max_length=255)),
+                ('arrival_date', models.DateTimeField()),
+                ('rating', models.FloatField(null=True)),
+                ('is_active', models.BooleanField(default=True, help_text='Used for disabling the ride or marking it as finished', verbose_name='active status')),
+                ('offered_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('offered_in', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='circles.circle')),
+                ('passengers', models.ManyToManyField(related_name='passengers', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created', '-modified'],
+                'get_latest_by': 'created',
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Rating',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Datetime on which the object was created', verbose_name='created_at')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Datetime on which the object was modified', verbose_name='modified_at')),
+                ('comments', models.TextField(blank=True, max_length=500, null=True, verbose_name='ride comments')),
+                ('rating', models.PositiveSmallIntegerField(blank=True, default=1, null=True, verbose_name='ride rating')),
+                ('circle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='circles.circle')),
+                ('rated_user', models.ForeignKey(help_text='User that is being rated', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='rated_user', to=settings.AUTH_USER_MODEL)),
+                ('rating_user', models.ForeignKey(help_text='User that sends the rating', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='rating_user', to=settings.AUTH_USER_MODEL)),
+                ('ride', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rated_ride', to='rides.ride')),
+            ],
+            options={
+                'ordering': ['-created', '-modified'],
+                'get_latest_by': 'created',
+                'abstract': False,
+            },
+        ),
+    ]
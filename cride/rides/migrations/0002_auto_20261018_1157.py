@@ -0,0 +1,25 @@
+# Generated by Django 3.1.1 on 2026-10-18 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['ride', 'rating_user'], name='rating_ride_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['rated_user', 'rating'], name='rating_rated_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(condition=models.Q(('available_seats__gte', 1), ('is_active', True)), fields=['offered_in', 'departure_date'], name='ride_feed_idx'),
+        ),
+    ]
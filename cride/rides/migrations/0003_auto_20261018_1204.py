@@ -0,0 +1,23 @@
+# Generated by Django 3.1.1 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0002_auto_20261018_1157'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ride',
+            name='ratings_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of ratings received, used to average the rating.'),
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='ratings_sum',
+            field=models.PositiveIntegerField(default=0, help_text='Sum of the ratings received, used to average the rating.'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.1.1 on 2026-10-18 18:10
+
+from django.db import migrations
+
+INDEXES = (
+    ('ride_departure_trgm_idx', 'departure_location'),
+    ('ride_arrival_trgm_idx', 'arrival_location'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Index ride locations for `TrigramSearchFilter`.
+
+    Only on PostgreSQL servers shipping pg_trgm, searches fall back to
+    `icontains` elsewhere."""
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON rides_ride '
+            f'USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0003_auto_20261018_1204'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
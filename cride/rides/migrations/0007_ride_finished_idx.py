@@ -0,0 +1,17 @@
+# Generated by Django 3.1.1 on 2026-10-18 18:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0006_ride_geohash_idx_ranges'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(condition=models.Q(is_active=True), fields=['arrival_date'], name='ride_finished_idx'),
+        ),
+    ]
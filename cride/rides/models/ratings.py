@@ -6,6 +6,9 @@ from django.db import models
 # Models
 from cride.utils.models import CRideModel
 
+# Managers
+from cride.rides.managers import RatingManager
+
 
 class Rating(CRideModel):
     """Rating model."""
@@ -48,4 +51,17 @@ class Rating(CRideModel):
         default=1,
         blank=True,
         null=True,
-    )
\ No newline at end of file
+    )
+
+    # Manager
+    objects = RatingManager()
+
+    class Meta(CRideModel.Meta):
+        """Meta class."""
+
+        indexes = [
+            # Ratings already emitted for a ride
+            models.Index(fields=['ride', 'rating_user'], name='rating_ride_user_idx'),
+            # Reputation of the rated user, covers the rating column
+            models.Index(fields=['rated_user', 'rating'], name='rating_rated_user_idx'),
+        ]
\ No newline at end of file
@@ -1,10 +1,18 @@
 """Rides model."""
 
 # Django
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
 # Utilities
 from cride.utils.models import CRideModel
+from cride.utils.geo import encode_geohash
+
+# Managers
+from cride.rides.managers import RideManager
+
+# Models
+from cride.circles.models import Circle
 
 
 class Ride(CRideModel):
@@ -23,7 +31,42 @@ class Ride(CRideModel):
     arrival_location = models.CharField(max_length=255)
     arrival_date = models.DateTimeField()
 
+    # coordinates
+    departure_latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    departure_longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    departure_geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        help_text='Geohash of the departure coordinates, set on save and used to find nearby rides.'
+    )
+    arrival_latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    arrival_longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+
     rating = models.FloatField(null=True)
+    ratings_sum = models.PositiveIntegerField(
+        default=0,
+        help_text='Sum of the ratings received, used to average the rating.'
+    )
+    ratings_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Number of ratings received, used to average the rating.'
+    )
 
     is_active = models.BooleanField(
         'active status',
@@ -31,6 +74,47 @@ class Ride(CRideModel):
         help_text='Used for disabling the ride or marking it as finished'
     )
 
+    # Manager
+    objects = RideManager()
+
+    class Meta(CRideModel.Meta):
+        """Meta class."""
+
+        indexes = [
+            # Circle's ride feed, see `RideViewSet.get_queryset`
+            models.Index(
+                fields=['offered_in', 'departure_date'],
+                name='ride_feed_idx',
+                condition=models.Q(is_active=True, available_seats__gte=1),
+            ),
+            # Finished rides sweep, see `disable_finished_rides`
+            models.Index(
+                fields=['arrival_date'],
+                name='ride_finished_idx',
+                condition=models.Q(is_active=True),
+            ),
+            # Nearby active rides, see `RideManager.nearby`
+            models.Index(
+                fields=['departure_geohash'],
+                name='ride_geohash_idx',
+                condition=models.Q(is_active=True),
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Update the departure geohash and refresh the circle's rides index and feed."""
+        if self.departure_latitude is not None and self.departure_longitude is not None:
+            self.departure_geohash = encode_geohash(self.departure_latitude, self.departure_longitude)
+        else:
+            self.departure_geohash = ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'departure_latitude', 'departure_longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'departure_geohash'}
+        super(Ride, self).save(*args, **kwargs)
+        if self.offered_in_id is not None:
+            Ride.objects.invalidate_index(self.offered_in_id)
+            Circle.objects.invalidate_feed(self.offered_in_id)
+
     def __str__(self):
         """Return ride details."""
         return "{_from} to {to} | {day} {i_time} - {f_time}".format(
@@ -1 +1,2 @@
-from .rides import *
\ No newline at end of file
+from .rides import *
+from .ratings import *
\ No newline at end of file
@@ -1,7 +1,7 @@
 """Ratings serializers"""
 
 # Django
-from django.db.models import Avg
+from django.db import transaction
 
 # DRF
 from rest_framework import serializers
@@ -41,34 +41,16 @@ class CreateRideRatingSerializer(serializers.ModelSerializer):
         return data
 
     def create(self, data):
-        """Create rating."""
-
-        offered_by = self.context['ride'].offered_by
-
-        Rating.objects.create(
-            circle=self.context['circle'],
-            ride=self.context['ride'],
-            rating_user=self.context['request'].user,
-            rated_user=offered_by,
-            **data
-        )
+        """Create rating and update the ride and driver aggregates."""
+        ride = self.context['ride']
 
-        ride_avg = round(
-            Rating.objects.filter(
+        with transaction.atomic():
+            Rating.objects.add(
+                ride=ride,
+                rating_user=self.context['request'].user,
                 circle=self.context['circle'],
-                ride=self.context['ride']
-            ).aggregate(Avg('rating'))['rating__avg'],
-            1
-        )
-        self.context['ride'].rating = ride_avg
-
-        user_avg = round(
-            Rating.objects.filter(
-                rated_user=offered_by
-            ).aggregate(Avg('rating'))['rating__avg'],
-            1
-        )
-        offered_by.profile.reputation = user_avg
-        offered_by.profile.save()
+                **data
+            )
 
-        return self.context['ride']
+        ride.refresh_from_db(fields=['rating', 'ratings_sum', 'ratings_count'])
+        return ride
@@ -3,22 +3,28 @@
 # DRF
 from rest_framework import serializers
 from rest_framework.authentication import get_user_model
-User = get_user_model()
 
 # Django
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 
 # Models
-from cride.circles.models import Membership
+from cride.circles.models import Circle, Membership
 from cride.rides.models import Ride
+from cride.users.models import Profile
 
 # Serializers
 from cride.users.serializers import UserModelSerializer
+from cride.utils.serializers import EagerLoadingMixin
 
 # Utilities
 from datetime import timedelta
 
 
+User = get_user_model()
+
+
 class CreateRideSerializer(serializers.ModelSerializer):
     """Create ride serializer."""
 
@@ -29,7 +35,10 @@ class CreateRideSerializer(serializers.ModelSerializer):
         """Meta class."""
 
         model = Ride
-        exclude = ['offered_in', 'passengers', 'rating', 'is_active']
+        exclude = [
+            'offered_in', 'passengers', 'rating', 'ratings_sum',
+            'ratings_count', 'is_active', 'departure_geohash',
+        ]
 
     def validate_departure_date(self, data):
         """Validate the departure date is after the date this method is
@@ -58,10 +67,10 @@ class CreateRideSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Rides offered on behalf on another person are not allowed.")
 
         try:
-            membership = Membership.objects.get(
-                user=user, 
-                circle=circle,
-                is_active=True
+            membership = Membership.objects.get_active(
+                user,
+                circle,
+                request=self.context['request'],
             )
         except Membership.DoesNotExist:
             raise serializers.ValidationError("User is not an active member.")
@@ -71,6 +80,10 @@ class CreateRideSerializer(serializers.ModelSerializer):
         if data['arrival_date'] <= data['departure_date']:
             raise serializers.ValidationError("Departure should happen before arrival.")
 
+        for point in ('departure', 'arrival'):
+            if (data.get(f'{point}_latitude') is None) != (data.get(f'{point}_longitude') is None):
+                raise serializers.ValidationError(f"Both {point} latitude and longitude are required.")
+
         return data
 
     def create(self, data):
@@ -82,23 +95,19 @@ class CreateRideSerializer(serializers.ModelSerializer):
 
         ride = Ride.objects.create(**data, offered_in=circle)
 
-        # Circle
-        circle.rides_offered += 1
-        circle.save()
-
-        # Membership
-        membership = self.context['membership']
-        membership.rides_offered += 1
-        membership.save()
-
-        # Profile
-        profile = data['offered_by'].profile
-        profile.rides_offered += 1
-        profile.save()
+        # Stats are updated with F() expressions since the circle and
+        # membership in the context might come from the cache.
+        Circle.objects.filter(pk=circle.pk).update(rides_offered=F('rides_offered') + 1, modified=timezone.now())
+        Membership.objects.filter(
+            pk=self.context['membership'].pk
+        ).update(rides_offered=F('rides_offered') + 1, modified=timezone.now())
+        Profile.objects.filter(
+            user=data['offered_by']
+        ).update(rides_offered=F('rides_offered') + 1, modified=timezone.now())
 
         return ride
 
-class RideModelSerializer(serializers.ModelSerializer):
+class RideModelSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Ride model serializer."""
 
     offered_by = UserModelSerializer(read_only=True)
@@ -106,6 +115,9 @@ class RideModelSerializer(serializers.ModelSerializer):
 
     passengers = UserModelSerializer(read_only=True, many=True)
 
+    select_related_fields = ('offered_by__profile', 'offered_in')
+    prefetch_related_fields = ('passengers__profile',)
+
     class Meta:
         """Meta class."""
 
@@ -114,7 +126,10 @@ class RideModelSerializer(serializers.ModelSerializer):
         read_only_fields = (
             'offered_by',
             'offered_in',
-            'rating'
+            'rating',
+            'ratings_sum',
+            'ratings_count',
+            'departure_geohash',
         )
 
     def update(self, instance, data):
@@ -149,10 +164,10 @@ class JoinRideSerializer(serializers.ModelSerializer):
         circle = self.context['circle']
 
         try:
-            membership = Membership.objects.get(
-                user=user,
-                circle=circle,
-                is_active=True
+            membership = Membership.objects.get_active(
+                user,
+                circle,
+                request=self.context.get('request'),
             )
         except Membership.DoesNotExist:
             raise serializers.ValidationError("User is not an active member.")
@@ -181,30 +196,34 @@ class JoinRideSerializer(serializers.ModelSerializer):
         return data
 
     def update(self, instance, data):
-        """Add passenger to ride and update status."""
+        """Add passenger to ride and update stats.
+
+        The seat is reserved with a conditional UPDATE and the stats are
+        incremented with F() expressions inside one short transaction, so
+        concurrent joins neither overbook the ride nor lose updates.
+        """
         ride = self.context['ride']
         user = self.context['user']
+        membership = self.context['membership']
+        circle = self.context['circle']
 
-        # TODO: maybe should use F() to update models' fields
-
-        # update ride status
-        ride.passengers.add(user)
-        ride.available_seats -= 1
-
-        # update profile status
-        profile = user.profile
-        profile.rides_taken += 1
-        profile.save()
+        with transaction.atomic():
+            if not Ride.objects.reserve_seat(ride):
+                raise serializers.ValidationError(
+                    "There's not enough room for another passenger in this ride."
+                )
 
-        # update membership status
-        membership = self.context['membership']
-        membership.rides_taken += 1
+            # update ride status
+            ride.passengers.add(user)
 
-        # update circle status
-        circle = self.context['circle']
-        circle.rides_taken += 1
-        circle.save()
+            # update profile, membership and circle stats
+            now = timezone.now()
+            Profile.objects.filter(user=user).update(rides_taken=F('rides_taken') + 1, modified=now)
+            Membership.objects.filter(pk=membership.pk).update(rides_taken=F('rides_taken') + 1, modified=now)
+            Circle.objects.filter(pk=circle.pk).update(rides_taken=F('rides_taken') + 1, modified=now)
+            Circle.objects.invalidate_feed(circle.pk)
 
+        ride.refresh_from_db(fields=['available_seats'])
         return ride
 
 
@@ -224,4 +243,35 @@ class EndRideSerializer(serializers.ModelSerializer):
         ride = self.context['view'].get_object()
         if data <= ride.departure_date:
             raise serializers.ValidationError("Ride has not started yet.")
-        return data
\ No newline at end of file
+        return data
+
+
+class MatchRideSerializer(serializers.Serializer):
+    """Validate a passenger's trip to match it with rides."""
+
+    departure_location = serializers.CharField(required=False, default='', max_length=255)
+    arrival_location = serializers.CharField(required=False, default='', max_length=255)
+    departure_after = serializers.DateTimeField()
+    departure_before = serializers.DateTimeField()
+    limit = serializers.IntegerField(required=False, default=10, min_value=1, max_value=50)
+
+    def validate(self, data):
+        """Verify the time window is not empty."""
+        if data['departure_before'] < data['departure_after']:
+            raise serializers.ValidationError('The time window must end after it starts.')
+        return data
+
+
+class NearbyRideSerializer(serializers.Serializer):
+    """Validate a point to look for rides departing near it."""
+
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(required=False, default=5, min_value=0.1, max_value=50)
+    limit = serializers.IntegerField(required=False, default=20, min_value=1, max_value=100)
+
+
+class NearbyRideModelSerializer(RideModelSerializer):
+    """Ride model serializer including the distance to the searched point."""
+
+    distance = serializers.FloatField(read_only=True)
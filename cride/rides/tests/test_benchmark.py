@@ -0,0 +1,69 @@
+"""API benchmark tests."""
+
+# Django
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+# Models
+from cride.rides.models import Ride
+
+# Utilities
+import io
+import os
+import json
+import tempfile
+
+
+class BenchmarkAPITestCase(TestCase):
+    """API benchmark command test case."""
+
+    scale = ['--circles', '2', '--users', '30', '--memberships', '1', '--rides', '200', '--ratings', '50']
+
+    def setUp(self):
+        """Test initialization."""
+        fd, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def benchmark(self, *args):
+        out = io.StringIO()
+        call_command(
+            'benchmark_api', *self.scale,
+            '--requests', '5', '--warmup', '1', '--depth', '2',
+            *args, stdout=out,
+        )
+        return out.getvalue()
+
+    def test_baseline(self):
+        """Every scenario is measured and the generated data is rolled back."""
+        self.benchmark('--save-baseline', self.path)
+
+        with open(self.path) as f:
+            baseline = json.load(f)
+        self.assertEqual(baseline['scale']['users'], 30)
+        self.assertEqual(set(baseline['scenarios']), {
+            'ride-list', 'ride-list-deep', 'ride-join', 'ride-finish',
+            'circle-list', 'invitations', 'login',
+        })
+        for result in baseline['scenarios'].values():
+            self.assertEqual(result['requests'], 5)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+            self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+            self.assertGreater(result['queries'], 0)
+            self.assertGreater(result['throughput'], 0)
+        self.assertFalse(Ride.objects.exists())
+
+    def test_regression(self):
+        """Running more queries than the baseline fails."""
+        self.benchmark('--scenario', 'circle-list', '--save-baseline', self.path)
+        with open(self.path) as f:
+            baseline = json.load(f)
+        output = self.benchmark('--scenario', 'circle-list', '--baseline', self.path, '--tolerance', '100')
+        self.assertIn('No regressions', output)
+
+        baseline['scenarios']['circle-list']['queries'] -= 1
+        with open(self.path, 'w') as f:
+            json.dump(baseline, f)
+        with self.assertRaisesMessage(CommandError, 'circle-list'):
+            self.benchmark('--scenario', 'circle-list', '--baseline', self.path, '--tolerance', '100')
@@ -0,0 +1,163 @@
+"""Compiled representation tests."""
+
+# Django
+from django.utils import timezone
+
+# DRF
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+# Serializers
+from cride.circles.serializers import CircleModelSerializer, MembershipModelSerializer
+from cride.rides.serializers import RideModelSerializer
+from cride.users.serializers import UserModelSerializer
+from cride.utils.serializers import CompiledRepresentation
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+
+# Utilities
+from datetime import timedelta
+from unittest import mock
+
+
+class CompiledRepresentationTestCase(APITestCase):
+    """Compiled representation test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='UNAM Facultad de Ciencias',
+            picture='circles/pictures/fciencias.png',
+            is_limited=True,
+            members_limit=50,
+        )
+        Circle.objects.create(name='Facultad de Música', slug_name='fam', about='UNAM FaM')
+        Circle.objects.create(name='Facultad de Derecho', slug_name='fder', about='UNAM FD', members_limit=0)
+
+        self.users = []
+        for i in range(4):
+            user = User.objects.create(
+                email=f'user{i}@test-mail.com',
+                username=f'user{i}',
+                first_name=f'Usuario {i}',
+                password='admin123',
+                phone_number='+525512345678' if i % 2 else '',
+            )
+            profile = Profile.objects.create(
+                user=user,
+                picture='users/pictures/user.png' if i % 2 else None,
+                reputation=4.5,
+            )
+            Membership.objects.create(
+                user=user,
+                profile=profile,
+                circle=self.circle,
+                is_admin=i == 0,
+                invited_by=self.users[0] if self.users else None,
+            )
+            self.users.append(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.users[0]).key}')
+
+        departure = timezone.now() + timedelta(hours=1)
+        for i in range(3):
+            ride = Ride.objects.create(
+                offered_by=self.users[0],
+                offered_in=self.circle,
+                comments='Sin retraso',
+                departure_location='Ciudad Universitaria',
+                departure_date=departure + timedelta(minutes=i),
+                departure_latitude=19.3326 if i else None,
+                departure_longitude=-99.187 if i else None,
+                arrival_location='Coyoacán',
+                arrival_date=departure + timedelta(hours=1),
+                rating=4.25 if i else None,
+            )
+            ride.passengers.set(self.users[1:i + 1])
+
+        self.request = Request(APIRequestFactory().get('/'))
+
+    def assertSameRepresentation(self, serializer_class, queryset, rows=False):
+        context = {'request': self.request}
+        expected = serializer_class(queryset, many=True, context=context).data
+        representation = CompiledRepresentation.for_serializer(serializer_class)
+        if rows:
+            queryset = queryset.values(*representation.values_fields)
+        data = representation.represent_many(queryset, context, rows=rows)
+        self.assertEqual(data, expected)
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(expected))
+
+    def test_serializers(self):
+        """Compiled serializers represent instances as the serializers do."""
+        self.assertSameRepresentation(RideModelSerializer, Ride.objects.order_by('pk'))
+        self.assertSameRepresentation(MembershipModelSerializer, Membership.objects.order_by('pk'))
+        self.assertSameRepresentation(UserModelSerializer, User.objects.order_by('pk'))
+        self.assertSameRepresentation(CircleModelSerializer, Circle.objects.order_by('pk'))
+
+    def test_rows(self):
+        """Serializers of plain model fields represent `.values()` rows."""
+        self.assertIsNotNone(CompiledRepresentation.for_serializer(CircleModelSerializer).values_fields)
+        self.assertSameRepresentation(CircleModelSerializer, Circle.objects.order_by('pk'), rows=True)
+
+        self.assertIsNone(CompiledRepresentation.for_serializer(RideModelSerializer).values_fields)
+        self.assertIsNone(CompiledRepresentation.for_serializer(MembershipModelSerializer).values_fields)
+
+    def test_not_compiled(self):
+        """Method fields and custom representations are not compiled."""
+        class MethodSerializer(serializers.ModelSerializer):
+            name = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Circle
+                fields = ('name',)
+
+            def get_name(self, circle):
+                return circle.name.upper()
+
+        class CustomSerializer(CircleModelSerializer):
+            def to_representation(self, instance):
+                return {'name': instance.name}
+
+        class NestedCustomSerializer(serializers.ModelSerializer):
+            offered_in = CustomSerializer()
+
+            class Meta:
+                model = Ride
+                fields = ('offered_in',)
+
+        for serializer_class in (MethodSerializer, CustomSerializer, NestedCustomSerializer):
+            self.assertIsNone(CompiledRepresentation.for_serializer(serializer_class))
+
+    def get_pages(self, url):
+        """Return the content of every page of a listing."""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.content)
+            url = response.data['next']
+        return pages
+
+    def test_lists(self):
+        """Listings are the same with and without the compiled representation."""
+        Circle.objects.update(is_public=True)
+        for url in (
+                '/circles/?limit=2',
+                '/circles/?limit=2&ordering=name',
+                '/circles/fciencias/rides/?limit=2'):
+            pages = self.get_pages(url)
+            self.assertGreater(len(pages), 1)
+            with mock.patch.object(CompiledRepresentation, 'for_serializer', return_value=None):
+                self.assertEqual(self.get_pages(url), pages)
+
+    def test_metrics(self):
+        """Compiled representations count as serializer time."""
+        response = self.client.get('/circles/fciencias/rides/')
+        self.assertGreater(response.metrics.serializer_time, 0)
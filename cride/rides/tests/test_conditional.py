@@ -0,0 +1,122 @@
+"""Ride conditional requests tests."""
+
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Models
+from cride.rides.models import Ride
+
+# Testing
+from cride.utils.testing import CircleMembersMixin
+
+# Utilities
+import json
+from datetime import timedelta
+
+
+class RideConditionalGetAPITestCase(CircleMembersMixin, APITestCase):
+    """Ride conditional requests test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        cache.clear()
+        self.circle = self.create_circle()
+        self.user = self.create_member('joedoe')
+        self.driver = self.create_member('driver')
+        self.authenticate(self.user)
+        self.url = f'/circles/{self.circle.slug_name}/rides/'
+        self.ride = self.create_ride()
+
+    def create_ride(self, **kwargs):
+        departure = timezone.now() + timedelta(hours=1)
+        data = {
+            'offered_by': self.driver,
+            'offered_in': self.circle,
+            'available_seats': 3,
+            'comments': '',
+            'departure_location': 'Ciudad Universitaria',
+            'departure_date': departure,
+            'arrival_location': 'Coyoacán',
+            'arrival_date': departure + timedelta(hours=1),
+        }
+        data.update(kwargs)
+        return Ride.objects.create(**data)
+
+    def assertNotModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        return response
+
+    def test_feed(self):
+        """Unchanged feeds aren't serialized again."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('private', response['Cache-Control'])
+        etag = response['ETag']
+        self.assertNotModified(self.url, etag)
+
+        # Joining changes the available seats and the passengers
+        response = self.client.post(f'{self.url}{self.ride.pk}/join/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = self.assertModified(self.url, etag)['ETag']
+        self.assertNotModified(self.url, etag)
+
+        # Passengers' profiles are nested too
+        self.user.profile.reputation = 4.5
+        self.user.profile.save()
+        self.assertModified(self.url, etag)
+
+    def test_pages(self):
+        """Every page has its own ETag."""
+        self.create_ride(departure_date=self.ride.departure_date + timedelta(minutes=5))
+        first = self.client.get(f'{self.url}?limit=1')
+        second = self.client.get(first.data['next'])
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        self.assertNotModified(f'{self.url}?limit=1', first['ETag'])
+
+        # Rides leave the feed without being modified
+        Ride.objects.filter(pk=self.ride.pk).update(departure_date=timezone.now())
+        response = self.assertModified(f'{self.url}?limit=1', first['ETag'])
+        self.assertEqual(response['ETag'], second['ETag'])
+
+    def test_retrieve(self):
+        """Unchanged rides aren't serialized again."""
+        url = f'{self.url}{self.ride.pk}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.metrics.serializer_time, 0)
+
+    @override_settings(RIDES_FEED_CACHE_TIMEOUT=30)
+    def test_feed_cache(self):
+        """Cached feed pages are validated before being read from the cache."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.metrics.list_cache, 'miss')
+        etag = response['ETag']
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.metrics.list_cache, 'hit')
+        self.assertEqual(response['ETag'], etag)
+        # Only the circle and the membership are read
+        self.assertEqual(response.metrics.queries, 2)
+        self.assertNotModified(self.url, etag)
+
+        self.client.force_authenticate(self.driver)
+        response = self.client.patch(f'{self.url}{self.ride.pk}/', {'comments': 'Sin retraso'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.assertModified(self.url, etag)
+        self.assertEqual(json.loads(response.content)['results'][0]['comments'], 'Sin retraso')
@@ -0,0 +1,142 @@
+"""Ride feed cache tests."""
+
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Models
+from cride.circles.models import Circle
+from cride.rides.models import Ride
+
+# Tasks
+from cride.taskapp.tasks import disable_finished_rides
+
+# Views
+from cride.utils.views import CachedListMixin
+
+# Testing
+from cride.utils.testing import CircleMembersMixin
+
+# Utilities
+import json
+import threading
+from datetime import timedelta
+from unittest import mock
+
+
+@override_settings(RIDES_FEED_CACHE_TIMEOUT=30)
+class RideFeedCacheAPITestCase(CircleMembersMixin, APITestCase):
+    """Ride feed cache test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        cache.clear()
+        self.circle = self.create_circle()
+        self.user = self.create_member('joedoe')
+        self.driver = self.create_member('driver')
+        self.authenticate(self.user)
+        self.url = f'/circles/{self.circle.slug_name}/rides/'
+        self.ride = self.create_ride()
+
+    def create_ride(self, **kwargs):
+        departure = timezone.now() + timedelta(hours=1)
+        data = {
+            'offered_by': self.driver,
+            'offered_in': self.circle,
+            'available_seats': 3,
+            'comments': '',
+            'departure_location': 'Ciudad Universitaria',
+            'departure_date': departure,
+            'arrival_location': 'Coyoacán',
+            'arrival_date': departure + timedelta(hours=1),
+        }
+        data.update(kwargs)
+        return Ride.objects.create(**data)
+
+    def get(self, url=None, expected='hit'):
+        """Return the feed's rides, asserting the cache status."""
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.metrics.list_cache, expected)
+        self.assertIn(f'cache;desc="{expected}"', response['Server-Timing'])
+        return json.loads(response.content)
+
+    def test_hit(self):
+        """Feed pages are rendered once and served from the cache."""
+        data = self.get(expected='miss')
+        response = self.client.get(self.url)
+        self.assertEqual(response.metrics.list_cache, 'hit')
+        self.assertEqual(response.metrics.serializer_time, 0)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), data)
+        self.assertEqual([ride['id'] for ride in data['results']], [self.ride.pk])
+
+        self.create_ride(departure_date=self.ride.departure_date + timedelta(minutes=5))
+        first = self.get(f'{self.url}?limit=1', expected='miss')
+        second = self.get(first['next'], expected='miss')
+        self.assertEqual(self.get(f'{self.url}?limit=1'), first)
+        self.assertEqual(self.get(first['next']), second)
+        self.assertNotEqual(first['results'], second['results'])
+
+    def test_ride_changes(self):
+        """Creating, updating, joining and finishing rides refresh the feed."""
+        self.get(expected='miss')
+
+        ride = self.create_ride()
+        self.assertEqual(len(self.get(expected='miss')['results']), 2)
+
+        response = self.client.post(f'{self.url}{self.ride.pk}/join/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = self.get(expected='miss')['results']
+        self.assertEqual([len(ride['passengers']) for ride in results], [1, 0])
+
+        self.client.force_authenticate(self.driver)
+        response = self.client.patch(f'{self.url}{ride.pk}/', {'comments': 'Sin retraso'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get(expected='miss')['results'][1]['comments'], 'Sin retraso')
+
+    def test_finished_rides(self):
+        """Sweeping finished rides refreshes their circles' feeds."""
+        self.get(expected='miss')
+        version = Circle.objects.get_feed_version(self.circle.pk)
+        now = timezone.now()
+        Ride.objects.filter(pk=self.ride.pk).update(
+            departure_date=now - timedelta(hours=2),
+            arrival_date=now - timedelta(hours=1),
+        )
+        self.get()
+
+        disable_finished_rides()
+
+        self.assertNotEqual(Circle.objects.get_feed_version(self.circle.pk), version)
+        self.assertEqual(self.get(expected='miss')['results'], [])
+
+    @override_settings(RIDES_FEED_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        """The feed cache can be turned off."""
+        response = self.client.get(self.url)
+        self.assertIsNone(response.metrics.list_cache)
+        self.assertEqual(response.data['results'][0]['id'], self.ride.pk)
+
+    def test_single_flight(self):
+        """Requests wait for the one rendering a missing page."""
+        key = 'views:list:test'
+        cache.add(f'{key}:lock', True)
+        content = json.dumps({'next': None, 'previous': None, 'results': []}).encode()
+        timer = threading.Timer(0.1, cache.set, args=(key, content))
+
+        with mock.patch.object(CachedListMixin, 'get_list_cache_key', return_value=key):
+            timer.start()
+            self.assertEqual(self.get(expected='wait')['results'], [])
+            timer.join()
+
+            # The rendering request gave up, render without caching
+            cache.delete(key)
+            with mock.patch.object(CachedListMixin, 'list_cache_wait', 0.1):
+                self.assertEqual(len(self.get(expected='wait')['results']), 1)
+            self.assertIsNone(cache.get(key))
@@ -0,0 +1,126 @@
+"""Query plans tests."""
+
+# Django
+from django.db import connection, transaction
+from django.test import TestCase
+from django.utils import timezone
+
+# Models
+from cride.users.models import User
+from cride.circles.models import Circle, Membership, Invitation
+from cride.rides.models import Ride, Rating
+
+# Filters
+from cride.utils.filters import has_trigram
+
+# Utilities
+from datetime import timedelta
+
+
+class HotQueriesIndexesTestCase(TestCase):
+    """Verify the hottest queries are answered through an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Test data initialization."""
+        cls.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password='admin123',
+        )
+        cls.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='UNAM Facultad de Ciencias',
+        )
+
+    def assertUsesIndex(self, queryset, index_name):
+        """Assert the queryset's plan scans `index_name`."""
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Tiny test tables are always cheaper to scan sequentially
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_ride_feed(self):
+        """Circle's ride feed uses the partial feed index."""
+        queryset = Ride.objects.filter(
+            offered_in=self.circle,
+            departure_date__gte=timezone.now() + timedelta(minutes=10),
+            is_active=True,
+            available_seats__gte=1,
+        ).order_by('departure_date')
+        self.assertUsesIndex(queryset, 'ride_feed_idx')
+
+    def test_finished_rides(self):
+        """Finished rides sweep uses the partial arrival index."""
+        queryset = Ride.objects.filter(
+            arrival_date__lte=timezone.now(),
+            arrival_date__gt=timezone.now() - timedelta(minutes=10),
+            is_active=True,
+        ).order_by('pk').values_list('pk', flat=True)
+        self.assertUsesIndex(queryset, 'ride_finished_idx')
+
+    def test_active_membership(self):
+        """Active membership checks use the membership index."""
+        queryset = Membership.objects.filter(
+            user=self.user,
+            circle=self.circle,
+            is_active=True,
+        )
+        self.assertUsesIndex(queryset, 'membership_circle_user_idx')
+
+    def test_unused_invitations(self):
+        """Member's unused invitations use the issuer index."""
+        queryset = Invitation.objects.filter(
+            circle=self.circle,
+            issued_by=self.user,
+            used=False,
+        )
+        self.assertUsesIndex(queryset, 'invitation_issuer_idx')
+
+    def test_ride_ratings(self):
+        """Ratings emitted for a ride use the ride rating index."""
+        queryset = Rating.objects.filter(
+            circle=self.circle,
+            ride_id=1,
+            rating_user=self.user,
+        )
+        self.assertUsesIndex(queryset, 'rating_ride_user_idx')
+
+    def test_user_reputation(self):
+        """Rated user's ratings use the reputation index."""
+        queryset = Rating.objects.filter(rated_user=self.user).values('rating')
+        self.assertUsesIndex(queryset, 'rating_rated_user_idx')
+
+    def test_location_search(self):
+        """Ride location searches use the trigram index."""
+        if not has_trigram(connection):
+            self.skipTest('pg_trgm is not installed')
+        queryset = Ride.objects.filter(departure_location__trigram_search='universitaria')
+        self.assertUsesIndex(queryset, 'ride_departure_trgm_idx')
+
+    def test_nearby_rides(self):
+        """Nearby rides are narrowed with the geohash index."""
+        if connection.vendor == 'sqlite':
+            self.skipTest("SQLite's planner doesn't split OR-ed ranges over an index")
+
+        # Rides all over the world, the plan depends on their statistics
+        departure = timezone.now() + timedelta(hours=1)
+        for i in range(500):
+            Ride.objects.create(
+                comments='',
+                departure_location='Somewhere',
+                departure_date=departure,
+                departure_latitude=(i * 7) % 160 - 80,
+                departure_longitude=(i * 13) % 340 - 170,
+                arrival_location='Elsewhere',
+                arrival_date=departure + timedelta(hours=1),
+            )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE rides_ride')
+
+        queryset = Ride.objects.nearby(19.3326, -99.1870, 5)
+        self.assertUsesIndex(queryset, 'ride_geohash_idx')
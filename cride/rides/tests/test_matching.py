@@ -0,0 +1,196 @@
+"""Ride matching tests."""
+
+# Django
+from django.utils import timezone
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Models
+from cride.rides.models import Ride
+
+# Index
+from cride.rides.managers.index import RideIndex
+
+# Testing
+from cride.utils.testing import CircleMembersMixin
+
+# Utilities
+import random
+from unittest import TestCase
+from datetime import timedelta
+
+
+class RideIndexTestCase(TestCase):
+    """Ride index test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.now = timezone.now()
+        self.index = RideIndex()
+
+    def test_time_window(self):
+        """Only rides departing within the window are returned, earliest first."""
+        for pk, hours in enumerate([5, 1, 3, 8], start=1):
+            self.index.add(pk, self.now + timedelta(hours=hours), 'CU', 'Coyoacan')
+
+        pks = self.index.search(self.now, self.now + timedelta(hours=5))
+
+        self.assertEqual(pks, [2, 3, 1])
+
+    def test_ranking(self):
+        """Rides matching more location words rank first."""
+        departure = self.now + timedelta(hours=1)
+        self.index.add(1, departure, 'Ciudad Universitaria', 'Coyoacan')
+        self.index.add(2, departure, 'Ciudad Universitaria', 'Coyoacán Centro')
+        self.index.add(3, departure, 'Ciudad Satelite', 'Polanco')
+        self.index.add(4, departure, 'Ciudad Universitaria', 'Polanco')
+
+        pks = self.index.search(
+            self.now,
+            self.now + timedelta(hours=2),
+            departure_location='ciudad universitaria',
+            arrival_location='coyoacan centro',
+        )
+
+        self.assertEqual(pks, [2, 1])
+
+    def test_discard_and_prune(self):
+        """Removed and departed rides are not returned."""
+        self.index.add(1, self.now - timedelta(hours=1), 'CU', 'Coyoacan')
+        self.index.add(2, self.now + timedelta(hours=1), 'CU', 'Coyoacan')
+        self.index.add(3, self.now + timedelta(hours=2), 'CU', 'Coyoacan')
+        self.index.add(3, self.now + timedelta(hours=3), 'CU', 'Polanco')
+        self.index.discard(2)
+        self.index.prune(self.now)
+
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(self.index.search(self.now - timedelta(hours=2), self.now + timedelta(hours=4)), [3])
+        self.assertEqual(self.index.search(self.now, self.now + timedelta(hours=4), arrival_location='Coyoacan'), [])
+
+    def test_large_circle(self):
+        """Searches over 50k rides only rank the rides departing in the window."""
+        places = ['Ciudad Universitaria', 'Coyoacan', 'Polanco', 'Santa Fe', 'Tlalpan', 'Roma Norte']
+        rng = random.Random(0)
+        for pk in range(50000):
+            self.index.add(
+                pk,
+                self.now + timedelta(minutes=rng.randrange(60 * 24 * 30)),
+                rng.choice(places),
+                rng.choice(places),
+            )
+        window = (self.now + timedelta(days=3), self.now + timedelta(days=3, hours=4))
+        in_window = len(self.index.search(*window, limit=50000))
+
+        self.index.rides = CountingDict(self.index.rides)
+        pks = self.index.search(*window, departure_location='Ciudad Universitaria', arrival_location='Santa Fe')
+
+        self.assertTrue(pks)
+        self.assertLessEqual(self.index.rides.reads, in_window)
+
+
+class CountingDict(dict):
+    """Dict counting its item reads."""
+
+    reads = 0
+
+    def __getitem__(self, key):
+        self.reads += 1
+        return super(CountingDict, self).__getitem__(key)
+
+
+class RideMatchAPITestCase(CircleMembersMixin, APITestCase):
+    """Ride match endpoint test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = self.create_circle(verified=True)
+        self.user = self.create_member('joedoe')
+        self.authenticate(self.user)
+        self.url = f'/circles/{self.circle.slug_name}/rides/match/'
+        self.now = timezone.now()
+
+    def create_ride(self, hours, departure_location, arrival_location, **kwargs):
+        """Create a ride departing in some hours."""
+        departure = self.now + timedelta(hours=hours)
+        return Ride.objects.create(
+            offered_by=self.user,
+            offered_in=self.circle,
+            comments='',
+            departure_location=departure_location,
+            departure_date=departure,
+            arrival_location=arrival_location,
+            arrival_date=departure + timedelta(hours=1),
+            **kwargs
+        )
+
+    def match(self, hours, **params):
+        """Request the rides departing within some hours."""
+        params.setdefault('departure_after', self.now.isoformat())
+        params.setdefault('departure_before', (self.now + timedelta(hours=hours)).isoformat())
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [ride['id'] for ride in response.data]
+
+    def test_match(self):
+        """Rides are ranked by their locations and departure."""
+        later = self.create_ride(2, 'Ciudad Universitaria', 'Coyoacan')
+        sooner = self.create_ride(1, 'Ciudad Universitaria', 'Coyoacan')
+        other = self.create_ride(1, 'Ciudad Universitaria', 'Polanco')
+        self.create_ride(5, 'Ciudad Universitaria', 'Coyoacan')
+        self.create_ride(1, 'Ciudad Universitaria', 'Coyoacan', available_seats=0)
+
+        pks = self.match(3, departure_location='Ciudad Universitaria', arrival_location='Coyoacan')
+        self.assertEqual(pks, [sooner.pk, later.pk])
+
+        pks = self.match(3, departure_location='Ciudad Universitaria')
+        self.assertEqual(pks, [sooner.pk, other.pk, later.pk])
+
+    def test_incremental_updates(self):
+        """Created, updated and finished rides are reflected."""
+        ride = self.create_ride(1, 'CU', 'Coyoacan')
+        self.assertEqual(self.match(3), [ride.pk])
+
+        new_ride = self.create_ride(2, 'CU', 'Coyoacan')
+        self.assertEqual(self.match(3), [ride.pk, new_ride.pk])
+
+        ride.departure_date = self.now + timedelta(hours=4)
+        ride.save()
+        self.assertEqual(self.match(3), [new_ride.pk])
+
+        new_ride.is_active = False
+        new_ride.save()
+        self.assertEqual(self.match(5), [ride.pk])
+
+    def test_full_rides(self):
+        """Rides that run out of seats leave the index."""
+        ride = self.create_ride(1, 'CU', 'Coyoacan', available_seats=1)
+        self.assertEqual(self.match(3), [ride.pk])
+
+        self.client.force_authenticate(self.create_member('janedoe'))
+        response = self.client.post(f'/circles/{self.circle.slug_name}/rides/{ride.pk}/join/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.match(3), [])
+        self.assertEqual(len(Ride.objects.get_index(self.circle.pk)), 0)
+
+    def test_stale_candidates(self):
+        """Matches aren't cut short by indexed rides failing the database checks."""
+        full = [self.create_ride(1, 'CU', 'Coyoacan') for _ in range(6)]
+        available = [self.create_ride(2, 'CU', 'Coyoacan') for _ in range(2)]
+        Ride.objects.get_index(self.circle.pk)
+        # Seats taken without touching the index
+        Ride.objects.filter(pk__in=[ride.pk for ride in full]).update(available_seats=0)
+
+        rides = Ride.objects.match(self.circle, self.now, self.now + timedelta(hours=3), limit=2)
+
+        self.assertEqual([ride.pk for ride in rides], [ride.pk for ride in available])
+
+    def test_invalid_window(self):
+        """Windows ending before they start are rejected."""
+        response = self.client.get(self.url, {
+            'departure_after': self.now.isoformat(),
+            'departure_before': (self.now - timedelta(hours=1)).isoformat(),
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
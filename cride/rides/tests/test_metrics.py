@@ -0,0 +1,98 @@
+"""Request metrics tests."""
+
+# Django
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+
+# Utilities
+import json
+from datetime import timedelta
+from cride.utils.testing import RequestMetricsAssertionsMixin
+
+
+class RequestMetricsTestCase(RequestMetricsAssertionsMixin, APITestCase):
+    """Request metrics middleware test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='UNAM Facultad de Ciencias',
+        )
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password='admin123',
+        )
+        profile = Profile.objects.create(user=self.user)
+        Membership.objects.create(user=self.user, profile=profile, circle=self.circle)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.url = f'/circles/{self.circle.slug_name}/rides/'
+
+        departure = timezone.now() + timedelta(hours=1)
+        for _ in range(3):
+            Ride.objects.create(
+                offered_by=self.user,
+                offered_in=self.circle,
+                comments='',
+                departure_location='Ciudad Universitaria',
+                departure_date=departure,
+                arrival_location='Coyoacan',
+                arrival_date=departure + timedelta(hours=1),
+            )
+
+    def test_metrics(self):
+        """Queries and timings are recorded and sent as Server-Timing."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = response.metrics
+        self.assertEqual(metrics.queries, len(context.captured_queries))
+        self.assertGreater(metrics.sql_time, 0)
+        self.assertGreater(metrics.serializer_time, 0)
+        self.assertGreaterEqual(metrics.view_time, metrics.serializer_time)
+        self.assertGreaterEqual(metrics.total_time, metrics.view_time)
+
+        timing = response['Server-Timing']
+        self.assertIn(f'db;dur={metrics.sql_time:.2f};desc="{metrics.queries} queries"', timing)
+        self.assertIn('serializer;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+    def test_budget(self):
+        """The ride feed stays within its query budget."""
+        response = self.client.get(self.url)
+        self.assertWithinBudget(response)
+        self.assertQueriesAtMost(response, 8)
+
+    @override_settings(REQUEST_METRICS_BUDGETS={'rides:ride-list': {'queries': 1}})
+    def test_exceeded_budget(self):
+        """Requests going over their budget are logged as warnings."""
+        with self.assertLogs('cride.utils.metrics', 'WARNING') as logs:
+            response = self.client.get(self.url)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'rides:ride-list')
+        self.assertEqual(record['queries'], response.metrics.queries)
+        self.assertEqual(record['exceeded'], ['queries'])
+        with self.assertRaises(AssertionError):
+            self.assertWithinBudget(response)
+
+    @override_settings(REQUEST_METRICS_HEADER=False)
+    def test_header_disabled(self):
+        """The Server-Timing header can be turned off."""
+        response = self.client.get(self.url)
+        self.assertNotIn('Server-Timing', response)
@@ -0,0 +1,123 @@
+"""Nearby rides tests."""
+
+# Django
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+
+# Utilities
+import random
+from datetime import timedelta
+from cride.utils.geo import bounding_box, encode_geohash, geohash_cover, haversine
+
+
+class GeoTestCase(SimpleTestCase):
+    """Geographic utilities test case."""
+
+    def test_geohash(self):
+        """Geohashes match the reference encoding."""
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertEqual(encode_geohash(42.6, -5.6, 5), 'ezs42')
+
+    def test_haversine(self):
+        """Distances are great-circle distances in km."""
+        self.assertAlmostEqual(haversine(48.8566, 2.3522, 51.5074, -0.1278), 343.5, delta=1)
+        self.assertEqual(haversine(19.3, -99.1, 19.3, -99.1), 0)
+
+    def test_cover(self):
+        """Every point within the radius falls in one of the covering cells."""
+        rng = random.Random(0)
+        for _ in range(200):
+            latitude, longitude = rng.uniform(-80, 80), rng.uniform(-170, 170)
+            radius = rng.choice([0.5, 2, 10, 50])
+            cells = geohash_cover(bounding_box(latitude, longitude, radius))
+            self.assertLessEqual(len(cells), 16)
+            for _ in range(20):
+                min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius)
+                point = rng.uniform(min_lat, max_lat), rng.uniform(min_lon, max_lon)
+                geohash = encode_geohash(*point)
+                self.assertTrue(any(geohash.startswith(cell) for cell in cells))
+
+
+class NearbyRidesAPITestCase(APITestCase):
+    """Nearby rides endpoint test case."""
+
+    # Ciudad Universitaria, Mexico City
+    latitude = 19.3326
+    longitude = -99.1870
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='UNAM Facultad de Ciencias',
+        )
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password='admin123',
+        )
+        profile = Profile.objects.create(user=self.user)
+        Membership.objects.create(user=self.user, profile=profile, circle=self.circle)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.url = f'/circles/{self.circle.slug_name}/rides/nearby/'
+
+    def create_ride(self, latitude=None, longitude=None, **kwargs):
+        """Create an upcoming ride departing from the given point."""
+        departure = timezone.now() + timedelta(hours=1)
+        return Ride.objects.create(
+            offered_by=self.user,
+            offered_in=self.circle,
+            comments='',
+            departure_location='Somewhere',
+            departure_date=departure,
+            departure_latitude=latitude,
+            departure_longitude=longitude,
+            arrival_location='Coyoacan',
+            arrival_date=departure + timedelta(hours=1),
+            **kwargs
+        )
+
+    def test_geohash_on_save(self):
+        """Departure geohashes follow the coordinates."""
+        ride = self.create_ride(self.latitude, self.longitude)
+        self.assertEqual(ride.departure_geohash, encode_geohash(self.latitude, self.longitude))
+
+        ride.departure_latitude = ride.departure_longitude = None
+        ride.save()
+        ride.refresh_from_db()
+        self.assertEqual(ride.departure_geohash, '')
+
+    def test_nearby(self):
+        """Rides within the radius are returned closest first."""
+        far = self.create_ride(self.latitude + 0.03, self.longitude)  # ~3.3 km
+        close = self.create_ride(self.latitude, self.longitude + 0.01)  # ~1 km
+        self.create_ride(self.latitude + 0.1, self.longitude)  # ~11 km
+        self.create_ride(self.latitude, self.longitude, is_active=False)
+        self.create_ride()
+
+        response = self.client.get(self.url, {
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'radius': 5,
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([ride['id'] for ride in response.data], [close.pk, far.pk])
+        self.assertAlmostEqual(response.data[0]['distance'], 1.05, delta=0.05)
+        self.assertAlmostEqual(response.data[1]['distance'], 3.34, delta=0.05)
+
+    def test_invalid_point(self):
+        """Coordinates out of range are rejected."""
+        response = self.client.get(self.url, {'latitude': 91, 'longitude': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,129 @@
+"""Ratings tests."""
+
+# Django
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Serializers
+from cride.rides.serializers import CreateRideRatingSerializer
+
+# Models
+from cride.users.models import Profile
+from cride.rides.models import Ride, Rating
+
+# Tasks
+from cride.taskapp.tasks import reconcile_rating_aggregates
+
+# Testing
+from cride.utils.testing import CircleMembersMixin
+
+# Utilities
+from io import StringIO
+from datetime import timedelta
+from types import SimpleNamespace
+
+
+class RideRatingTestCase(CircleMembersMixin, TestCase):
+    """Ride ratings aggregates test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = self.create_circle(verified=True)
+        self.driver = self.create_member('driver')
+        self.passengers = [self.create_member(f'passenger{i}') for i in range(3)]
+        self.rides = [self.create_ride() for _ in range(2)]
+
+    def create_ride(self):
+        """Create a finished ride offered by the driver with all passengers."""
+        departure = timezone.now() - timedelta(hours=2)
+        ride = Ride.objects.create(
+            offered_by=self.driver,
+            offered_in=self.circle,
+            available_seats=1,
+            comments='',
+            departure_location='Ciudad Universitaria',
+            departure_date=departure,
+            arrival_location='Coyoacan',
+            arrival_date=departure + timedelta(hours=1),
+            is_active=False,
+        )
+        ride.passengers.add(*self.passengers)
+        return ride
+
+    def rate(self, ride, user, rating):
+        """Rate the ride as the user through the serializer."""
+        serializer = CreateRideRatingSerializer(
+            data={'rating': rating, 'comments': 'Nice ride'},
+            context={
+                'request': SimpleNamespace(user=user),
+                'ride': ride,
+                'circle': self.circle,
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_rating_updates_running_averages(self):
+        """Ride rating and driver reputation are averaged from sum and count."""
+        self.rate(self.rides[0], self.passengers[0], 5)
+        ride = self.rate(self.rides[0], self.passengers[1], 4)
+        self.assertEqual(ride.rating, 4.5)
+        self.assertEqual((ride.ratings_sum, ride.ratings_count), (9, 2))
+
+        self.rate(self.rides[1], self.passengers[2], 2)
+        profile = Profile.objects.get(user=self.driver)
+        self.assertEqual((profile.ratings_sum, profile.ratings_count), (11, 3))
+        self.assertEqual(profile.reputation, 3.7)
+
+    def test_rating_does_not_scan_ratings(self):
+        """Submitting a rating doesn't aggregate the existing ratings."""
+        self.rate(self.rides[0], self.passengers[0], 5)
+        with CaptureQueriesContext(connection) as context:
+            serializer = CreateRideRatingSerializer(
+                data={'rating': 3},
+                context={
+                    'request': SimpleNamespace(user=self.passengers[1]),
+                    'ride': self.rides[0],
+                    'circle': self.circle,
+                }
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        queries = [query['sql'].upper() for query in context.captured_queries]
+        self.assertFalse([sql for sql in queries if 'AVG(' in sql or 'SUM(' in sql])
+        self.assertEqual(len([sql for sql in queries if sql.startswith('UPDATE')]), 2)
+
+    def corrupt_aggregates(self):
+        """Rate the rides and tamper with the stored aggregates."""
+        self.rate(self.rides[0], self.passengers[0], 5)
+        self.rate(self.rides[0], self.passengers[1], 3)
+        self.rate(self.rides[1], self.passengers[0], 1)
+        Ride.objects.filter(pk=self.rides[0].pk).update(ratings_sum=0, ratings_count=0)
+        Profile.objects.filter(user=self.driver).update(ratings_count=7)
+
+    def assertAggregates(self):
+        """Assert the stored aggregates match the ratings."""
+        ride = Ride.objects.get(pk=self.rides[0].pk)
+        self.assertEqual((ride.ratings_sum, ride.ratings_count, ride.rating), (8, 2, 4.0))
+        profile = Profile.objects.get(user=self.driver)
+        self.assertEqual((profile.ratings_sum, profile.ratings_count), (9, 3))
+        self.assertEqual(profile.reputation, 3.0)
+
+    def test_backfill_command(self):
+        """The backfill command rebuilds aggregates from the ratings."""
+        self.corrupt_aggregates()
+        out = StringIO()
+        call_command('backfill_ratings', stdout=out)
+        self.assertIn('2 rides', out.getvalue())
+        self.assertAggregates()
+
+    def test_reconcile_task(self):
+        """The reconciliation task only rebuilds wrong aggregates."""
+        self.corrupt_aggregates()
+        self.assertEqual(reconcile_rating_aggregates(), {'rides': 1, 'profiles': 1})
+        self.assertAggregates()
+        self.assertEqual(reconcile_rating_aggregates(), {'rides': 0, 'profiles': 0})
+        self.assertEqual(Rating.objects.count(), 3)
@@ -0,0 +1,156 @@
+"""JSON renderers tests."""
+
+# Django
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db.models.fields.files import FieldFile
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+# DRF
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+# Renderers
+from cride.utils.parsers import ORJSONParser
+from cride.utils.renderers import ORJSONRenderer
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+
+# Utilities
+import io
+import json
+import uuid
+import decimal
+import datetime
+from datetime import timedelta
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    """orjson renderer and parser test case."""
+
+    def assertRendersLikeDRF(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_types(self):
+        """Python types are rendered as DRF renders them."""
+        self.assertRendersLikeDRF({
+            'datetime': datetime.datetime(2020, 9, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'naive': datetime.datetime(2020, 9, 1, 12, 30),
+            'offset': datetime.datetime(2020, 9, 1, 12, 30, tzinfo=datetime.timezone(timedelta(hours=-5))),
+            'date': datetime.date(2020, 9, 1),
+            'time': datetime.time(8, 15),
+            'timedelta': timedelta(minutes=90),
+            'decimal': decimal.Decimal('4.25'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Rides'),
+            'nested': [{'ñandú': 'Coyoacán', 1: None, 'rating': 4.5}],
+            'line separator': 'a\u2028b\u2029c',
+            'big': 2 ** 70,
+        })
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_files(self):
+        """Files are rendered as their URLs."""
+        field = Profile._meta.get_field('picture')
+        data = {
+            'picture': FieldFile(None, field, 'users/pictures/joe.png'),
+            'empty': FieldFile(None, field, ''),
+        }
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(data)),
+            {'picture': default_storage.url('users/pictures/joe.png'), 'empty': None},
+        )
+
+    def test_indent(self):
+        """Indentation can be requested through the media type."""
+        content = ORJSONRenderer().render({'a': [1]}, 'application/json; indent=4')
+        self.assertEqual(content, b'{\n  "a": [\n    1\n  ]\n}')
+
+    def test_parser(self):
+        """JSON bodies are parsed and malformed ones rejected."""
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"a": [1, "ñ"]}'.encode())), {'a': [1, 'ñ']})
+        for content in (b'{"a": ', b'NaN', b'{"a": 1} x'):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(content))
+
+
+class RideRenderingAPITestCase(APITestCase):
+    """Rides API rendering test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='UNAM Facultad de Ciencias',
+        )
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            first_name='Jöe',
+            password='admin123',
+        )
+        profile = Profile.objects.create(user=self.user, picture='users/pictures/joe.png', reputation=4.5)
+        Membership.objects.create(user=self.user, profile=profile, circle=self.circle)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.url = f'/circles/{self.circle.slug_name}/rides/'
+
+        departure = timezone.now() + timedelta(hours=1)
+        self.ride = Ride.objects.create(
+            offered_by=self.user,
+            offered_in=self.circle,
+            comments='Salida por la puerta 8 \u2028 sin retraso',
+            departure_location='Ciudad Universitaria',
+            departure_date=departure,
+            arrival_location='Coyoacán',
+            arrival_date=departure + timedelta(hours=1),
+            rating=4.25,
+        )
+
+    def test_rides(self):
+        """Ride payloads are rendered byte for byte as DRF renders them."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        ride = response.json()['results'][0]
+        self.assertEqual(ride['offered_by']['profile']['picture'], 'http://testserver/media/users/pictures/joe.png')
+
+    def test_parse_error(self):
+        """Malformed JSON bodies are rejected."""
+        response = self.client.patch(
+            f'{self.url}{self.ride.pk}/',
+            data=b'{"comments": ',
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('JSON parse error', response.data['detail'])
+
+        response = self.client.patch(
+            f'{self.url}{self.ride.pk}/',
+            data=json.dumps({'comments': 'Puerta 8'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['comments'], 'Puerta 8')
+
+
+class BenchmarkRenderersTestCase(TestCase):
+    """Renderers benchmark command test case."""
+
+    def test_benchmark(self):
+        """Both renderers and parsers are measured."""
+        out = io.StringIO()
+        call_command('benchmark_renderers', '--rides', '20', '--repeat', '2', stdout=out)
+        self.assertIn('ORJSONRenderer', out.getvalue())
+        self.assertIn('ORJSONParser', out.getvalue())
+        self.assertFalse(Ride.objects.exists())
@@ -0,0 +1,204 @@
+"""Rides tests."""
+
+# Django
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# DRF
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+
+# Serializers
+from cride.rides.serializers import JoinRideSerializer
+
+# Models
+from cride.users.models import Profile
+from cride.circles.models import Membership
+from cride.rides.models import Ride
+
+# Testing
+from cride.utils.testing import CircleMembersMixin
+
+# Utilities
+from datetime import timedelta
+from unittest import skipIf
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RideListAPITestCase(CircleMembersMixin, APITestCase):
+    """Ride feed endpoint test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = self.create_circle(verified=True)
+        self.user = self.create_member('joedoe')
+        self.authenticate(self.user)
+        self.url = f'/circles/{self.circle.slug_name}/rides/'
+
+    def create_rides(self, count, passengers=2):
+        """Create `count` upcoming rides, each one with some passengers."""
+        departure = timezone.now() + timedelta(hours=1)
+        start = Ride.objects.count()
+        for i in range(start, start + count):
+            ride = Ride.objects.create(
+                offered_by=self.create_member(f'driver{i}'),
+                offered_in=self.circle,
+                available_seats=passengers + 1,
+                comments='',
+                departure_location='Ciudad Universitaria',
+                departure_date=departure,
+                arrival_location='Coyoacan',
+                arrival_date=departure + timedelta(hours=1),
+            )
+            for j in range(passengers):
+                ride.passengers.add(self.create_member(f'passenger{i}-{j}'))
+
+    def count_list_queries(self):
+        """Return the number of queries executed by a list request."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def test_list_runs_constant_queries(self):
+        """Listing rides shouldn't run more queries as the page grows."""
+        self.create_rides(1)
+        self.count_list_queries()  # warm up caches
+        few_rides_queries = self.count_list_queries()
+
+        self.create_rides(5)
+        many_rides_queries = self.count_list_queries()
+
+        self.assertEqual(few_rides_queries, many_rides_queries)
+
+    def test_list_nests_passengers_profiles(self):
+        """Preloaded relations are still serialized."""
+        self.create_rides(1, passengers=3)
+        response = self.client.get(self.url)
+        ride = response.data['results'][0]
+        self.assertEqual(len(ride['passengers']), 3)
+        self.assertIn('profile', ride['passengers'][0])
+        self.assertEqual(ride['offered_in'], self.circle.name)
+
+    def test_keyset_pagination(self):
+        """The feed is paged by keyset, without counting or skipping rows."""
+        self.create_rides(25, passengers=0)
+        expected = list(Ride.objects.order_by('departure_date', 'id').values_list('pk', flat=True))
+
+        pages, url = [], f'{self.url}?limit=10'
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            for query in context.captured_queries:
+                self.assertNotIn('COUNT(', query['sql'])
+                self.assertNotIn('OFFSET', query['sql'])
+            pages.append(response.data)
+            url = response.data['next']
+
+        self.assertEqual([len(page['results']) for page in pages], [10, 10, 5])
+        self.assertEqual([ride['id'] for page in pages for ride in page['results']], expected)
+
+        response = self.client.get(pages[-1]['previous'])
+        self.assertEqual(response.data['results'], pages[1]['results'])
+
+    def test_invalid_cursor(self):
+        """Tampered cursors are rejected."""
+        response = self.client.get(f'{self.url}?cursor=invalid')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_join_updates_stats(self):
+        """Joining a ride takes a seat and updates everybody's stats."""
+        self.create_rides(1, passengers=0)
+        ride = Ride.objects.get()
+
+        response = self.client.post(f'{self.url}{ride.pk}/join/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['available_seats'], 0)
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_taken, 1)
+        membership = Membership.objects.get(user=self.user, circle=self.circle)
+        self.assertEqual(membership.rides_taken, 1)
+        self.assertEqual(membership.profile.rides_taken, 1)
+
+    def test_reserve_seat_on_full_ride(self):
+        """No seat is reserved once the ride is full."""
+        self.create_rides(1, passengers=0)
+        ride = Ride.objects.get()
+
+        self.assertTrue(Ride.objects.reserve_seat(ride))
+        self.assertFalse(Ride.objects.reserve_seat(ride))
+        ride.refresh_from_db()
+        self.assertEqual(ride.available_seats, 0)
+
+
+@skipIf(connection.vendor == 'sqlite', "SQLite doesn't support concurrent writers.")
+class JoinRideConcurrencyTestCase(CircleMembersMixin, TransactionTestCase):
+    """Concurrent joins test case.
+
+    Uses a TransactionTestCase so every thread works on its own
+    connection and commits its own transaction."""
+
+    SEATS = 50
+    PASSENGERS = 200
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = self.create_circle()
+        driver = self.create_member('driver')
+        self.members = []
+        for i in range(self.PASSENGERS):
+            user = self.create_member(f'member{i}')
+            self.members.append((user, Membership.objects.get(user=user)))
+        departure = timezone.now() + timedelta(hours=1)
+        self.ride = Ride.objects.create(
+            offered_by=driver,
+            offered_in=self.circle,
+            available_seats=self.SEATS,
+            comments='',
+            departure_location='Ciudad Universitaria',
+            departure_date=departure,
+            arrival_location='Coyoacan',
+            arrival_date=departure + timedelta(hours=1),
+        )
+
+    def join(self, member):
+        """Join the ride as `member`, return whether it succeeded."""
+        user, membership = member
+        ride = Ride.objects.get(pk=self.ride.pk)
+        serializer = JoinRideSerializer(
+            ride,
+            context={
+                'ride': ride,
+                'circle': self.circle,
+                'user': user,
+                'membership': membership,
+            },
+        )
+        try:
+            serializer.update(ride, {'passenger': user.pk})
+        except ValidationError:
+            return False
+        finally:
+            connection.close()
+        return True
+
+    def test_no_overbooking(self):
+        """Parallel joins never take more seats than available."""
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            results = list(executor.map(self.join, self.members))
+
+        self.ride.refresh_from_db()
+        self.circle.refresh_from_db()
+        self.assertEqual(results.count(True), self.SEATS)
+        self.assertEqual(self.ride.available_seats, 0)
+        self.assertEqual(self.ride.passengers.count(), self.SEATS)
+        self.assertEqual(self.circle.rides_taken, self.SEATS)
+        self.assertEqual(
+            sum(Profile.objects.values_list('rides_taken', flat=True)),
+            self.SEATS
+        )
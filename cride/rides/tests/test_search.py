@@ -0,0 +1,76 @@
+"""Ride search tests."""
+
+# Django
+from django.db import connection
+from django.utils import timezone
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Filters
+from cride.utils.filters import has_trigram
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+
+# Utilities
+from datetime import timedelta
+
+
+class RideSearchAPITestCase(APITestCase):
+    """Ride search test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='UNAM Facultad de Ciencias',
+        )
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password='admin123',
+        )
+        profile = Profile.objects.create(user=self.user)
+        Membership.objects.create(user=self.user, profile=profile, circle=self.circle)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.url = f'/circles/{self.circle.slug_name}/rides/'
+
+        departure = timezone.now() + timedelta(hours=1)
+        for departure_location, arrival_location in [
+            ('Ciudad Universitaria', 'Coyoacan'),
+            ('Polanco', 'Ciudad Universitaria'),
+            ('Santa Fe', 'Polanco'),
+        ]:
+            Ride.objects.create(
+                offered_by=self.user,
+                offered_in=self.circle,
+                comments='',
+                departure_location=departure_location,
+                departure_date=departure,
+                arrival_location=arrival_location,
+                arrival_date=departure + timedelta(hours=1),
+            )
+
+    def search(self, term):
+        """Return the locations of the rides matching the term."""
+        response = self.client.get(self.url, {'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(ride['departure_location'] for ride in response.data['results'])
+
+    def test_contains(self):
+        """Both locations are searched regardless of the case."""
+        self.assertEqual(self.search('universi'), ['Ciudad Universitaria', 'Polanco'])
+        self.assertEqual(self.search('santa fe'), ['Santa Fe'])
+        self.assertEqual(self.search('tlalpan'), [])
+
+    def test_typos(self):
+        """Misspelled locations are matched by similarity."""
+        if not has_trigram(connection):
+            self.skipTest('pg_trgm is not installed')
+        self.assertEqual(self.search('coyoakan'), ['Ciudad Universitaria'])
@@ -0,0 +1,103 @@
+"""Rides tasks tests."""
+
+# Django
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+# Models
+from cride.rides.models import Ride
+
+# Tasks
+from cride.taskapp.tasks import (
+    disable_finished_rides,
+    FINISHED_RIDES_BATCH_SIZE,
+    FINISHED_RIDES_FULL_SWEEP_KEY,
+)
+
+# Utilities
+from datetime import timedelta
+
+
+class DisableFinishedRidesTestCase(TestCase):
+    """Finished rides sweeper test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        cache.clear()
+
+    def create_rides(self, count, arrival_date):
+        """Create active rides arriving at the given date."""
+        Ride.objects.bulk_create(
+            (
+                Ride(
+                    comments='',
+                    departure_location='Ciudad Universitaria',
+                    departure_date=arrival_date - timedelta(hours=1),
+                    arrival_location='Coyoacan',
+                    arrival_date=arrival_date,
+                )
+                for _ in range(count)
+            ),
+            batch_size=5000,
+        )
+
+    def test_sweep(self):
+        """Finished rides among 100k are disabled in bounded batches."""
+        now = timezone.now()
+        self.create_rides(30000, now - timedelta(minutes=5))
+        self.create_rides(40000, now + timedelta(hours=1))
+        self.create_rides(30000, now - timedelta(days=1))
+
+        metrics = disable_finished_rides()
+
+        self.assertEqual(metrics['disabled'], 60000)
+        self.assertEqual(metrics['batches'], 60000 // FINISHED_RIDES_BATCH_SIZE)
+        self.assertEqual(Ride.objects.filter(is_active=True).count(), 40000)
+        self.assertFalse(Ride.objects.filter(is_active=True, arrival_date__lte=now).exists())
+
+        # Nothing left to sweep
+        with self.assertNumQueries(1):
+            metrics = disable_finished_rides()
+        self.assertEqual(metrics['disabled'], 0)
+
+    def test_high_water_mark(self):
+        """Later runs only scan rides that arrived after the previous run."""
+        now = timezone.now()
+        self.assertTrue(disable_finished_rides()['full'])
+
+        recent = now - timedelta(minutes=3)
+        self.create_rides(1, recent)
+        # Left behind before the mark, outside the overlap
+        self.create_rides(1, now - timedelta(days=1))
+
+        metrics = disable_finished_rides()
+        self.assertFalse(metrics['full'])
+        self.assertEqual(metrics['disabled'], 1)
+        self.assertFalse(Ride.objects.filter(arrival_date=recent, is_active=True).exists())
+
+    def test_full_sweep(self):
+        """Rides left behind the high-water mark are disabled by the full sweep."""
+        now = timezone.now()
+        ride = Ride.objects.create(
+            comments='',
+            departure_location='Ciudad Universitaria',
+            departure_date=now + timedelta(hours=1),
+            arrival_location='Coyoacan',
+            arrival_date=now + timedelta(hours=2),
+        )
+        disable_finished_rides()
+
+        # The arrival is moved earlier than the mark
+        ride.departure_date = now - timedelta(days=1, hours=1)
+        ride.arrival_date = now - timedelta(days=1)
+        ride.save()
+        self.assertEqual(disable_finished_rides()['disabled'], 0)
+
+        # The full sweep is due
+        cache.delete(FINISHED_RIDES_FULL_SWEEP_KEY)
+        metrics = disable_finished_rides()
+        self.assertTrue(metrics['full'])
+        self.assertEqual(metrics['disabled'], 1)
+        ride.refresh_from_db()
+        self.assertFalse(ride.is_active)
@@ -1,16 +1,13 @@
 """Rides views."""
 
 # Django
+from django.conf import settings
 from django.utils import timezone
 # DRF
-from rest_framework import mixins, viewsets, status
+from rest_framework import mixins, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework.generics import get_object_or_404
-from rest_framework.filters import (
-    SearchFilter,
-    OrderingFilter,
-)
+from rest_framework.filters import OrderingFilter
 # Permissions
 from rest_framework.permissions import IsAuthenticated
 # Utilities
@@ -22,37 +19,58 @@ from cride.rides.serializers import (
     RideModelSerializer,
     JoinRideSerializer,
     EndRideSerializer,
+    MatchRideSerializer,
+    NearbyRideSerializer,
+    NearbyRideModelSerializer,
 )
-# Models
-from cride.circles.models import Circle
 # Views
-from cride.utils.views import RelatedToCircle
+from cride.utils.views import (
+    RelatedToCircle,
+    EagerLoadingViewMixin,
+    MetricsMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    CompiledListMixin,
+)
+from cride.utils.pagination import KeysetPagination
+from cride.utils.filters import TrigramSearchFilter
 # Permissions
 from cride.circles.permissions.memberships import IsActiveCircleMember
 from cride.rides.permissions import IsRideOwner, IsNotRideOwner
+# Models
+from cride.circles.models import Circle
+from cride.rides.models import Ride
 
 class RideViewSet(
+        MetricsMixin,
+        ConditionalGetMixin,
+        CachedListMixin,
+        CompiledListMixin,
+        EagerLoadingViewMixin,
         mixins.ListModelMixin,
         mixins.CreateModelMixin,
         mixins.RetrieveModelMixin,
         mixins.UpdateModelMixin,
-        viewsets.GenericViewSet,
+        RelatedToCircle,
     ):
     """Rides view set."""
 
-    filter_backends = (SearchFilter, OrderingFilter)
-    ordering = ('departure_date', 'arrival_date', 'available_seats')
+    pagination_class = KeysetPagination
+
+    filter_backends = (TrigramSearchFilter, OrderingFilter)
+    ordering = ('departure_date', 'id')
     ordering_fields = ('departure_date', 'arrival_date', 'available_seats')
     search_fields = ('departure_location', 'arrival_location')
 
-    def dispatch(self, request, *args, **kwargs):
-        """Verify that the circle exists."""
-        slug_name = kwargs['slug_name']
-        self.circle = get_object_or_404(
-            Circle,
-            slug_name=slug_name,
-        )
-        return super(RideViewSet, self).dispatch(request, *args, **kwargs)
+    # Relations nested by `RideModelSerializer`
+    conditional_fields = (
+        'modified',
+        'offered_in__modified',
+        'offered_by__modified',
+        'offered_by__profile__modified',
+        'passengers__modified',
+        'passengers__profile__modified',
+    )
 
     def get_permissions(self):
         """Assign permission based on action."""
@@ -65,6 +83,14 @@ class RideViewSet(
 
         return [p() for p in permissions]
 
+    def get_list_cache_version(self):
+        """Cache the feed until one of the circle's rides changes."""
+        return f'rides:{self.circle.pk}:{Circle.objects.get_feed_version(self.circle.pk)}'
+
+    def get_list_cache_timeout(self):
+        """Rides leave the feed as their departure nears, expire pages meanwhile."""
+        return settings.RIDES_FEED_CACHE_TIMEOUT
+
     def get_serializer_context(self):
         """Add circle to serializer context."""
         context = super(RideViewSet, self).get_serializer_context()
@@ -84,6 +110,10 @@ class RideViewSet(
             serializer_class = JoinRideSerializer
         elif self.action == 'finish':
             serializer_class = EndRideSerializer
+        elif self.action == 'match':
+            serializer_class = MatchRideSerializer
+        elif self.action == 'nearby':
+            serializer_class = NearbyRideSerializer
 
         return serializer_class
 
@@ -108,7 +138,7 @@ class RideViewSet(
         serializer = serializer_class(
             ride,
             data={'passenger': request.user.pk},
-            context={'ride': ride, 'circle': self.circle},
+            context={'ride': ride, 'circle': self.circle, 'request': request},
             partial=True
         )
         serializer.is_valid(raise_exception=True)
@@ -130,4 +160,37 @@ class RideViewSet(
         serializer.is_valid(raise_exception=True)
         ride = serializer.save()
         data = RideModelSerializer(ride).data
-        return Response(data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def match(self, request, *args, **kwargs):
+        """Return the rides that best match a passenger's trip.
+
+        Takes a `departure_after` and `departure_before` time window and
+        optionally the desired departure and arrival locations."""
+        serializer = MatchRideSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        rides = Ride.objects.match(
+            self.circle,
+            queryset=self.setup_eager_loading(self.circle.ride_set.all(), RideModelSerializer),
+            **serializer.validated_data
+        )
+        data = RideModelSerializer(rides, many=True).data
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def nearby(self, request, *args, **kwargs):
+        """Return the feed rides departing near a point, closest first.
+
+        Takes a `latitude` and `longitude` and optionally a `radius` in km."""
+        serializer = NearbyRideSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        rides = Ride.objects.nearby(
+            data['latitude'],
+            data['longitude'],
+            data['radius'],
+            queryset=self.setup_eager_loading(self.get_queryset(), NearbyRideModelSerializer),
+        )[:data['limit']]
+        data = NearbyRideModelSerializer(rides, many=True).data
+        return Response(data, status=status.HTTP_200_OK)
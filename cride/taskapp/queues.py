@@ -0,0 +1,69 @@
+"""Broker backed queues."""
+
+# Celery
+from celery import current_app
+
+# Utilities
+from contextlib import contextmanager
+
+
+class BrokerQueue:
+    """FIFO queue stored in the Celery broker.
+
+    Items are broker messages, as durable as the tasks themselves and
+    shared by every web and worker process. Consumers take them in
+    batches and ack each one once handled, the ones left unacked when
+    the consumer fails are put back in the queue."""
+
+    def __init__(self, name):
+        """Set the queue's name in the broker."""
+        self.name = name
+
+    @contextmanager
+    def open(self):
+        """Yield the broker queue over a pooled connection."""
+        with current_app.pool.acquire(block=True) as connection:
+            with connection.SimpleQueue(self.name) as queue:
+                yield queue
+
+    def push(self, item):
+        """Append `item`, a JSON serializable value, to the queue."""
+        with self.open() as queue:
+            queue.put(item, serializer='json')
+
+    @contextmanager
+    def consume(self, batch_size):
+        """Yield a function returning the next batch of up to `batch_size` messages.
+
+        Messages have the item as `payload` and must be acked once
+        handled. Those not acked when the block exits are requeued."""
+        taken = []
+        with self.open() as queue:
+            queue.consumer.qos(prefetch_count=batch_size)
+
+            def get_batch():
+                batch = []
+                while len(batch) < batch_size:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except queue.Empty:
+                        break
+                taken.extend(batch)
+                return batch
+
+            try:
+                yield get_batch
+            finally:
+                for message in taken:
+                    if not message.acknowledged:
+                        message.requeue()
+
+    def clear(self):
+        """Drop every queued item."""
+        with self.open() as queue:
+            queue.clear()
+
+    def __len__(self):
+        """Return the number of queued items."""
+        with self.open() as queue:
+            return queue.qsize()
@@ -2,10 +2,11 @@
 
 # Django
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
 
 # Celery
 from celery.decorators import task, periodic_task
@@ -13,13 +14,31 @@ from celery.decorators import task, periodic_task
 # Utilities
 import time
 import jwt
+import logging
+from smtplib import SMTPException
 from datetime import timedelta
 
+# Queues
+from cride.taskapp.queues import BrokerQueue
+
 # Models
-from cride.rides.models import Ride
+from cride.circles.models import Circle
+from cride.rides.models import Ride, Rating
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
+confirmation_emails = BrokerQueue('emails.confirmation')
+
+CONFIRMATION_EMAILS_BATCH_SIZE = 100
+
+FINISHED_RIDES_BATCH_SIZE = 1000
+FINISHED_RIDES_HIGH_WATER_KEY = 'rides:finished:high_water'
+FINISHED_RIDES_OVERLAP = timedelta(minutes=10)
+FINISHED_RIDES_FULL_SWEEP_KEY = 'rides:finished:full_sweep'
+FINISHED_RIDES_FULL_SWEEP_INTERVAL = timedelta(hours=1)
+
 
 def gen_verification_token(user):
     """Generate JWT to verify user's account."""
@@ -35,41 +54,158 @@ def gen_verification_token(user):
     # for versions >=2.0.0 the token won't be represented as bytes
     return token.decode()
 
-@task(name='send_confirmation_email', max_retries=3)
-def send_confirmation_email(user_pk):
-    """Send account verification link to user's email."""
-    for i in range(30):
-        time.sleep(1)
-        print('Sleeping ', i+1)
-    user = User.objects.get(pk=user_pk)
+def build_confirmation_email(user, template, connection):
+    """Return the account verification message of the user."""
     verification_token = gen_verification_token(user)
     subject = f'Welcome @{user.username}! - Account Verification Code'
     from_email = 'Comparte Ride <noreply@comparteride.com>'
-    content = render_to_string(
-        'emails/users/account_verification.html',
-        {
-            'token': verification_token,
-            'user': user,
-        }
-    )
+    content = template.render({
+        'token': verification_token,
+        'user': user,
+    })
     msg = EmailMultiAlternatives(
         subject,
         content,
         from_email,
-        [user.email]
+        [user.email],
+        connection=connection
     )
     msg.attach_alternative(
         content,
         'text/html'
     )
-    msg.send()
+    return msg
+
+def enqueue_confirmation_email(user_pk):
+    """Queue the user's account verification email.
+
+    Queued emails are sent in batches by `send_confirmation_emails`.
+    Call it once the user is committed, the queue lives in the broker."""
+    confirmation_emails.push(user_pk)
+
+@task(name='send_confirmation_email', max_retries=3)
+def send_confirmation_email(user_pk):
+    """Queue account verification link to user's email.
+
+    Kept for messages published before the batched pipeline."""
+    enqueue_confirmation_email(user_pk)
+
+@periodic_task(
+    name='send_confirmation_emails',
+    run_every=timedelta(seconds=5),
+    bind=True,
+    max_retries=5,
+)
+def send_confirmation_emails(self):
+    """Send queued account verification emails in batches.
+
+    Every batch is sent over the same connection and the template is
+    compiled once. Queued users are acked one by one as their email is
+    sent, so a failure only puts back the ones not sent yet, and SMTP
+    failures are retried with exponential backoff."""
+    template = get_template('emails/users/account_verification.html')
+    connection = get_connection()
+    start = time.monotonic()
+    sent = batches = 0
+
+    with confirmation_emails.consume(CONFIRMATION_EMAILS_BATCH_SIZE) as get_batch:
+        try:
+            while True:
+                messages = get_batch()
+                if not messages:
+                    break
+                if not batches:
+                    connection.open()
+
+                users = User.objects.filter(is_verified=False).in_bulk([message.payload for message in messages])
+                for message in messages:
+                    user = users.get(message.payload)
+                    if user is not None:
+                        email = build_confirmation_email(user, template, connection)
+                        try:
+                            sent += connection.send_messages([email]) or 0
+                        except (SMTPException, OSError) as exc:
+                            raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+                    message.ack()
+                batches += 1
+        finally:
+            connection.close()
+
+    seconds = time.monotonic() - start
+    metrics = {
+        'sent': sent,
+        'batches': batches,
+        'seconds': round(seconds, 3),
+        'emails_per_second': round(sent / seconds, 1) if seconds else 0,
+    }
+    if sent:
+        logger.info('Sent confirmation emails: %s', metrics)
+    return metrics
 
 @periodic_task(name='disable_finished_rides', run_every=timedelta(seconds=30))
 def disable_finished_rides():
-    """Disable all finished rides."""
+    """Disable all finished rides.
+
+    Rides are disabled in batches of consecutive primary keys, so every
+    UPDATE locks a bounded number of rows. Only rides that arrived after
+    the previous run's high-water mark are scanned, with some overlap for
+    rides committed late. Rides left behind the mark, e.g. inserted late
+    or whose arrival was moved earlier, are disabled by a full sweep
+    every `FINISHED_RIDES_FULL_SWEEP_INTERVAL`."""
     now = timezone.now()
     offset = now - timedelta(seconds=60)
+    start = time.monotonic()
 
-    # update rides that have already finished
+    high_water = cache.get(FINISHED_RIDES_HIGH_WATER_KEY)
+    full = high_water is None or cache.get(FINISHED_RIDES_FULL_SWEEP_KEY) is None
     rides = Ride.objects.filter(arrival_date__lte=offset, is_active=True)
-    rides.update(is_active=False)
\ No newline at end of file
+    if not full:
+        rides = rides.filter(arrival_date__gt=high_water - FINISHED_RIDES_OVERLAP)
+
+    disabled = batches = 0
+    circles = set()
+    last_pk = None
+    while True:
+        batch = rides if last_pk is None else rides.filter(pk__gt=last_pk)
+        batch = list(batch.order_by('pk').values_list('pk', 'offered_in')[:FINISHED_RIDES_BATCH_SIZE])
+        if not batch:
+            break
+        disabled += rides.filter(
+            pk__gte=batch[0][0],
+            pk__lte=batch[-1][0],
+        ).update(is_active=False, modified=timezone.now())
+        circles.update(circle_id for _, circle_id in batch if circle_id is not None)
+        batches += 1
+        last_pk = batch[-1][0]
+
+    if circles:
+        Circle.objects.invalidate_feed(*circles)
+    cache.set(FINISHED_RIDES_HIGH_WATER_KEY, offset, None)
+    if full:
+        cache.set(FINISHED_RIDES_FULL_SWEEP_KEY, now, FINISHED_RIDES_FULL_SWEEP_INTERVAL.total_seconds())
+
+    metrics = {
+        'disabled': disabled,
+        'batches': batches,
+        'full': full,
+        'seconds': round(time.monotonic() - start, 3),
+    }
+    if disabled:
+        logger.info('Disabled finished rides: %s', metrics)
+    return metrics
+
+@periodic_task(name='reconcile_rating_aggregates', run_every=timedelta(days=1))
+def reconcile_rating_aggregates():
+    """Verify ratings aggregates and rebuild the wrong ones."""
+    rides, profiles = Rating.objects.get_mismatches()
+    updated_rides, updated_profiles = Rating.objects.rebuild_aggregates(
+        rides=rides,
+        profiles=profiles,
+    )
+    if updated_rides or updated_profiles:
+        logger.warning(
+            'Rebuilt mismatched ratings aggregates of %d rides and %d profiles.',
+            updated_rides,
+            updated_profiles,
+        )
+    return {'rides': updated_rides, 'profiles': updated_profiles}
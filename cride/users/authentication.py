@@ -0,0 +1,127 @@
+"""Users authentication."""
+
+# Django
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+# DRF
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+# Tokens
+from cride.users.tokens import decode_token, is_revoked, revocation_keys
+
+# Utilities
+import jwt
+
+
+CACHE_TIMEOUT = 60 * 5
+
+
+def user_cache_key(user_id):
+    """Return the cache key of a user."""
+    return f'users:user:{user_id}'
+
+
+def get_user(user_id):
+    """Return the user, with the profile loaded, caching it.
+
+    Cached users are meant for identity and references, their profile
+    counters might be stale, update them with F() expressions."""
+    User = get_user_model()
+    try:
+        user = User.objects.select_related('profile').get(pk=user_id)
+    except User.DoesNotExist:
+        raise AuthenticationFailed(_('User inactive or deleted.'))
+    cache.set(user_cache_key(user_id), user, CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_user(user_id):
+    """Drop the cached user and tokens now and once the transaction commits."""
+    keys = [user_cache_key(user_id)]
+    keys += [
+        CachedTokenAuthentication.cache_key(key)
+        for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True)
+    ]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class JWTAuthentication(BaseAuthentication):
+    """Signed access token authentication.
+
+    Clients send `Authorization: Bearer <access token>`. The token is
+    checked by its signature, its revocations and its user are read from
+    the cache in a single round trip, so requests usually don't touch
+    the database. `request.auth` is the token's payload."""
+
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed(_('Invalid token header.'))
+
+        try:
+            payload = decode_token(auth[1].decode(), 'access')
+        except jwt.ExpiredSignatureError:
+            raise AuthenticationFailed(_('Token has expired.'))
+        except (jwt.PyJWTError, UnicodeError):
+            raise AuthenticationFailed(_('Invalid token.'))
+
+        user_key = user_cache_key(payload['user'])
+        cached = cache.get_many([*revocation_keys(payload), user_key])
+        if is_revoked(payload, cached):
+            raise AuthenticationFailed(_('Token has been revoked.'))
+
+        user = cached.get(user_key) or get_user(payload['user'])
+        if not user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (user, payload)
+
+    def authenticate_header(self, request):
+        return f'{self.keyword} realm="api"'
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication through the cache.
+
+    Tokens resolve to their user, with the profile already loaded, from
+    the cache, so authenticated requests usually don't touch the
+    database. Entries are dropped on logout and whenever the user or the
+    profile is saved or deleted, see `invalidate_user`."""
+
+    @staticmethod
+    def cache_key(key):
+        """Return the cache key of a token."""
+        return f'users:token:{key}'
+
+    def authenticate_credentials(self, key):
+        """Return the token's user and the token."""
+        cache_key = self.cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            try:
+                token = Token.objects.select_related('user__profile').get(key=key)
+            except Token.DoesNotExist:
+                raise AuthenticationFailed(_('Invalid token.'))
+            cache.set(cache_key, token, CACHE_TIMEOUT)
+
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
+
+    @classmethod
+    def invalidate(cls, key):
+        """Drop the cached token now and once the transaction commits."""
+        cache_key = cls.cache_key(key)
+        cache.delete(cache_key)
+        transaction.on_commit(lambda: cache.delete(cache_key))
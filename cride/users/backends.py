@@ -0,0 +1,34 @@
+"""Users authentication backends."""
+
+# Django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+# Hashers
+from cride.users.hashers import hash_password, verify_password
+
+
+class HashingPoolModelBackend(ModelBackend):
+    """Model backend checking passwords in the hashing pool.
+
+    Pass the request to `authenticate` to record the hashing times in
+    its metrics."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        User = get_user_model()
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        metrics = getattr(request, 'metrics', None)
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Hash anyway, missing users shouldn't answer faster
+            hash_password(password, metrics)
+            return None
+
+        if verify_password(user, password, metrics) and self.user_can_authenticate(user):
+            return user
+        return None
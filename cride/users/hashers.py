@@ -0,0 +1,124 @@
+"""Password hashing.
+
+Hashing passwords is CPU bound by design, so logins hash in a bounded
+pool of workers: bursts wait in a bounded queue and are turned away once
+it's full, instead of taking every web worker.
+"""
+
+# Django
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, check_password, make_password
+from django.utils.translation import gettext_lazy as _
+
+# DRF
+from rest_framework.exceptions import APIException
+
+# Utilities
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 hasher with its cost in the settings.
+
+    `ARGON2_TIME_COST`, `ARGON2_MEMORY_COST` (KiB) and
+    `ARGON2_PARALLELISM` default to Django's parameters. Passwords hashed
+    with other parameters are rehashed when their users log in."""
+
+    @property
+    def time_cost(self):
+        return getattr(settings, 'ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
+
+
+class PasswordHashingUnavailable(APIException):
+    """Every hashing worker is busy and the queue is full."""
+
+    status_code = 503
+    default_detail = _('Too many logins in progress, try again later.')
+    default_code = 'password_hashing_unavailable'
+
+
+class PasswordHashingPool:
+    """Bounded pool of password hashing workers.
+
+    At most `workers` hashes run at once and `queue_size` more wait for
+    a worker, callers beyond them wait up to `timeout` seconds for room
+    before `PasswordHashingUnavailable` is raised."""
+
+    def __init__(self, workers, queue_size, timeout):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.timeout = timeout
+
+    def run(self, func, *args, metrics=None):
+        """Run `func` in a worker and return its result.
+
+        The hashing time and the time waiting for a worker are added to
+        `metrics`, a `RequestMetrics`, when given."""
+        submitted = time.perf_counter()
+        if not self.slots.acquire(timeout=self.timeout):
+            raise PasswordHashingUnavailable()
+
+        timings = {}
+
+        def task():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                timings['queue'] = started - submitted
+                timings['hashing'] = time.perf_counter() - started
+
+        try:
+            return self.executor.submit(task).result()
+        finally:
+            self.slots.release()
+            if metrics is not None:
+                metrics.hashing_queue_time += timings.get('queue', time.perf_counter() - submitted) * 1000
+                metrics.hashing_time += timings.get('hashing', 0) * 1000
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """Return the process' hashing pool, created from the settings."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PasswordHashingPool(
+                    workers=settings.PASSWORD_HASHING_WORKERS,
+                    queue_size=settings.PASSWORD_HASHING_QUEUE_SIZE,
+                    timeout=settings.PASSWORD_HASHING_TIMEOUT,
+                )
+    return _pool
+
+
+def hash_password(password, metrics=None):
+    """Hash a password in the hashing pool."""
+    return get_hashing_pool().run(make_password, password, metrics=metrics)
+
+
+def verify_password(user, password, metrics=None):
+    """Check the user's password in the hashing pool.
+
+    Passwords hashed with outdated parameters or hashers are rehashed
+    and saved. Only the hashing happens in the pool, queries stay in
+    the calling thread."""
+    outdated = []
+    valid = get_hashing_pool().run(check_password, password, user.password, outdated.append, metrics=metrics)
+    if valid and outdated:
+        user.password = hash_password(password, metrics)
+        user.save(update_fields=['password'])
+    return valid
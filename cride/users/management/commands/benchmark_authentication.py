@@ -0,0 +1,80 @@
+"""Benchmark authentication command."""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+# DRF
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+# Authentication
+from cride.users.authentication import CachedTokenAuthentication, JWTAuthentication, invalidate_user
+from cride.users.tokens import gen_token_pair
+
+# Metrics
+from cride.utils.metrics import RequestMetrics
+
+# Models
+from cride.users.models import User, Profile
+
+# Utilities
+import time
+import statistics
+
+
+class Command(BaseCommand):
+    """Compare the cost of authenticating a request.
+
+    The user is created inside a transaction that is rolled back at the
+    end, so the database is left untouched.
+    """
+
+    help = 'Compare TokenAuthentication, CachedTokenAuthentication and JWTAuthentication.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create(
+                email='authentication@benchmark.cride',
+                username='benchmark-authentication',
+                is_verified=True,
+            )
+            Profile.objects.create(user=user)
+            token = Token.objects.create(user=user)
+            access_token = gen_token_pair(user)['access_token']
+
+            for authentication, header in (
+                    (TokenAuthentication(), f'Token {token.key}'),
+                    (CachedTokenAuthentication(), f'Token {token.key}'),
+                    (JWTAuthentication(), f'Bearer {access_token}')):
+                elapsed, queries = self.measure(authentication, header, options['requests'], options['repeat'])
+                self.stdout.write(
+                    f'{type(authentication).__name__:<26} {elapsed:>8.1f} us/request  '
+                    f'{queries:.1f} queries/request'
+                )
+
+            invalidate_user(user.pk)
+            transaction.set_rollback(True)
+
+    def measure(self, authentication, header, requests, repeat):
+        """Return the median time in us and the queries to authenticate a request.
+
+        Requests access the user's profile, as most views do."""
+        factory = APIRequestFactory()
+        metrics = RequestMetrics()
+        timings = []
+        for _ in range(repeat):
+            batch = [Request(factory.get('/', HTTP_AUTHORIZATION=header)) for _ in range(requests)]
+            with connection.execute_wrapper(metrics):
+                start = time.perf_counter()
+                for request in batch:
+                    user, auth = authentication.authenticate(request)
+                    user.profile
+                timings.append((time.perf_counter() - start) * 1e6 / requests)
+        return statistics.median(timings), metrics.queries / (requests * repeat)
@@ -0,0 +1,23 @@
+# Generated by Django 3.1.1 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_auto_20210426_1848'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='ratings_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of ratings received as driver, used to average the reputation.'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='ratings_sum',
+            field=models.PositiveIntegerField(default=0, help_text='Sum of the ratings received as driver, used to average the reputation.'),
+        ),
+    ]
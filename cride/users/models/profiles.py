@@ -6,6 +6,9 @@ from django.db import models
 # Utilities
 from cride.utils.models import CRideModel
 
+# Authentication
+from cride.users.authentication import invalidate_user
+
 class Profile(CRideModel):
     """Profile model.
 
@@ -38,7 +41,25 @@ class Profile(CRideModel):
         default=5.0,
         help_text="User's reputation based on the rides taken and offered."
     )
+    ratings_sum = models.PositiveIntegerField(
+        default=0,
+        help_text='Sum of the ratings received as driver, used to average the reputation.'
+    )
+    ratings_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Number of ratings received as driver, used to average the reputation.'
+    )
 
     def __str__(self):
         """Return user's string representation."""
-        return str(self.user)
\ No newline at end of file
+        return str(self.user)
+
+    def save(self, *args, **kwargs):
+        """Invalidate the cached user."""
+        super(Profile, self).save(*args, **kwargs)
+        invalidate_user(self.user_id)
+
+    def delete(self, *args, **kwargs):
+        """Invalidate the cached user."""
+        invalidate_user(self.user_id)
+        return super(Profile, self).delete(*args, **kwargs)
\ No newline at end of file
@@ -9,6 +9,10 @@ from django.core.validators import RegexValidator
 # Utilities
 from cride.utils.models import CRideModel
 
+# Authentication
+from cride.users.authentication import invalidate_user
+from cride.users.tokens import revoke_user
+
 
 class User(CRideModel, AbstractUser):
     """User model.
@@ -59,6 +63,21 @@ class User(CRideModel, AbstractUser):
         """Return username."""
         return self.username
 
+    def save(self, *args, **kwargs):
+        """Invalidate the cached user, revoke its tokens on password changes."""
+        adding = self._state.adding
+        password_changed = self._password is not None
+        super(User, self).save(*args, **kwargs)
+        if not adding:
+            invalidate_user(self.pk)
+            if password_changed:
+                revoke_user(self.pk)
+
+    def delete(self, *args, **kwargs):
+        """Invalidate the cached user."""
+        invalidate_user(self.pk)
+        return super(User, self).delete(*args, **kwargs)
+
     def get_short_name(self):
         """Return username."""
         return self.username
\ No newline at end of file
@@ -22,4 +22,14 @@ class ProfileModelSerializer(serializers.ModelSerializer):
             'rides_taken',
             'rides_offered',
             'reputation',
-        )
\ No newline at end of file
+        )
+
+    def update(self, instance, data):
+        """Save only the updated fields.
+
+        The instance might come from the authentication cache, saving it
+        whole would overwrite its counters with stale values."""
+        for attr, value in data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*data, 'modified'])
+        return instance
\ No newline at end of file
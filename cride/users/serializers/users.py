@@ -11,20 +11,26 @@ from django.conf import settings
 from django.core.validators import RegexValidator
 from django.core.mail import EmailMultiAlternatives
 from django.contrib.auth import authenticate, password_validation
+from django.db import transaction
 
 # Django REST Framework
 from rest_framework import serializers
-from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.validators import UniqueValidator
 
+# Tokens
+from cride.users.authentication import get_user
+from cride.users.tokens import decode_token, gen_token, gen_token_pair, is_revoked
+
 # Tasks
-from cride.taskapp.tasks import send_confirmation_email
+from cride.taskapp.tasks import enqueue_confirmation_email
 
 # models
 from cride.users.models import User, Profile
 
 # serializers
 from cride.users.serializers.profiles import ProfileModelSerializer
+from cride.utils.serializers import EagerLoadingMixin
 
 class AccountVerificationSerializer(serializers.Serializer):
     """Account verification serializer."""
@@ -54,11 +60,13 @@ class AccountVerificationSerializer(serializers.Serializer):
         user.is_verified = True
         user.save()
 
-class UserModelSerializer(serializers.ModelSerializer):
+class UserModelSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """User model serializer."""
 
     profile = ProfileModelSerializer(read_only=True)
-    
+
+    select_related_fields = ('profile',)
+
     class Meta:
         """Meta class."""
         model = User
@@ -84,7 +92,7 @@ class UserLoginSerializer(serializers.Serializer):
 
     def validate(self, data):
         """Verify credentials."""
-        user = authenticate(username=data['email'], password=data['password'])
+        user = authenticate(self.context.get('request'), username=data['email'], password=data['password'])
         if not user:
             raise serializers.ValidationError("Invalid credentials.")
         if not user.is_verified:
@@ -93,9 +101,41 @@ class UserLoginSerializer(serializers.Serializer):
         return data
 
     def create(self, data):
-        """Generate or retrieve new token."""
-        token, created = Token.objects.get_or_create(user=self.context['user'])
-        return (self.context['user'], token.key)
+        """Generate the access and refresh tokens of a new session."""
+        return (self.context['user'], gen_token_pair(self.context['user']))
+
+class RefreshTokenSerializer(serializers.Serializer):
+    """Refresh token serializer.
+
+    Trade a refresh token for a new access token of the same session."""
+
+    refresh_token = serializers.CharField()
+
+    def validate_refresh_token(self, data):
+        """Verify token is valid and not revoked."""
+        try:
+            payload = decode_token(data, 'refresh')
+        except jwt.ExpiredSignatureError:
+            raise serializers.ValidationError("Session has expired.")
+        except jwt.PyJWTError:
+            raise serializers.ValidationError("Invalid token.")
+
+        if is_revoked(payload):
+            raise serializers.ValidationError("Session has been revoked.")
+
+        self.context['payload'] = payload
+        return data
+
+    def create(self, data):
+        """Generate a new access token."""
+        payload = self.context['payload']
+        try:
+            user = get_user(payload['user'])
+        except AuthenticationFailed:
+            raise serializers.ValidationError("Account is not active.")
+        if not user.is_active:
+            raise serializers.ValidationError("Account is not active.")
+        return gen_token(user, 'access', payload['sid'])
 
 class UserSignUpSerializer(serializers.Serializer):
     """Users sign-up serializer.
@@ -156,7 +196,7 @@ class UserSignUpSerializer(serializers.Serializer):
 
         Profile.objects.create(user=user)
 
-        # send email
-        send_confirmation_email.delay(user_pk=user.pk)
+        # send email once the user is committed
+        transaction.on_commit(lambda: enqueue_confirmation_email(user.pk))
 
         return user
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""Authentication tests."""
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Authentication
+from cride.users.authentication import CachedTokenAuthentication
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+
+
+class CachedTokenAuthenticationTestCase(APITestCase):
+    """Cached token authentication test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password='admin123',
+        )
+        self.profile = Profile.objects.create(user=self.user, biography='Hola')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.url = f'/users/{self.user.username}/'
+        self.key = CachedTokenAuthentication.cache_key(self.token.key)
+
+    def get_queries(self, url):
+        """Return the SQL run by a request."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [query['sql'] for query in context.captured_queries]
+
+    def test_cached(self):
+        """Tokens resolve to users and profiles from the cache."""
+        queries = self.get_queries(self.url)
+        self.assertTrue(any('authtoken_token' in sql for sql in queries))
+
+        queries = self.get_queries(self.url)
+        self.assertFalse(any('authtoken_token' in sql for sql in queries))
+        user, token = cache.get(self.key).user, cache.get(self.key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.profile.biography, 'Hola')
+
+    def test_invalid_token(self):
+        """Unknown tokens are rejected."""
+        self.client.credentials(HTTP_AUTHORIZATION='Token 0123456789abcdef')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_changes(self):
+        """Saving the user drops the cached token."""
+        self.client.get(self.url)
+        self.assertIsNotNone(cache.get(self.key))
+
+        self.user.set_password('unam-ciencias')
+        self.user.save()
+        self.assertIsNone(cache.get(self.key))
+
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_changes(self):
+        """Profile updates drop the cached token and keep counters."""
+        self.client.get(self.url)
+        Profile.objects.filter(pk=self.profile.pk).update(rides_taken=5)
+
+        response = self.client.patch(f'{self.url}profile/', {'biography': 'Adiós'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['profile']['biography'], 'Adiós')
+        self.assertEqual(response.data['profile']['rides_taken'], 5)
+        self.assertEqual(Profile.objects.get(pk=self.profile.pk).rides_taken, 5)
+        self.assertIsNone(cache.get(self.key))
+
+    def test_logout(self):
+        """Logging out revokes the token."""
+        self.client.get(self.url)
+
+        response = self.client.post('/users/logout/')
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
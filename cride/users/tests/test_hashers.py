@@ -0,0 +1,152 @@
+"""Password hashing tests."""
+
+# Django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Hashers
+from cride.users.hashers import PasswordHashingPool, PasswordHashingUnavailable
+
+# Models
+from cride.users.models import User, Profile
+
+# Utilities
+import time
+import threading
+from unittest import mock
+
+
+ARGON2 = ['cride.users.hashers.TunableArgon2PasswordHasher']
+
+
+def throttle_rates(**rates):
+    """Override the throttle rates."""
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates})
+
+
+def wait_until_full(pool):
+    """Wait for the callers started in other threads to take every slot."""
+    deadline = time.monotonic() + 5
+    while pool.slots._value and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+@override_settings(PASSWORD_HASHERS=ARGON2, ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=8, ARGON2_PARALLELISM=1)
+class LoginHashingAPITestCase(APITestCase):
+    """Login password hashing test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        cache.clear()
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password=make_password('unam-ciencias'),
+            is_verified=True,
+        )
+        Profile.objects.create(user=self.user)
+
+    def login(self, email='joe@test-mail.com', password='unam-ciencias'):
+        return self.client.post('/users/login/', {'email': email, 'password': password})
+
+    def test_hasher_settings(self):
+        """Argon2 parameters come from the settings."""
+        self.assertIn('$m=8,t=1,p=1$', self.user.password)
+
+    def test_rehash(self):
+        """Passwords are rehashed on login when the parameters change."""
+        with override_settings(ARGON2_TIME_COST=2):
+            response = self.login()
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            access_token = response.data['access_token']
+
+            self.user.refresh_from_db()
+            self.assertIn('$m=8,t=2,p=1$', self.user.password)
+            self.assertTrue(self.user.check_password('unam-ciencias'))
+
+            password = self.user.password
+            self.login()
+            self.user.refresh_from_db()
+            self.assertEqual(self.user.password, password)
+
+        # Rehashing doesn't revoke sessions
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token}')
+        response = self.client.get(f'/users/{self.user.username}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_metrics(self):
+        """Hashing times are part of the login metrics."""
+        response = self.login()
+        self.assertGreater(response.metrics.hashing_time, 0)
+        self.assertGreaterEqual(response.metrics.hashing_queue_time, 0)
+        self.assertIn('hashing;dur=', response['Server-Timing'])
+
+        response = self.login(email='jane@test-mail.com')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertGreater(response.metrics.hashing_time, 0)
+
+    def test_busy(self):
+        """Logins are turned away while the hashing pool is full."""
+        pool = PasswordHashingPool(workers=1, queue_size=0, timeout=0)
+        release = threading.Event()
+        worker = threading.Thread(target=pool.run, args=(release.wait,))
+        worker.start()
+        wait_until_full(pool)
+        try:
+            with mock.patch('cride.users.hashers._pool', pool):
+                response = self.login()
+        finally:
+            release.set()
+            worker.join()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        with mock.patch('cride.users.hashers._pool', pool):
+            self.assertEqual(self.login().status_code, status.HTTP_201_CREATED)
+
+    @throttle_rates(login_email='2/min')
+    def test_email_throttle(self):
+        """Login attempts are limited per email."""
+        self.assertEqual(self.login(password='wrong-password').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.login().status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.login(email='JOE@test-mail.com').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.login(email='jane@test-mail.com').status_code, status.HTTP_400_BAD_REQUEST)
+
+    @throttle_rates(login='2/min')
+    def test_ip_throttle(self):
+        """Login attempts are limited per client IP."""
+        self.assertEqual(self.login(email='jane@test-mail.com').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.login().status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.login().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self.client.post('/users/login/', {'email': 'joe@test-mail.com'}, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PasswordHashingPoolTestCase(SimpleTestCase):
+    """Password hashing pool test case."""
+
+    def test_queue(self):
+        """Callers wait for a worker within the queue size."""
+        pool = PasswordHashingPool(workers=1, queue_size=1, timeout=0)
+        release = threading.Event()
+        metrics = mock.Mock(hashing_time=0, hashing_queue_time=0)
+
+        first = threading.Thread(target=pool.run, args=(release.wait,))
+        first.start()
+        second = threading.Thread(target=pool.run, args=(len, 'queued'), kwargs={'metrics': metrics})
+        second.start()
+        wait_until_full(pool)
+        with self.assertRaises(PasswordHashingUnavailable):
+            pool.run(len, 'rejected')
+
+        release.set()
+        first.join()
+        second.join()
+        self.assertGreater(metrics.hashing_queue_time, 0)
+        self.assertEqual(pool.run(len, 'accepted'), 8)
@@ -0,0 +1,126 @@
+"""Access tokens tests."""
+
+# Django
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User, Profile
+
+# Utilities
+import io
+from datetime import timedelta
+
+
+class AccessTokensAPITestCase(APITestCase):
+    """Access and refresh tokens test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            is_verified=True,
+        )
+        self.user.set_password('unam-ciencias')
+        self.user.save()
+        Profile.objects.create(user=self.user)
+        self.url = f'/users/{self.user.username}/'
+
+    def login(self):
+        """Log in and return the tokens."""
+        response = self.client.post('/users/login/', {'email': 'joe@test-mail.com', 'password': 'unam-ciencias'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['access_token'], response.data['refresh_token']
+
+    def get(self, access_token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token}')
+        return self.client.get(self.url)
+
+    def refresh(self, refresh_token):
+        self.client.credentials()
+        return self.client.post('/users/refresh/', {'refresh_token': refresh_token})
+
+    def test_authentication(self):
+        """Access tokens authenticate requests without tokens table lookups."""
+        access_token, refresh_token = self.login()
+        self.assertEqual(self.get(access_token).status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.get(access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = [query['sql'] for query in context.captured_queries]
+        self.assertFalse(any('authtoken_token' in sql for sql in queries))
+
+        self.assertEqual(self.get(refresh_token).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.get(access_token[:-2]).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(JWT_ACCESS_TOKEN_LIFETIME=timedelta(seconds=-1))
+    def test_expired(self):
+        """Expired access tokens are rejected and can be refreshed."""
+        access_token, refresh_token = self.login()
+        response = self.get(access_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="api"')
+
+        with override_settings(JWT_ACCESS_TOKEN_LIFETIME=timedelta(minutes=5)):
+            response = self.refresh(refresh_token)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.get(response.data['access_token']).status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.refresh(access_token).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_logout(self):
+        """Logging out revokes the session."""
+        access_token, refresh_token = self.login()
+        other_access_token, _ = self.login()
+        self.get(access_token)
+
+        response = self.client.post('/users/logout/')
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.get(access_token).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh(refresh_token).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get(other_access_token).status_code, status.HTTP_200_OK)
+
+    def test_password_change(self):
+        """Changing the password revokes every session."""
+        access_token, refresh_token = self.login()
+
+        self.user.set_password('unam-derecho')
+        self.user.save()
+
+        self.assertEqual(self.get(access_token).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh(refresh_token).status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post('/users/login/', {'email': 'joe@test-mail.com', 'password': 'unam-derecho'})
+        self.assertEqual(self.get(response.data['access_token']).status_code, status.HTTP_200_OK)
+
+    def test_inactive(self):
+        """Tokens of inactive users are rejected."""
+        access_token, refresh_token = self.login()
+        self.get(access_token)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.get(access_token).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh(refresh_token).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BenchmarkAuthenticationTestCase(TestCase):
+    """Authentication benchmark command test case."""
+
+    def test_benchmark(self):
+        """Every authentication is measured."""
+        out = io.StringIO()
+        call_command('benchmark_authentication', '--requests', '10', '--repeat', '1', stdout=out)
+        for name in ('TokenAuthentication', 'CachedTokenAuthentication', 'JWTAuthentication'):
+            self.assertIn(name, out.getvalue())
+        self.assertFalse(User.objects.exists())
@@ -0,0 +1,191 @@
+"""Users tests."""
+
+# Django
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import transaction
+from django.test import TestCase
+
+# DRF
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+
+# Serializers
+from cride.users.serializers import UserSignUpSerializer
+
+# Tasks
+from cride.taskapp.tasks import (
+    confirmation_emails,
+    enqueue_confirmation_email,
+    send_confirmation_emails,
+)
+
+# Utilities
+from smtplib import SMTPException
+from unittest import mock
+
+
+class UserSignUpAPITestCase(APITransactionTestCase):
+    """Sign up endpoint test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        confirmation_emails.clear()
+
+    def test_confirmation_email_queued(self):
+        """Signing up queues the confirmation instead of sending it."""
+        response = self.client.post('/users/signup/', {
+            'email': 'joe@test-mail.com',
+            'username': 'joedoe',
+            'phone_number': '+5215512345678',
+            'password': 'unam-ciencias',
+            'password_confirmation': 'unam-ciencias',
+            'first_name': 'Joe',
+            'last_name': 'Doe',
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(confirmation_emails), 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_rolled_back_signup(self):
+        """Confirmations are only queued once the user is committed."""
+        serializer = UserSignUpSerializer(data={
+            'email': 'joe@test-mail.com',
+            'username': 'joedoe',
+            'phone_number': '+5215512345678',
+            'password': 'unam-ciencias',
+            'password_confirmation': 'unam-ciencias',
+            'first_name': 'Joe',
+            'last_name': 'Doe',
+        })
+        serializer.is_valid(raise_exception=True)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                serializer.save()
+                raise RuntimeError()
+
+        self.assertFalse(User.objects.filter(username='joedoe').exists())
+        self.assertEqual(len(confirmation_emails), 0)
+
+
+class ConfirmationEmailsTaskTestCase(TestCase):
+    """Batched confirmation emails test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        confirmation_emails.clear()
+        self.users = [
+            User.objects.create(
+                email=f'user{i}@test-mail.com',
+                username=f'user{i}',
+                password='admin123',
+            )
+            for i in range(3)
+        ]
+        for user in self.users:
+            enqueue_confirmation_email(user.pk)
+
+    def assertSentTo(self, users):
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            sorted(user.email for user in users)
+        )
+
+    def test_batch_sent(self):
+        """Queued confirmations are sent and the queue is drained."""
+        with mock.patch('cride.taskapp.tasks.CONFIRMATION_EMAILS_BATCH_SIZE', 2):
+            metrics = send_confirmation_emails()
+
+        self.assertEqual(metrics['sent'], 3)
+        self.assertEqual(metrics['batches'], 2)
+        self.assertEqual(len(confirmation_emails), 0)
+        self.assertSentTo(self.users)
+        for message in mail.outbox:
+            username = message.to[0].split('@')[0]
+            self.assertIn(f'@{username}', message.body)
+
+    def test_failed_send_requeued(self):
+        """Emails not sent are queued again, the ones sent aren't sent twice."""
+        send_messages = EmailBackend.send_messages
+
+        def fail_second(backend, messages):
+            if len(mail.outbox) == 1:
+                raise SMTPException()
+            return send_messages(backend, messages)
+
+        with mock.patch.object(EmailBackend, 'send_messages', fail_second):
+            with self.assertRaises(SMTPException):
+                send_confirmation_emails()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(len(confirmation_emails), 2)
+        self.assertEqual(send_confirmation_emails()['sent'], 2)
+        self.assertSentTo(self.users)
+
+    def test_failure_requeued(self):
+        """Any failure puts the unsent confirmations back in the queue."""
+        with mock.patch('cride.taskapp.tasks.build_confirmation_email', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                send_confirmation_emails()
+
+        self.assertEqual(len(confirmation_emails), 3)
+        self.assertEqual(send_confirmation_emails()['sent'], 3)
+
+    def test_skipped_users(self):
+        """Verified and deleted users are dropped from the queue."""
+        User.objects.filter(pk=self.users[0].pk).update(is_verified=True)
+        self.users[1].delete()
+
+        self.assertEqual(send_confirmation_emails()['sent'], 1)
+        self.assertEqual(len(confirmation_emails), 0)
+        self.assertSentTo(self.users[2:])
+
+
+class UserConditionalGetAPITestCase(APITestCase):
+    """User details conditional requests test case."""
+
+    def setUp(self):
+        """Test initialization."""
+        self.user = User.objects.create(
+            email='joe@test-mail.com',
+            username='joedoe',
+            password='admin123',
+        )
+        self.profile = Profile.objects.create(user=self.user)
+        self.circle = Circle.objects.create(name='Facultad de Ciencias', slug_name='fciencias', about='')
+        self.membership = Membership.objects.create(user=self.user, profile=self.profile, circle=self.circle)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.url = '/users/joedoe/'
+
+    def assertChanged(self, etag):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def test_retrieve(self):
+        """The user, the profile and the circles are validated."""
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data['circles']), 1)
+        etag = response['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.profile.biography = 'Hola'
+        self.profile.save()
+        etag = self.assertChanged(etag)
+
+        self.circle.name = 'Ciencias UNAM'
+        self.circle.save()
+        etag = self.assertChanged(etag)
+
+        self.membership.is_active = False
+        self.membership.save()
+        self.assertChanged(etag)
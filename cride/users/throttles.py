@@ -0,0 +1,42 @@
+"""Users throttles."""
+
+# DRF
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# Utilities
+import hashlib
+
+
+class LoginRateThrottle(SimpleRateThrottle):
+    """Limit login attempts per client IP.
+
+    Rates are read from `DEFAULT_THROTTLE_RATES` on every request, a
+    missing or `None` rate disables the throttle."""
+
+    scope = 'login'
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class LoginEmailRateThrottle(LoginRateThrottle):
+    """Limit login attempts per email, whatever the client IP."""
+
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        email = data.get('email') if hasattr(data, 'get') else None
+        if not isinstance(email, str) or not email:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.sha256(email.strip().lower().encode()).hexdigest(),
+        }
@@ -0,0 +1,95 @@
+"""Access and refresh tokens.
+
+Access tokens are short-lived JWTs checked by their signature alone,
+refresh tokens are longer-lived JWTs trading for new access tokens. Both
+belong to a session, logging out revokes the session and changing the
+password revokes every token issued before, through keys in the cache.
+"""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+
+# Utilities
+import jwt
+import time
+from uuid import uuid4
+
+
+def gen_token(user, token_type, session):
+    """Generate a signed token of the user's session."""
+    if token_type == 'access':
+        lifetime = settings.JWT_ACCESS_TOKEN_LIFETIME
+    else:
+        lifetime = settings.JWT_REFRESH_TOKEN_LIFETIME
+    now = time.time()
+    payload = {
+        'user': user.pk,
+        'sid': session,
+        'iat': now,
+        'exp': int(now + lifetime.total_seconds()),
+        'type': token_type,
+    }
+    token = jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
+
+    # `.decode()` is neccessary for PyJWT version < 2.0.0
+    return token.decode()
+
+
+def gen_token_pair(user):
+    """Return the access and refresh tokens of a new session."""
+    session = uuid4().hex
+    return {
+        'access_token': gen_token(user, 'access', session),
+        'refresh_token': gen_token(user, 'refresh', session),
+    }
+
+
+def decode_token(token, token_type):
+    """Return the payload of a token.
+
+    Raise `jwt.PyJWTError` when the token is invalid, expired or of
+    another type. Revocations are checked apart, see `is_revoked`."""
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
+    if payload.get('type') != token_type:
+        raise jwt.InvalidTokenError('Invalid token type.')
+    return payload
+
+
+def session_key(session):
+    """Return the cache key of a revoked session."""
+    return f'users:tokens:revoked:{session}'
+
+
+def not_before_key(user_id):
+    """Return the cache key of the user's tokens revocation time."""
+    return f'users:tokens:not-before:{user_id}'
+
+
+def revocation_keys(payload):
+    """Return the cache keys revoking a token, to fetch with `get_many`."""
+    return [session_key(payload['sid']), not_before_key(payload['user'])]
+
+
+def is_revoked(payload, revocations=None):
+    """Return whether a token was revoked.
+
+    `revocations` holds the values of its `revocation_keys`, fetched from
+    the cache when not given."""
+    if revocations is None:
+        revocations = cache.get_many(revocation_keys(payload))
+    if revocations.get(session_key(payload['sid'])):
+        return True
+    return payload['iat'] < revocations.get(not_before_key(payload['user']), 0)
+
+
+def revoke_session(payload):
+    """Revoke the tokens of a session."""
+    timeout = settings.JWT_REFRESH_TOKEN_LIFETIME.total_seconds()
+    cache.set(session_key(payload['sid']), True, timeout)
+
+
+def revoke_user(user_id):
+    """Revoke every token issued to the user so far."""
+    timeout = settings.JWT_REFRESH_TOKEN_LIFETIME.total_seconds()
+    cache.set(not_before_key(user_id), time.time(), timeout)
@@ -1,5 +1,8 @@
 """Users views."""
 
+# Django
+from django.db.models import Count, Max
+
 # Django REST Framework
 from rest_framework import status, viewsets, mixins
 from rest_framework.decorators import action
@@ -9,6 +12,7 @@ from rest_framework.permissions import (
     IsAuthenticated,
 )
 from cride.users.permissions import IsAccountOwner
+from cride.users.throttles import LoginEmailRateThrottle, LoginRateThrottle
 
 # serializers
 from cride.circles.serializers import(
@@ -17,16 +21,28 @@ from cride.circles.serializers import(
 from cride.users.serializers import (
     AccountVerificationSerializer,
     UserLoginSerializer,
+    RefreshTokenSerializer,
     UserModelSerializer,
     UserSignUpSerializer,
     ProfileModelSerializer,
 )
 
+# Views
+from cride.utils.views import ConditionalGetMixin, EagerLoadingViewMixin, MetricsMixin
+
+# Authentication
+from rest_framework.authtoken.models import Token
+from cride.users.authentication import CachedTokenAuthentication
+from cride.users.tokens import revoke_session
+
 # models
 from cride.users.models import User
 from cride.circles.models import Circle
 
 class UserViewSet(
+        MetricsMixin,
+        ConditionalGetMixin,
+        EagerLoadingViewMixin,
         mixins.RetrieveModelMixin,
         mixins.UpdateModelMixin,
         viewsets.GenericViewSet
@@ -38,10 +54,11 @@ class UserViewSet(
     queryset = User.objects.filter(is_active=True, is_client=True)
     serializer_class = UserModelSerializer
     lookup_field = 'username'
+    conditional_fields = ('modified', 'profile__modified')
 
     def get_permissions(self):
         """Assign permissions based on action."""
-        if self.action in ['signup', 'login', 'verify']:
+        if self.action in ['signup', 'login', 'refresh', 'verify']:
             permissions = [AllowAny]
         elif self.action in ['retrieve', 'update', 'partial_update', 'profile']:
             permissions = [IsAuthenticated, IsAccountOwner]
@@ -50,6 +67,12 @@ class UserViewSet(
 
         return [permission() for permission in permissions]
 
+    def get_throttles(self):
+        """Limit login attempts per client and per email."""
+        if self.action == 'login':
+            return [LoginRateThrottle(), LoginEmailRateThrottle()]
+        return super(UserViewSet, self).get_throttles()
+
     @action(detail=False, methods=['post'])
     def signup(self, request):
         """Users signup."""
@@ -65,15 +88,34 @@ class UserViewSet(
     def login(self, request):
         """Users login."""
 
-        serializer = UserLoginSerializer(data=request.data)
+        serializer = UserLoginSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
-        user, token = serializer.save()
+        user, tokens = serializer.save()
         data = {
             'user': UserModelSerializer(user).data,
-            'access_token': token,
+            **tokens,
         }
         return Response(data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['post'])
+    def refresh(self, request):
+        """Trade a refresh token for a new access token."""
+        serializer = RefreshTokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = {'access_token': serializer.save()}
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def logout(self, request):
+        """Users logout, revokes the session or the token."""
+        if isinstance(request.auth, Token):
+            key = request.auth.key
+            request.auth.delete()
+            CachedTokenAuthentication.invalidate(key)
+        else:
+            revoke_session(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @action(detail=False, methods=['post'])
     def verify(self, request):
         """Accounts verification."""
@@ -100,16 +142,32 @@ class UserViewSet(
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        profile.refresh_from_db()
         data = UserModelSerializer(user).data
         return Response(data)
 
+    def get_user_circles(self):
+        """Return the circles the requesting user is an active member of."""
+        return Circle.objects.filter(
+            members=self.request.user,
+            membership__is_active=True,
+        )
+
+    def get_conditional_state(self, instance):
+        """Also validate the user's circles."""
+        circles = self.get_user_circles().order_by().aggregate(
+            modified=Max('modified'),
+            membership_modified=Max('membership__modified'),
+            count=Count('pk'),
+        )
+        return [circles['modified'], circles['membership_modified'], circles['count']]
+
     def retrieve(self, request, *args, **kwargs):
         """Extra data to the response."""
         response = super(UserViewSet, self).retrieve(request, *args, **kwargs)
-        circles = Circle.objects.filter(
-            members=request.user,
-            membership__is_active=True,
-        )
+        if response.status_code == status.HTTP_304_NOT_MODIFIED:
+            return response
+        circles = self.get_user_circles()
         data = {
             'user': response.data,
             'circles': CircleModelSerializer(circles, many=True).data
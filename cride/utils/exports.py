@@ -0,0 +1,51 @@
+"""Export utilities."""
+
+# Django
+from django.http import StreamingHttpResponse
+
+# Utilities
+import csv
+import zlib
+
+
+class Echo:
+    """File-like object returning what is written to it.
+
+    Lets `csv.writer` format a single row without buffering the output."""
+
+    def write(self, value):
+        return value
+
+
+def csv_rows(header, rows):
+    """Yield the header and every row as CSV encoded lines."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def gzip_chunks(chunks, level=6):
+    """Compress string chunks into a gzip stream."""
+    # wbits=31 writes the gzip header and trailer
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_csv(filename, header, rows, compress=False):
+    """Return a streaming CSV attachment response.
+
+    `rows` is consumed lazily, pass an iterator to keep memory usage
+    constant regardless of the number of rows."""
+    chunks = csv_rows(header, rows)
+    if compress:
+        response = StreamingHttpResponse(gzip_chunks(chunks), content_type='application/gzip')
+        filename = f'{filename}.gz'
+    else:
+        response = StreamingHttpResponse(chunks, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
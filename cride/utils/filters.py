@@ -0,0 +1,62 @@
+"""Filter utilities."""
+
+# Django
+from django.db.models import CharField, TextField
+from django.db.models.lookups import IContains, Lookup
+
+# DRF
+from rest_framework.filters import SearchFilter
+
+
+_trigram_support = {}
+
+
+def has_trigram(connection):
+    """Return whether the database has the pg_trgm extension installed."""
+    if connection.vendor != 'postgresql':
+        return False
+    key = (connection.alias, connection.settings_dict['NAME'])
+    if key not in _trigram_support:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_support[key] = cursor.fetchone() is not None
+    return _trigram_support[key]
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class TrigramSearch(Lookup):
+    """Case-insensitive containment that tolerates typos.
+
+    On PostgreSQL with pg_trgm, values are also matched by trigram
+    similarity. Both conditions compare `UPPER(column::text)`, which is
+    the expression of the trigram GIN indexes, so they are answered by
+    the index instead of scanning the table. Elsewhere it behaves like
+    `icontains`."""
+
+    lookup_name = 'trigram_search'
+
+    def as_sql(self, compiler, connection):
+        return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        contains = IContains(self.lhs, self.rhs)
+        sql, params = contains.as_sql(compiler, connection)
+        if not has_trigram(connection) or not self.rhs_is_direct_value():
+            return sql, params
+        # UPPER(column::text), as in the LIKE condition
+        lhs_sql, lhs_params = contains.process_lhs(compiler, connection)
+        return f'({sql} OR {lhs_sql} %% UPPER(%s))', [*params, *lhs_params, self.rhs]
+
+
+class TrigramSearchFilter(SearchFilter):
+    """Search filter backed by trigram indexes.
+
+    Plain search fields use the `trigram_search` lookup, prefixed fields
+    (`^`, `=`, `@`, `$`) keep DRF's behavior. Columns should have a
+    trigram GIN index on `UPPER(column::text)` to avoid table scans."""
+
+    def construct_search(self, field_name):
+        if field_name[0] in self.lookup_prefixes:
+            return super(TrigramSearchFilter, self).construct_search(field_name)
+        return f'{field_name}__trigram_search'
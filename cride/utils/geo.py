@@ -0,0 +1,114 @@
+"""Geographic utilities."""
+
+# Utilities
+import math
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Return the geohash of a point.
+
+    Points sharing a geohash prefix lie in the same cell of a grid, the
+    longer the prefix the smaller the cell."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    value = 0
+    even = True
+    while len(geohash) < precision:
+        if even:
+            interval, coordinate = lon_range, longitude
+        else:
+            interval, coordinate = lat_range, latitude
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            geohash.append(GEOHASH_ALPHABET[value])
+            bits = value = 0
+    return ''.join(geohash)
+
+
+def geohash_cell_size(precision):
+    """Return the height and width in degrees of a geohash cell."""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def bounding_box(latitude, longitude, radius):
+    """Return the (min lat, max lat, min lon, max lon) around a point.
+
+    The box holds every point within `radius` km, longitudes are not
+    wrapped around the antimeridian."""
+    delta_lat = math.degrees(radius / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat * 180 <= delta_lat:
+        delta_lon = 180.0
+    else:
+        delta_lon = min(math.degrees(radius / (EARTH_RADIUS_KM * cos_lat)), 180.0)
+    return (
+        max(latitude - delta_lat, -90.0),
+        min(latitude + delta_lat, 90.0),
+        max(longitude - delta_lon, -180.0),
+        min(longitude + delta_lon, 180.0),
+    )
+
+
+def geohash_cover(box, max_cells=16):
+    """Return the smallest set of geohash prefixes covering a box.
+
+    Uses the longest prefixes needing no more than `max_cells` cells."""
+    min_lat, max_lat, min_lon, max_lon = box
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = geohash_cell_size(precision)
+        rows = math.floor(max_lat / height) - math.floor(min_lat / height) + 1
+        columns = math.floor(max_lon / width) - math.floor(min_lon / width) + 1
+        if rows * columns <= max_cells:
+            break
+
+    cells = set()
+    for row in range(rows):
+        latitude = min(min_lat + row * height, max_lat)
+        for column in range(columns):
+            longitude = min(min_lon + column * width, max_lon)
+            cells.add(encode_geohash(latitude, longitude, precision))
+        cells.add(encode_geohash(latitude, max_lon, precision))
+    for column in range(columns):
+        cells.add(encode_geohash(max_lat, min(min_lon + column * width, max_lon), precision))
+    cells.add(encode_geohash(max_lat, max_lon, precision))
+    return cells
+
+
+def geohash_range(prefix):
+    """Return the bounds of the geohashes starting with a prefix.
+
+    Geohashes `g` starting with it satisfy `lower <= g < upper`, which
+    any B-tree index answers, `upper` is None when unbounded."""
+    head = prefix.rstrip(GEOHASH_ALPHABET[-1])
+    if not head:
+        return prefix, None
+    following = GEOHASH_ALPHABET[GEOHASH_ALPHABET.index(head[-1]) + 1]
+    return prefix, head[:-1] + following
+
+
+def haversine(latitude, longitude, other_latitude, other_longitude):
+    """Return the great-circle distance in km between two points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (latitude, longitude, other_latitude, other_longitude))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
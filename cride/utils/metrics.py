@@ -0,0 +1,147 @@
+"""Request metrics."""
+
+# Django
+from django.conf import settings
+from django.db import connections
+
+# Utilities
+import json
+import time
+import logging
+from contextlib import ExitStack
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetrics:
+    """Queries and timings of a request.
+
+    Times are in milliseconds. The serializer time is part of the view
+    time, which is part of the total time. Password hashing time and the
+    time spent waiting for a hashing worker are recorded apart, see
+    `cride.users.hashers`. Listings served by `CachedListMixin` record
+    whether they were a cache `hit`, a `miss` or had to `wait` for
+    another request to fill the cache."""
+
+    __slots__ = (
+        'queries', 'sql_time', 'serializer_time', 'view_time', 'total_time',
+        'hashing_time', 'hashing_queue_time', 'list_cache', '_start',
+    )
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.view_time = 0.0
+        self.total_time = 0.0
+        self.hashing_time = 0.0
+        self.hashing_queue_time = 0.0
+        self.list_cache = None
+        self._start = time.perf_counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count and time a query, used as a database execute wrapper."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += (time.perf_counter() - start) * 1000
+
+    def finish(self):
+        """Stop the request clock."""
+        self.total_time = (time.perf_counter() - self._start) * 1000
+
+    def as_dict(self):
+        values = {
+            'queries': self.queries,
+            'sql_ms': round(self.sql_time, 2),
+            'serializer_ms': round(self.serializer_time, 2),
+            'view_ms': round(self.view_time, 2),
+            'total_ms': round(self.total_time, 2),
+            'hashing_ms': round(self.hashing_time, 2),
+            'hashing_queue_ms': round(self.hashing_queue_time, 2),
+        }
+        if self.list_cache is not None:
+            values['list_cache'] = self.list_cache
+        return values
+
+    def server_timing(self):
+        """Return the metrics as a `Server-Timing` header value."""
+        timings = [
+            f'db;dur={self.sql_time:.2f};desc="{self.queries} queries"',
+            f'serializer;dur={self.serializer_time:.2f}',
+            f'view;dur={self.view_time:.2f}',
+            f'total;dur={self.total_time:.2f}',
+        ]
+        if self.hashing_time:
+            timings += [
+                f'hashing;dur={self.hashing_time:.2f}',
+                f'hashing-queue;dur={self.hashing_queue_time:.2f}',
+            ]
+        if self.list_cache is not None:
+            timings.append(f'cache;desc="{self.list_cache}"')
+        return ', '.join(timings)
+
+    def exceeded(self, budget):
+        """Return the budget limits the request went over."""
+        values = self.as_dict()
+        return {
+            name: (values[name], limit)
+            for name, limit in budget.items()
+            if name in values and values[name] > limit
+        }
+
+
+def get_budget(view_name):
+    """Return the budget of a view, falling back to the default one."""
+    budgets = getattr(settings, 'REQUEST_METRICS_BUDGETS', {})
+    budget = dict(budgets.get('default', {}))
+    budget.update(budgets.get(view_name, {}))
+    return budget
+
+
+class RequestMetricsMiddleware:
+    """Record the queries and timings of every request.
+
+    Metrics are available as `request.metrics` while the request is
+    handled and as `response.metrics` afterwards, sent in a
+    `Server-Timing` header when `REQUEST_METRICS_HEADER` is set, and
+    logged as a JSON line. Requests going over their budget in
+    `REQUEST_METRICS_BUDGETS`, keyed by namespaced URL name, are logged as
+    warnings. Queries run while a streaming response is consumed are
+    not counted."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request.metrics = RequestMetrics()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+        metrics.finish()
+
+        response.metrics = metrics
+        if getattr(settings, 'REQUEST_METRICS_HEADER', False):
+            response['Server-Timing'] = metrics.server_timing()
+
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            **metrics.as_dict(),
+        }
+        exceeded = metrics.exceeded(get_budget(view_name))
+        if exceeded:
+            record['exceeded'] = list(exceeded)
+            logger.warning(json.dumps(record))
+        elif logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(record))
+
+        return response
@@ -0,0 +1,164 @@
+"""Pagination utilities."""
+
+# Django
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.encoding import force_str
+
+# DRF
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+# Utilities
+import json
+from base64 import b64decode, b64encode
+from types import SimpleNamespace
+from binascii import Error as BinasciiError
+
+
+class KeysetPagination(CursorPagination):
+    """Keyset pagination.
+
+    Page through the queryset by filtering on the last seen values of
+    every ordering field instead of counting rows and skipping them with
+    OFFSET, so reaching page 1000 costs the same as reaching page 1.
+
+    Unlike DRF's `CursorPagination`, which only keys on the first ordering
+    field, the cursor holds the whole ordering, which is always completed
+    with the primary key, so pages stay stable when values repeat. Ordering
+    fields must be non-null columns of the paginated model. Views opt in
+    by setting it as their `pagination_class`, the view's `ordering` (or
+    the OrderingFilter's) is used as the key.
+    """
+
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, request, queryset, view):
+        """Return the requested ordering completed with the primary key."""
+        ordering = super(KeysetPagination, self).get_ordering(request, queryset, view)
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            ordering += ('pk',)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the page that follows (or precedes) the cursor."""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+
+        self.cursor = self.decode_cursor(request)
+        position, reverse = self.cursor if self.cursor else (None, False)
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_keyset_filter(self, ordering, position):
+        """Return a filter matching rows placed after `position`.
+
+        Expands to `(a > x) OR (a = x AND b > y) OR ...` honoring each
+        field's direction."""
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equals = {
+                previous.lstrip('-'): value
+                for previous, value in zip(ordering[:index], position)
+            }
+            condition |= Q(**equals, **{f'{name}__{lookup}': position[index]})
+        return condition
+
+    def get_next_link(self):
+        """Return the next page url, keyed on the page's last item."""
+        if not self.has_next:
+            return None
+        return self.encode_cursor((self.get_position(self.page[-1]), False))
+
+    def get_previous_link(self):
+        """Return the previous page url, keyed on the page's first item."""
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Went past the last item, go back from the cursor position
+            return self.encode_cursor((self.cursor[0], True))
+        return self.encode_cursor((self.get_position(self.page[0]), True))
+
+    def get_position(self, instance):
+        """Return the values of the ordering fields for `instance`.
+
+        `.values()` rows holding the ordering fields are accepted too."""
+        if isinstance(instance, dict):
+            instance = SimpleNamespace(**{
+                self.get_field(field).attname: instance[field.lstrip('-')]
+                for field in self.ordering
+            })
+        return [
+            self.get_field(field).value_to_string(instance)
+            for field in self.ordering
+        ]
+
+    def get_field(self, field):
+        """Return the model field behind an ordering field."""
+        name = field.lstrip('-')
+        if name == 'pk':
+            return self.model._meta.pk
+        return self.model._meta.get_field(name)
+
+    def decode_cursor(self, request):
+        """Return the `(position, reverse)` pair of the request's cursor."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')).decode('ascii'))
+            position, reverse = cursor['p'], bool(cursor['r'])
+            if len(position) != len(self.ordering):
+                raise ValueError('Cursor does not match the ordering.')
+            position = [
+                self.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, KeyError, BinasciiError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, cursor):
+        """Return the url pointing to the `(position, reverse)` cursor."""
+        position, reverse = cursor
+        data = json.dumps({'p': [force_str(value) for value in position], 'r': int(reverse)})
+        encoded = b64encode(data.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+def _reverse_ordering(ordering):
+    """Flip the direction of every ordering field."""
+    return tuple(
+        field[1:] if field.startswith('-') else f'-{field}'
+        for field in ordering
+    )
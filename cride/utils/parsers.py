@@ -0,0 +1,21 @@
+"""Parsers utilities."""
+
+# DRF
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+# Utilities
+import orjson
+
+
+class ORJSONParser(JSONParser):
+    """JSON parser built on orjson.
+
+    Drop-in replacement of DRF's `JSONParser`, bodies must be UTF-8."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the incoming bytestream as JSON."""
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
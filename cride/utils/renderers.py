@@ -0,0 +1,51 @@
+"""Renderers utilities."""
+
+# Django
+from django.db.models.fields.files import FieldFile
+
+# DRF
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Utilities
+import orjson
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer built on orjson.
+
+    Drop-in replacement of DRF's `JSONRenderer`: types orjson doesn't
+    know, datetimes included, are converted by DRF's encoder so the
+    output is the same. Data orjson refuses, like integers over 64 bits,
+    is rendered by `JSONRenderer` instead."""
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    encoder = JSONEncoder()
+
+    @classmethod
+    def default(cls, obj):
+        """Convert the objects orjson can't serialize."""
+        if isinstance(obj, FieldFile):
+            return obj.url if obj else None
+        return cls.encoder.default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON, returning a bytestring."""
+        if data is None:
+            return b''
+
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=options)
+        except orjson.JSONEncodeError:
+            return super(ORJSONRenderer, self).render(data, accepted_media_type, renderer_context)
+
+        # Escape \u2028 and \u2029 as JSONRenderer does, keeping the
+        # output a strict javascript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,206 @@
+"""Serializers utilities."""
+
+# Django
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+
+# DRF
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+# Utilities
+import copy
+import threading
+from operator import attrgetter, itemgetter
+
+
+class EagerLoadingMixin:
+    """Declare the relations a serializer traverses.
+
+    Model serializers that nest other serializers or related fields list
+    the lookups they need in `select_related_fields` and
+    `prefetch_related_fields`, views then call `setup_eager_loading`
+    on their querysets so a listing runs in a constant number of queries
+    regardless of its size.
+    """
+
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Return the queryset with the serializer relations preloaded."""
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
+
+class _Root:
+    """Stand-in root serializer carrying a context for bound fields."""
+
+    parent = None
+
+    def __init__(self, context):
+        self._context = context
+
+
+class CompiledRepresentation:
+    """Read-only representation of a serializer, compiled once per class.
+
+    A serializer walks its fields for every item, resolving sources and
+    guarding against skipped fields. The compiled representation does
+    that walk once: plain model fields become attribute getters and
+    builtin conversions, anything else keeps the field's own
+    `get_attribute` and `to_representation`, so the output is the same.
+
+    Serializers made only of plain model fields can also represent
+    `.values()` rows, `values_fields` then lists the values to fetch.
+    """
+
+    # Fields whose `to_representation` matches a builtin on model values
+    converters = (
+        (serializers.CharField, str),
+        (serializers.IntegerField, int),
+        (serializers.FloatField, float),
+        (serializers.BooleanField, bool),
+    )
+
+    _compiled = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def for_serializer(cls, serializer_class):
+        """Return the compiled representation of a serializer class.
+
+        Return None for serializers that can't be compiled, those with a
+        custom `to_representation` or a `SerializerMethodField`."""
+        try:
+            return cls._compiled[serializer_class]
+        except KeyError:
+            pass
+        try:
+            compiled = cls(serializer_class())
+        except TypeError:
+            compiled = None
+        with cls._lock:
+            return cls._compiled.setdefault(serializer_class, compiled)
+
+    def __init__(self, serializer):
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            raise TypeError(f'{type(serializer).__name__} has a custom representation.')
+
+        model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+        self.steps = []
+        values_fields = []
+        for field in serializer._readable_fields:
+            if isinstance(field, serializers.SerializerMethodField):
+                raise TypeError(f'{field.field_name} is a method field.')
+
+            if isinstance(field, serializers.ListSerializer):
+                if type(field).to_representation is not serializers.ListSerializer.to_representation:
+                    raise TypeError(f'{type(field).__name__} has a custom representation.')
+                self.steps.append((field.field_name, 'many', field, CompiledRepresentation(field.child)))
+                values_fields = None
+            elif isinstance(field, serializers.BaseSerializer):
+                self.steps.append((field.field_name, 'nested', field, CompiledRepresentation(field)))
+                values_fields = None
+            else:
+                model_field = self.get_model_field(model, field)
+                self.steps.append((field.field_name, 'field', field, model_field))
+                if model_field is None:
+                    values_fields = None
+                elif values_fields is not None:
+                    values_fields.append(model_field.name)
+
+        self.values_fields = values_fields
+
+    @staticmethod
+    def get_model_field(model, field):
+        """Return the concrete, non relational model field behind a field."""
+        if model is None or len(field.source_attrs) != 1 or isinstance(
+                field, (serializers.RelatedField, serializers.ManyRelatedField)):
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.is_relation or model_field.attname != field.source:
+            return None
+        return model_field
+
+    def bind(self, context, rows=False):
+        """Return a function representing one instance, or `.values()` row.
+
+        Fields are bound to `context` as they would be to the serializer's."""
+        root = _Root(context)
+        steps = []
+        for name, kind, field, target in self.steps:
+            if kind == 'many':
+                child = target.bind(context)
+                steps.append((name, field.get_attribute, _many(child)))
+            elif kind == 'nested':
+                steps.append((name, field.get_attribute, target.bind(context)))
+            elif target is None:
+                bound = copy.copy(field)
+                bound.parent = root
+                steps.append((name, _generic_getter(bound), bound.to_representation))
+            else:
+                steps.append((name, self.get_getter(target, rows), self.get_converter(field, target, root)))
+
+        def represent(instance):
+            ret = {}
+            for name, get, convert in steps:
+                try:
+                    value = get(instance)
+                except SkipField:
+                    continue
+                ret[name] = None if value is None else convert(value)
+            return ret
+
+        return represent
+
+    def get_getter(self, model_field, rows):
+        """Return the getter of a model field's value."""
+        if not rows:
+            return attrgetter(model_field.attname)
+        if isinstance(model_field, models.FileField):
+            # Rows hold the file names, fields expect files
+            key = model_field.attname
+            return lambda row: model_field.attr_class(None, model_field, row[key])
+        return itemgetter(model_field.attname)
+
+    def get_converter(self, field, model_field, root):
+        """Return the function converting a model field's value."""
+        if not isinstance(model_field, models.FileField):
+            for field_class, converter in self.converters:
+                if type(field).to_representation is field_class.to_representation:
+                    return converter
+        bound = copy.copy(field)
+        bound.parent = root
+        return bound.to_representation
+
+    def represent_many(self, items, context, rows=False):
+        """Return the representation of every instance, or row."""
+        represent = self.bind(context, rows=rows)
+        return [represent(item) for item in items]
+
+
+def _many(represent):
+    """Wrap a representation for many related objects."""
+    def represent_many(data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        return [represent(item) for item in iterable]
+    return represent_many
+
+
+def _generic_getter(field):
+    """Return a getter through the field's own `get_attribute`."""
+    def get(instance):
+        value = field.get_attribute(instance)
+        if isinstance(value, PKOnlyObject) and value.pk is None:
+            return None
+        return value
+    return get
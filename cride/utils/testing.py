@@ -0,0 +1,73 @@
+"""Testing utilities."""
+
+# DRF
+from rest_framework.authtoken.models import Token
+
+# Metrics
+from cride.utils.metrics import get_budget
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership
+
+
+class RequestMetricsAssertionsMixin:
+    """Assertions over the metrics of `RequestMetricsMiddleware`.
+
+    Mix into test cases issuing requests through the test client."""
+
+    def assertQueriesAtMost(self, response, queries):
+        """Assert the request executed no more than `queries` queries."""
+        executed = response.metrics.queries
+        self.assertLessEqual(
+            executed,
+            queries,
+            f'{executed} queries executed, at most {queries} expected',
+        )
+
+    def assertWithinBudget(self, response, timings=False):
+        """Assert the request stayed within its view's budget.
+
+        Only the query count is checked unless `timings` is set, since
+        timings depend on the machine running the tests."""
+        budget = get_budget(response.wsgi_request.resolver_match.view_name)
+        if not timings:
+            budget = {name: limit for name, limit in budget.items() if name == 'queries'}
+        exceeded = response.metrics.exceeded(budget)
+        self.assertFalse(exceeded, f'Budget exceeded (value, limit): {exceeded}')
+
+
+class CircleMembersMixin:
+    """Create circles and their members.
+
+    Mix into test cases, members join `self.circle` unless told
+    otherwise."""
+
+    def create_circle(self, **kwargs):
+        """Create a circle, the Facultad de Ciencias one by default."""
+        data = {
+            'name': 'Facultad de Ciencias',
+            'slug_name': 'fciencias',
+            'about': 'UNAM Facultad de Ciencias',
+        }
+        data.update(kwargs)
+        return Circle.objects.create(**data)
+
+    def create_member(self, username, circle=None, **kwargs):
+        """Create a user with a profile and an active membership.
+
+        Extra keyword arguments are passed to the membership."""
+        user = User.objects.create(
+            first_name='Joe',
+            last_name='Doe',
+            email=f'{username}@test-mail.com',
+            username=username,
+            password='admin123',
+        )
+        profile = Profile.objects.create(user=user)
+        Membership.objects.create(user=user, profile=profile, circle=circle or self.circle, **kwargs)
+        return user
+
+    def authenticate(self, user):
+        """Send the user's token with the client's requests."""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
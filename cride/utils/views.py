@@ -1,12 +1,319 @@
 """Rides mixins."""
 
+# Django
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+# Utilities
+import time
+import hashlib
+
 # DRF
 from rest_framework import viewsets
-from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+# Serializers
+from cride.utils.serializers import CompiledRepresentation
 
 # Models
 from cride.circles.models import Circle
 
+
+def pagination_fields(view, queryset):
+    """Return the fields `.values()` rows need for the view's paginator cursors."""
+    fields = ['pk']
+    get_ordering = getattr(view.paginator, 'get_ordering', None)
+    if get_ordering is not None:
+        fields += [field.lstrip('-') for field in get_ordering(view.request, queryset, view)]
+    return list(dict.fromkeys(fields))
+
+
+class EagerLoadingViewMixin:
+    """Preload the relations declared by the view's serializer.
+
+    Applied on `filter_queryset` so both listings and `get_object`
+    lookups benefit from it without touching each `get_queryset`.
+    """
+
+    def filter_queryset(self, queryset):
+        """Apply the serializer's eager loading to the queryset."""
+        queryset = super(EagerLoadingViewMixin, self).filter_queryset(queryset)
+        return self.setup_eager_loading(queryset)
+
+    def setup_eager_loading(self, queryset, serializer_class=None):
+        """Preload the relations `serializer_class` needs, if any."""
+        serializer_class = serializer_class or self.get_serializer_class()
+        setup = getattr(serializer_class, 'setup_eager_loading', None)
+        if setup is None:
+            return queryset
+        return setup(queryset)
+
+
+class MetricsMixin:
+    """Time the view and its serializers for `RequestMetricsMiddleware`.
+
+    Only serializers built through `get_serializer` are timed."""
+
+    def initial(self, request, *args, **kwargs):
+        """Start the view clock."""
+        self._view_start = time.perf_counter()
+        super(MetricsMixin, self).initial(request, *args, **kwargs)
+
+    def get_serializer(self, *args, **kwargs):
+        """Time the serializer's representation."""
+        serializer = super(MetricsMixin, self).get_serializer(*args, **kwargs)
+        metrics = getattr(self.request, 'metrics', None)
+        if metrics is not None:
+            to_representation = serializer.to_representation
+
+            def timed_to_representation(instance):
+                start = time.perf_counter()
+                try:
+                    return to_representation(instance)
+                finally:
+                    metrics.serializer_time += (time.perf_counter() - start) * 1000
+
+            serializer.to_representation = timed_to_representation
+        return serializer
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Stop the view clock."""
+        metrics = getattr(request, 'metrics', None)
+        start = getattr(self, '_view_start', None)
+        if metrics is not None and start is not None:
+            metrics.view_time += (time.perf_counter() - start) * 1000
+        return super(MetricsMixin, self).finalize_response(request, response, *args, **kwargs)
+
+
+class CompiledListMixin:
+    """Serve `list` through the compiled representation of the serializer.
+
+    Listings are read-only, so the serializer's validation machinery is
+    skipped, see `CompiledRepresentation`. Serializers made of plain model
+    fields are fed `.values()` rows instead of model instances, others
+    fall back to the serializer when they can't be compiled."""
+
+    def list(self, request, *args, **kwargs):
+        representation = CompiledRepresentation.for_serializer(self.get_serializer_class())
+        if representation is None:
+            return super(CompiledListMixin, self).list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = representation.values_fields is not None
+        if rows:
+            queryset = queryset.values(*dict.fromkeys([
+                *representation.values_fields,
+                *pagination_fields(self, queryset),
+            ]))
+
+        page = self.paginate_queryset(queryset)
+        start = time.perf_counter()
+        data = representation.represent_many(
+            queryset if page is None else page,
+            self.get_serializer_context(),
+            rows=rows,
+        )
+        metrics = getattr(request, 'metrics', None)
+        if metrics is not None:
+            metrics.serializer_time += (time.perf_counter() - start) * 1000
+
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class CachedListMixin:
+    """Serve `list` responses as rendered bytes from the cache.
+
+    Views return a version from `get_list_cache_version`, replaced
+    whenever the listing changes, and a timeout in seconds from
+    `get_list_cache_timeout`, bounding how stale time-dependent
+    listings get. Either being `None` bypasses the cache. Entries are
+    kept per version, URL and media type, so every page has its own.
+
+    Only one request renders a missing entry at a time, the others wait
+    up to `list_cache_wait` seconds for it before rendering it
+    themselves. Listings must not depend on the requesting user."""
+
+    list_cache_wait = 2
+    list_cache_poll_interval = 0.05
+    list_cache_lock_timeout = 10
+
+    def get_list_cache_version(self):
+        return None
+
+    def get_list_cache_timeout(self):
+        return None
+
+    def get_list_cache_key(self, request, version):
+        """Return the cache key of the listing's current page."""
+        digest = hashlib.sha1(
+            f'{request.accepted_media_type}:{request.build_absolute_uri()}'.encode()
+        ).hexdigest()
+        return f'views:list:{version}:{digest}'
+
+    def list(self, request, *args, **kwargs):
+        timeout = self.get_list_cache_timeout()
+        version = self.get_list_cache_version() if timeout else None
+        if version is None:
+            return super(CachedListMixin, self).list(request, *args, **kwargs)
+
+        key = self.get_list_cache_key(request, version)
+        lock_key = f'{key}:lock'
+        locked = False
+        status = 'hit'
+        content = cache.get(key)
+        if content is None:
+            locked = cache.add(lock_key, True, self.list_cache_lock_timeout)
+            if locked:
+                status = 'miss'
+            else:
+                status = 'wait'
+                content = self.wait_for_list(key)
+
+        if content is None:
+            try:
+                response = super(CachedListMixin, self).list(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                content = self.render_list(request, response)
+                if locked:
+                    cache.set(key, content, timeout)
+            finally:
+                if locked:
+                    cache.delete(lock_key)
+
+        metrics = getattr(request, 'metrics', None)
+        if metrics is not None:
+            metrics.list_cache = status
+
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        return HttpResponse(content, content_type=content_type)
+
+    def render_list(self, request, response):
+        """Return the rendered content of a listing response."""
+        return request.accepted_renderer.render(
+            response.data,
+            request.accepted_media_type,
+            {**self.get_renderer_context(), 'response': response},
+        )
+
+    def wait_for_list(self, key):
+        """Wait for another request to cache the listing and return it."""
+        deadline = time.monotonic() + self.list_cache_wait
+        while time.monotonic() < deadline:
+            time.sleep(self.list_cache_poll_interval)
+            content = cache.get(key)
+            if content is not None:
+                return content
+        return None
+
+
+class ConditionalGetMixin:
+    """Answer `retrieve` and `list` with ETag and Last-Modified validators.
+
+    Validators come from the latest `modified` of the objects and of the
+    relations in `conditional_fields` their representation nests, read
+    with an aggregate query before serializing. Listings aggregate each
+    row of the requested page, whose keys are part of the ETag. Requests
+    whose `If-None-Match` or `If-Modified-Since` still match get a 304
+    without running the serializers. Rows leaving a page don't change
+    its latest modification, so listings only honor `If-None-Match`.
+
+    Bulk updates of objects served this way must set `modified` too."""
+
+    conditional_fields = ('modified',)
+
+    def get_latest_modified(self, queryset):
+        """Return the latest modification of `queryset` through `conditional_fields`."""
+        values = queryset.order_by().aggregate(**{
+            f'modified_{i}': Max(field) for i, field in enumerate(self.conditional_fields)
+        })
+        return max((value for value in values.values() if value is not None), default=None)
+
+    def get_conditional_state(self, instance):
+        """Return the values the representation of `instance` depends on.
+
+        Views nesting objects not reachable from the instance extend it."""
+        return []
+
+    def get_etag(self, last_modified, state):
+        """Return the ETag of a representation."""
+        state = [self.request.accepted_media_type, last_modified.isoformat() if last_modified else '', *state]
+        return 'W/"%s"' % hashlib.sha1(repr(state).encode()).hexdigest()
+
+    def add_validators(self, response, etag, last_modified):
+        """Add the validators to `response` and make clients revalidate it."""
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_cached_page_state(self, request):
+        """Return the state of the requested page, kept next to it when the view caches listings.
+
+        Cached pages are validated with the state they were rendered
+        with, so a hit doesn't query the page's latest modification."""
+        version = None
+        if isinstance(self, CachedListMixin):
+            timeout = self.get_list_cache_timeout()
+            version = self.get_list_cache_version() if timeout else None
+        if version is None:
+            return self.get_page_state(self.filter_queryset(self.get_queryset()))
+
+        key = f'{self.get_list_cache_key(request, version)}:validators'
+        state = cache.get(key)
+        if state is None:
+            state = self.get_page_state(self.filter_queryset(self.get_queryset()))
+            cache.set(key, state, timeout)
+        return state
+
+    def get_page_state(self, queryset):
+        """Return the primary keys and the latest modification of the requested page.
+
+        Every row of the page comes with its own latest modifications, so
+        the page is read with a single query."""
+        aggregates = {f'modified_{i}': Max(field) for i, field in enumerate(self.conditional_fields)}
+        queryset = queryset.values(*pagination_fields(self, queryset)).annotate(**aggregates)
+        if self.paginator is None:
+            rows = list(queryset)
+        else:
+            rows = self.paginator.paginate_queryset(queryset, self.request, view=self)
+        last_modified = max(
+            (row[name] for row in rows for name in aggregates if row[name] is not None),
+            default=None,
+        )
+        return [row['pk'] for row in rows], last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = self.get_latest_modified(self.get_queryset().filter(pk=instance.pk))
+        etag = self.get_etag(last_modified, self.get_conditional_state(instance))
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self.add_validators(response, etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        keys, last_modified = self.get_cached_page_state(request)
+        etag = self.get_etag(last_modified, keys)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
+
+
 class RelatedToCircle(viewsets.GenericViewSet):
     """This class has to be inherited by all classes that need to
     dispatch circle objects related to their class."""
@@ -16,9 +323,9 @@ class RelatedToCircle(viewsets.GenericViewSet):
 
         slug_name = kwargs['slug_name']
 
-        self.circle = get_object_or_404(
-            Circle,
-            slug_name=slug_name,
-        )
+        try:
+            self.circle = Circle.objects.get_by_slug(slug_name)
+        except Circle.DoesNotExist:
+            raise Http404('No Circle matches the given query.')
 
-        return super(RelatedToCircle, self).dispatch(request, *args, **kwargs)
\ No newline at end of file
+        return super(RelatedToCircle, self).dispatch(request, *args, **kwargs)